@@ -0,0 +1,47 @@
+"""
+byceps.cli.command.create_bungalow_occupant_search_indexes
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Create the indexes that back browsing and searching the directory of
+bungalow occupants.
+
+The indexes are on the users table, which is not managed by the bungalow
+models. They are created concurrently, so users are not locked while the
+indexes are built.
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import text
+
+from byceps.database import db
+
+
+STATEMENTS = [
+    # Trigram indexes also support case-insensitive substring matches.
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    (
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_screen_name_lower '
+        'ON users (lower(screen_name))'
+    ),
+    (
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_screen_name_trgm '
+        'ON users USING gin (screen_name gin_trgm_ops)'
+    ),
+]
+
+
+@click.command()
+@with_appcontext
+def create_bungalow_occupant_search_indexes() -> None:
+    """Create the indexes for the directory of bungalow occupants."""
+    # Indexes cannot be created concurrently inside a transaction.
+    with db.engine.connect() as connection:
+        connection = connection.execution_options(isolation_level='AUTOCOMMIT')
+        for statement in STATEMENTS:
+            connection.execute(text(statement))
+
+    click.secho('Created bungalow occupant search indexes.', fg='green')
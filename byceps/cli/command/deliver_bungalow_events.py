@@ -0,0 +1,109 @@
+"""
+byceps.cli.command.deliver_bungalow_events
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Announce bungalow events from the outbox.
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from time import sleep
+
+import click
+from flask import Flask, current_app
+from flask.cli import with_appcontext
+import structlog
+
+from byceps.database import db
+from byceps.services.bungalow import bungalow_outbox_service
+
+
+log = structlog.get_logger()
+
+
+POLL_INTERVAL_IN_SECONDS = 2
+MAX_ERROR_BACKOFF_IN_SECONDS = 60
+
+
+@click.command()
+@click.option(
+    '--workers',
+    'worker_count',
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help='Number of events to deliver concurrently',
+)
+@click.option(
+    '--batch-size',
+    type=click.IntRange(min=1),
+    default=50,
+    show_default=True,
+    help='Number of events each worker claims (and may coalesce) at once',
+)
+@click.option(
+    '--once',
+    is_flag=True,
+    help='Deliver the events that are due, then exit',
+)
+@with_appcontext
+def deliver_bungalow_events(
+    worker_count: int, batch_size: int, once: bool
+) -> None:
+    """Announce bungalow events from the outbox."""
+    app = current_app._get_current_object()
+
+    with ThreadPoolExecutor(max_workers=worker_count) as executor:
+        futures = [
+            executor.submit(_deliver, app, batch_size, once)
+            for _ in range(worker_count)
+        ]
+        delivered_count = sum(future.result() for future in futures)
+
+    click.secho(f'Processed {delivered_count} bungalow event(s).', fg='green')
+
+
+def _deliver(app: Flask, batch_size: int, once: bool) -> int:
+    """Deliver events until there are none left (if `once` is set) or
+    forever.
+
+    A failing batch is rolled back. Unless `once` is set, the worker
+    backs off and tries again, so that a temporary problem (e.g. with
+    the database) does not reduce the number of workers.
+    """
+    processed_count = 0
+    error_backoff_in_seconds = POLL_INTERVAL_IN_SECONDS
+
+    with app.app_context():
+        while True:
+            now = datetime.utcnow()
+
+            try:
+                count = bungalow_outbox_service.deliver_events(now, batch_size)
+            except Exception:
+                db.session.rollback()
+
+                if once:
+                    raise
+
+                log.exception(
+                    'Delivering bungalow events failed',
+                    retry_in_seconds=error_backoff_in_seconds,
+                )
+                sleep(error_backoff_in_seconds)
+                error_backoff_in_seconds = min(
+                    error_backoff_in_seconds * 2, MAX_ERROR_BACKOFF_IN_SECONDS
+                )
+                continue
+
+            error_backoff_in_seconds = POLL_INTERVAL_IN_SECONDS
+            processed_count += count
+
+            if count == 0:
+                if once:
+                    return processed_count
+
+                sleep(POLL_INTERVAL_IN_SECONDS)
@@ -0,0 +1,131 @@
+"""
+byceps.cli.command.expire_bungalow_reservations
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Cancel the orders of bungalow reservations that have not been paid in
+time, which releases the bungalows.
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime, timedelta
+
+import click
+from flask.cli import with_appcontext
+
+from byceps.services.bungalow import bungalow_reservation_expiry_service
+from byceps.services.bungalow.models.occupation import ExpiredReservation
+from byceps.services.party import party_service
+from byceps.services.party.models import Party
+from byceps.services.user import user_service
+from byceps.services.user.models import User
+
+
+def _validate_party(ctx, param, party_id_value: str) -> Party:
+    party = party_service.find_party(party_id_value)
+
+    if not party:
+        raise click.BadParameter(f'Unknown party ID "{party_id_value}".')
+
+    return party
+
+
+def _validate_initiator(ctx, param, screen_name: str) -> User:
+    user = user_service.find_user_by_screen_name(screen_name)
+
+    if not user:
+        raise click.BadParameter(f'Unknown user "{screen_name}".')
+
+    return user
+
+
+@click.command()
+@click.argument('party', callback=_validate_party)
+@click.option(
+    '--ttl',
+    'ttl_in_hours',
+    type=click.IntRange(min=1),
+    default=48,
+    show_default=True,
+    help='Hours an order may stay unpaid before it is canceled',
+)
+@click.option(
+    '--initiator',
+    required=True,
+    callback=_validate_initiator,
+    help='Screen name of the user to cancel the orders as',
+)
+@click.option(
+    '--batch-size',
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help='Number of orders to cancel per cache invalidation',
+)
+@click.option(
+    '--dry-run',
+    is_flag=True,
+    help='Only list the reservations that would be canceled',
+)
+@with_appcontext
+def expire_bungalow_reservations(
+    party: Party,
+    ttl_in_hours: int,
+    initiator: User,
+    batch_size: int,
+    dry_run: bool,
+) -> None:
+    """Cancel the orders of the party's bungalow reservations that have
+    not been paid in time.
+    """
+    ttl = timedelta(hours=ttl_in_hours)
+    now = datetime.utcnow()
+
+    if dry_run:
+        expired_reservations = (
+            bungalow_reservation_expiry_service.get_expired_reservations(
+                party.id, ttl, now
+            )
+        )
+
+        for expired_reservation in expired_reservations:
+            click.echo(_describe(expired_reservation, now))
+
+        click.secho(
+            f'{len(expired_reservations)} reservation(s) would be canceled.',
+            fg='yellow',
+        )
+        return
+
+    result = bungalow_reservation_expiry_service.cancel_expired_reservations(
+        party.id, ttl, now, initiator, batch_size=batch_size
+    )
+
+    for expired_reservation in result.failed:
+        click.secho(
+            'Failed to cancel: ' + _describe(expired_reservation, now),
+            fg='red',
+        )
+
+    if result.skipped:
+        click.secho(
+            f'Skipped {len(result.skipped)} reservation(s) whose orders are '
+            'no longer open.',
+            fg='yellow',
+        )
+
+    click.secho(
+        f'Canceled {len(result.canceled)} expired reservation(s).', fg='green'
+    )
+
+
+def _describe(expired_reservation: ExpiredReservation, now: datetime) -> str:
+    age = now - expired_reservation.order_created_at
+    age_in_hours = int(age.total_seconds() // 3600)
+
+    return (
+        f'bungalow {expired_reservation.bungalow_number}, '
+        f'order {expired_reservation.order_number}, '
+        f'placed {age_in_hours} hour(s) ago'
+    )
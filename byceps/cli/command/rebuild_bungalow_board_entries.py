@@ -0,0 +1,38 @@
+"""
+byceps.cli.command.rebuild_bungalow_board_entries
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Recreate the board entries of a party's bungalows.
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import click
+from flask.cli import with_appcontext
+
+from byceps.services.bungalow import bungalow_board_service
+from byceps.services.party import party_service
+from byceps.services.party.models import Party
+
+
+def _validate_party(ctx, param, party_id_value: str) -> Party:
+    party = party_service.find_party(party_id_value)
+
+    if not party:
+        raise click.BadParameter(f'Unknown party ID "{party_id_value}".')
+
+    return party
+
+
+@click.command()
+@click.argument('party', callback=_validate_party)
+@with_appcontext
+def rebuild_bungalow_board_entries(party: Party) -> None:
+    """Recreate the board entries of the party's bungalows."""
+    bungalow_board_service.rebuild_entries(party.id)
+
+    click.secho(
+        f'Rebuilt bungalow board entries for party "{party.id}".',
+        fg='green',
+    )
@@ -10,6 +10,9 @@ Announce bungalow events.
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
 from byceps.announce.helpers import get_screen_name_or_fallback
 from byceps.services.webhooks.models import Announcement, OutgoingWebhook
 
@@ -22,6 +25,7 @@ from .events import (
     BungalowOccupiedEvent,
     BungalowReleasedEvent,
     BungalowReservedEvent,
+    _BungalowEvent,
 )
 
 
@@ -136,3 +140,167 @@ def announce_bungalow_occupant_removed(
     )
 
     return Announcement(text)
+
+
+# -------------------------------------------------------------------- #
+# digests
+
+
+def announce_bungalows_reserved(
+    event_name: str,
+    events: Sequence[BungalowReservedEvent],
+    webhook: OutgoingWebhook,
+) -> Announcement | None:
+    """Announce that bungalows have been reserved."""
+    bungalows, multiple = _format_bungalows(
+        event.bungalow_number for event in events
+    )
+    verb = 'wurden' if multiple else 'wurde'
+
+    text = f'{bungalows} {verb} reserviert.'
+
+    return Announcement(text)
+
+
+def announce_bungalows_occupied(
+    event_name: str,
+    events: Sequence[BungalowOccupiedEvent],
+    webhook: OutgoingWebhook,
+) -> Announcement | None:
+    """Announce that bungalows have been occupied."""
+    bungalows, multiple = _format_bungalows(
+        event.bungalow_number for event in events
+    )
+    verb = 'wurden' if multiple else 'wurde'
+
+    text = f'{bungalows} {verb} belegt.'
+
+    return Announcement(text)
+
+
+def announce_bungalows_released(
+    event_name: str,
+    events: Sequence[BungalowReleasedEvent],
+    webhook: OutgoingWebhook,
+) -> Announcement | None:
+    """Announce that bungalows have been released."""
+    bungalows, multiple = _format_bungalows(
+        event.bungalow_number for event in events
+    )
+    verb = 'wurden' if multiple else 'wurde'
+
+    text = f'{bungalows} {verb} wieder freigegeben.'
+
+    return Announcement(text)
+
+
+def announce_bungalow_occupancies_moved(
+    event_name: str,
+    events: Sequence[BungalowOccupancyMovedEvent],
+    webhook: OutgoingWebhook,
+) -> Announcement | None:
+    """Announce that bungalow occupancies have been moved to other
+    bungalows.
+    """
+    moves = ', '.join(
+        f'{event.source_bungalow_number} → {event.target_bungalow_number}'
+        for event in events
+    )
+
+    text = f'Belegungen haben den Bungalow gewechselt: {moves}'
+
+    return Announcement(text)
+
+
+def announce_bungalow_avatars_updated(
+    event_name: str,
+    events: Sequence[BungalowOccupancyAvatarUpdatedEvent],
+    webhook: OutgoingWebhook,
+) -> Announcement | None:
+    """Announce that bungalows' avatar images have been updated."""
+    bungalows, multiple = _format_bungalows(
+        event.bungalow_number for event in events
+    )
+    subject = 'Die Avatarbilder' if multiple else 'Das Avatarbild'
+    verb = 'wurden' if multiple else 'wurde'
+
+    text = f'{subject} für {bungalows} {verb} aktualisiert.'
+
+    return Announcement(text)
+
+
+def announce_bungalow_descriptions_updated(
+    event_name: str,
+    events: Sequence[BungalowOccupancyDescriptionUpdatedEvent],
+    webhook: OutgoingWebhook,
+) -> Announcement | None:
+    """Announce that bungalows' descriptions have been updated."""
+    bungalows, multiple = _format_bungalows(
+        event.bungalow_number for event in events
+    )
+    subject = 'Die Grußworte' if multiple else 'Das Grußwort'
+    verb = 'wurden' if multiple else 'wurde'
+
+    text = f'{subject} für {bungalows} {verb} aktualisiert.'
+
+    return Announcement(text)
+
+
+def announce_bungalow_occupants_added(
+    event_name: str,
+    events: Sequence[BungalowOccupantAddedEvent],
+    webhook: OutgoingWebhook,
+) -> Announcement | None:
+    """Announce that bungalow occupants have been added."""
+    bungalows, _ = _format_bungalows(event.bungalow_number for event in events)
+
+    text = f'{len(events):d} Bewohner wurden in {bungalows} aufgenommen.'
+
+    return Announcement(text)
+
+
+def announce_bungalow_occupants_removed(
+    event_name: str,
+    events: Sequence[BungalowOccupantRemovedEvent],
+    webhook: OutgoingWebhook,
+) -> Announcement | None:
+    """Announce that bungalow occupants have been removed."""
+    bungalows, _ = _format_bungalows(event.bungalow_number for event in events)
+
+    text = f'{len(events):d} Bewohner wurden aus {bungalows} rausgeworfen.'
+
+    return Announcement(text)
+
+
+def _format_bungalows(numbers: Iterable[int]) -> tuple[str, bool]:
+    """Return the bungalow numbers as phrase, and whether they are more
+    than one.
+    """
+    unique_numbers = sorted(set(numbers))
+
+    if len(unique_numbers) == 1:
+        return f'Bungalow {unique_numbers[0]:d}', False
+
+    joined_numbers = ', '.join(str(number) for number in unique_numbers)
+    return f'Bungalows {joined_numbers}', True
+
+
+DigestAnnouncer = Callable[
+    [str, Sequence[Any], OutgoingWebhook], Announcement | None
+]
+
+
+DIGEST_ANNOUNCERS_BY_EVENT_TYPE: dict[
+    type[_BungalowEvent], DigestAnnouncer
+] = {
+    BungalowReservedEvent: announce_bungalows_reserved,
+    BungalowOccupiedEvent: announce_bungalows_occupied,
+    BungalowReleasedEvent: announce_bungalows_released,
+    BungalowOccupancyMovedEvent: announce_bungalow_occupancies_moved,
+    BungalowOccupancyAvatarUpdatedEvent: announce_bungalow_avatars_updated,
+    BungalowOccupancyDescriptionUpdatedEvent: (
+        announce_bungalow_descriptions_updated
+    ),
+    BungalowOccupantAddedEvent: announce_bungalow_occupants_added,
+    BungalowOccupantRemovedEvent: announce_bungalow_occupants_removed,
+}
@@ -0,0 +1,72 @@
+"""
+byceps.services.bungalow.blueprints.admin.export
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Streaming of text exports
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from collections.abc import Iterable, Iterator
+import zlib
+
+from flask import request, Response, stream_with_context
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+def respond_with_text_stream(lines: Iterator[str]) -> Response:
+    """Stream the lines as plain text.
+
+    The lines are only produced while the response is being sent, so
+    exports do not have to be assembled in memory first. Lines are
+    collected into larger chunks, which are compressed with gzip if the
+    client accepts that.
+    """
+    # Keep the request (and thus the application) context alive while
+    # the lines are produced from the database.
+    lines = stream_with_context(lines)
+
+    chunks = _collect_chunks(lines)
+
+    response = Response(mimetype='text/plain')
+    response.vary.add('Accept-Encoding')
+
+    if request.accept_encodings['gzip'] > 0:
+        response.response = _compress_with_gzip(chunks)
+        response.content_encoding = 'gzip'
+    else:
+        response.response = (chunk.encode('utf-8') for chunk in chunks)
+
+    return response
+
+
+def _collect_chunks(lines: Iterable[str]) -> Iterator[str]:
+    buffer: list[str] = []
+    buffer_size = 0
+
+    for line in lines:
+        buffer.append(line)
+        buffer_size += len(line)
+
+        if buffer_size >= CHUNK_SIZE:
+            yield ''.join(buffer)
+            buffer.clear()
+            buffer_size = 0
+
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _compress_with_gzip(chunks: Iterable[str]) -> Iterator[bytes]:
+    # A window bits value of 16 + 15 selects the gzip container format.
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+
+    for chunk in chunks:
+        compressed = compressor.compress(chunk.encode('utf-8'))
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
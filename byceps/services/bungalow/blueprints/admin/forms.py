@@ -13,13 +13,15 @@ from wtforms import (
     SelectField,
     SelectMultipleField,
     StringField,
+    TextAreaField,
 )
 from wtforms.validators import InputRequired, Length, Optional
 
 from byceps.services.bungalow import bungalow_category_service, bungalow_service
 from byceps.services.bungalow.dbmodels.bungalow import DbBungalow
-from byceps.services.bungalow.models.bungalow import Bungalow
+from byceps.services.bungalow.models.bungalow import BungalowCandidate
 from byceps.services.party.models import PartyID
+from byceps.services.shop.order.models.number import OrderNumber
 from byceps.services.shop.product import product_service
 from byceps.services.shop.shop.models import ShopID
 from byceps.services.ticketing import ticket_category_service
@@ -167,6 +169,18 @@ class OfferCreateForm(LocalizedForm):
         select_sole_choice(self.bungalow_category_id)
 
 
+class OrdersCancelForm(LocalizedForm):
+    order_numbers = TextAreaField('Bestellnummern', [InputRequired()])
+    reason = StringField('Begründung', [InputRequired(), Length(max=1000)])
+
+    def get_order_numbers(self) -> set[OrderNumber]:
+        """Return the order numbers, separated by whitespace or commas."""
+        return {
+            OrderNumber(value)
+            for value in self.order_numbers.data.replace(',', ' ').split()
+        }
+
+
 class InternalRemarkUpdateForm(LocalizedForm):
     internal_remark = StringField('Anmerkung', [Optional(), Length(max=200)])
 
@@ -180,10 +194,10 @@ class TicketBundleOccupyBungalowForm(LocalizedForm):
         lazy_gettext('Bungalow'), validators=[InputRequired()]
     )
 
-    def set_bungalow_choices(self, bungalows: list[Bungalow]) -> None:
-        self.bungalow_id.choices = [
-            (str(bungalow.id), bungalow.number) for bungalow in bungalows
-        ]
+    def set_bungalow_choices(
+        self, candidates: list[BungalowCandidate]
+    ) -> None:
+        self.bungalow_id.choices = _to_bungalow_choices(candidates)
         select_sole_choice(self.bungalow_id)
 
 
@@ -193,25 +207,22 @@ class OccupancyMoveForm(LocalizedForm):
     )
 
     def set_target_bungalow_choices(self, source_bungalow: DbBungalow) -> None:
-        self.target_bungalow_id.choices = [
-            (str(bungalow.id), bungalow.number)
-            for bungalow in _get_occupancy_move_target_bungalows(
-                source_bungalow
-            )
-        ]
+        source_category = source_bungalow.category
+        candidates = bungalow_service.get_candidate_bungalows(
+            source_bungalow.party_id,
+            source_category.ticket_category_id,
+            source_category.capacity,
+            excluded_bungalow_id=source_bungalow.id,
+        )
+
+        self.target_bungalow_id.choices = _to_bungalow_choices(candidates)
         select_sole_choice(self.target_bungalow_id)
 
 
-def _get_occupancy_move_target_bungalows(
-    source_bungalow: DbBungalow,
-) -> list[DbBungalow]:
-    party_bungalows = bungalow_service.get_bungalows_for_party(
-        source_bungalow.party_id
-    )
+def _to_bungalow_choices(
+    candidates: list[BungalowCandidate],
+) -> list[tuple[str, str]]:
     return [
-        bungalow
-        for bungalow in party_bungalows
-        if bungalow.available
-        and bungalow.id != source_bungalow.id
-        and bungalow.category_id == source_bungalow.category_id
+        (str(candidate.id), f'{candidate.number} ({candidate.category_title})')
+        for candidate in candidates
     ]
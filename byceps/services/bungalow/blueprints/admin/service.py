@@ -6,66 +6,142 @@ byceps.services.bungalow.blueprints.admin.service
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator, Sequence
 from typing import Any
+from uuid import UUID
 
-from byceps.services.bungalow import bungalow_log_service
-from byceps.services.bungalow.models.bungalow import BungalowID
+from byceps.services.bungalow import (
+    bungalow_log_service,
+    bungalow_service,
+    user_loading,
+)
+from byceps.services.bungalow.models.bungalow import Bungalow, BungalowID
 from byceps.services.bungalow.models.log import (
     BungalowLogEntry,
+    BungalowLogEntryCursor,
     BungalowLogEntryData,
 )
-from byceps.services.user import user_service
-from byceps.services.user.models import User
+from byceps.services.party.models import PartyID
+from byceps.services.user.models import User, UserID
 
 
-def get_log_entries(bungalow_id: BungalowID) -> Iterator[BungalowLogEntryData]:
-    log_entries = bungalow_log_service.get_entries_for_bungalow(bungalow_id)
+# Keys of log entry data that reference users and bungalows, and the
+# names under which the referenced objects are added to the entry.
+USER_REFERENCE_KEYS_AND_NAMES = {
+    'initiator_id': 'initiator',
+    'new_manager_id': 'new_manager',
+}
+BUNGALOW_REFERENCE_KEYS_AND_NAMES = {
+    'source_bungalow_id': 'source_bungalow',
+    'target_bungalow_id': 'target_bungalow',
+}
 
-    user_ids = {
-        entry.data['initiator_id']
-        for entry in log_entries
-        if 'initiator_id' in entry.data
-    }
-    users = user_service.get_users(user_ids, include_avatars=True)
-    users_by_id = {str(user.id): user for user in users}
+
+def get_log_entries(
+    bungalow_id: BungalowID,
+    limit: int,
+    *,
+    before: BungalowLogEntryCursor | None = None,
+) -> list[BungalowLogEntryData]:
+    """Return the latest log entries for the bungalow, with referenced
+    users and bungalows resolved.
+    """
+    log_entries = bungalow_log_service.get_entries_for_bungalow(
+        bungalow_id, limit=limit, before=before
+    )
+
+    return list(_hydrate_log_entries(log_entries))
+
+
+def get_log_entries_for_party(
+    party_id: PartyID,
+    limit: int,
+    *,
+    before: BungalowLogEntryCursor | None = None,
+    event_type: str | None = None,
+    initiator_id: UserID | None = None,
+) -> list[BungalowLogEntryData]:
+    """Return the latest log entries for the party's bungalows, with
+    referenced users and bungalows resolved.
+    """
+    log_entries = bungalow_log_service.get_entries_for_party(
+        party_id,
+        limit,
+        before=before,
+        event_type=event_type,
+        initiator_id=initiator_id,
+    )
+
+    return list(_hydrate_log_entries(log_entries))
+
+
+def _hydrate_log_entries(
+    log_entries: Sequence[BungalowLogEntry],
+) -> Iterator[BungalowLogEntryData]:
+    """Add the users and bungalows referenced by the log entries.
+
+    All referenced bungalows are looked up with one query. So are all
+    referenced users, unless they have already been looked up during the
+    current request.
+    """
+    user_ids = _collect_referenced_ids(
+        log_entries, USER_REFERENCE_KEYS_AND_NAMES.keys()
+    )
+    users = user_loading.get_user_loader().get_many(
+        {UserID(UUID(user_id)) for user_id in user_ids}
+    )
+    users_by_id = {str(user.id): user for user in users.values()}
+
+    bungalow_ids = _collect_referenced_ids(
+        log_entries, BUNGALOW_REFERENCE_KEYS_AND_NAMES.keys()
+    )
+    bungalow_ids.update(str(entry.bungalow_id) for entry in log_entries)
+    bungalows = bungalow_service.get_bungalows(
+        {BungalowID(UUID(bungalow_id)) for bungalow_id in bungalow_ids}
+    )
+    bungalows_by_id = {str(bungalow.id): bungalow for bungalow in bungalows}
 
     for entry in log_entries:
         data = {
+            'id': entry.id,
             'event_type': entry.event_type,
             'occurred_at': entry.occurred_at,
+            'bungalow': bungalows_by_id[str(entry.bungalow_id)],
             'data': entry.data,
+            'cursor': BungalowLogEntryCursor.for_entry(entry),
         }
 
-        additional_data = _get_additional_data(entry, users_by_id)
+        additional_data = _get_additional_data(
+            entry, users_by_id, bungalows_by_id
+        )
         data.update(additional_data)
 
         yield data
 
 
-def _get_additional_data(
-    log_entry: BungalowLogEntry, users_by_id: dict[str, User]
-) -> Iterator[tuple[str, Any]]:
-    if log_entry.event_type in {
-        'bungalow-occupied',
-        'bungalow-released',
-        'bungalow-reserved',
-        'manager-appointed',
-        'occupancy-moved-away',
-        'occupancy-moved-here',
-    }:
-        yield from _get_additional_data_for_user_initiated_log_entry(
-            log_entry, users_by_id
-        )
-
-    if log_entry.event_type == 'manager-appointed':
-        new_manager = user_service.get_user(log_entry.data['new_manager_id'])
-        yield 'new_manager', new_manager
+def _collect_referenced_ids(
+    log_entries: Sequence[BungalowLogEntry], keys: Iterable[str]
+) -> set[str]:
+    return {
+        entry.data[key]
+        for entry in log_entries
+        for key in keys
+        if entry.data.get(key) is not None
+    }
 
 
-def _get_additional_data_for_user_initiated_log_entry(
-    log_entry: BungalowLogEntry, users_by_id: dict[str, User]
+def _get_additional_data(
+    log_entry: BungalowLogEntry,
+    users_by_id: dict[str, User],
+    bungalows_by_id: dict[str, Bungalow],
 ) -> Iterator[tuple[str, Any]]:
-    initiator_id = log_entry.data.get('initiator_id')
-    if initiator_id is not None:
-        yield 'initiator', users_by_id[initiator_id]
+    for key, name in USER_REFERENCE_KEYS_AND_NAMES.items():
+        user_id = log_entry.data.get(key)
+        if user_id is not None:
+            yield name, users_by_id[user_id]
+
+    for key, name in BUNGALOW_REFERENCE_KEYS_AND_NAMES.items():
+        bungalow_id = log_entry.data.get(key)
+        if bungalow_id is not None:
+            # The bungalow might not be offered anymore.
+            yield name, bungalows_by_id.get(bungalow_id)
@@ -8,6 +8,7 @@ byceps.services.bungalow.blueprints.admin.views
 
 from collections.abc import Iterable, Iterator
 from datetime import datetime
+from uuid import UUID
 
 from flask import abort, g, request, url_for
 from flask_babel import gettext
@@ -15,14 +16,17 @@ from flask_babel import gettext
 from byceps.services.brand import brand_service
 from byceps.services.brand.models import Brand, BrandID
 from byceps.services.bungalow import (
+    bungalow_board_service,
     bungalow_building_service,
     bungalow_category_service,
     bungalow_occupancy_service,
     bungalow_offer_service,
+    bungalow_order_cancellation_service,
     bungalow_service,
     bungalow_stats_service,
     first_attendance_service,
     signals as bungalow_signals,
+    user_loading,
 )
 from byceps.services.bungalow.dbmodels.bungalow import DbBungalow
 from byceps.services.bungalow.dbmodels.occupancy import DbBungalowOccupancy
@@ -32,6 +36,10 @@ from byceps.services.bungalow.models.category import (
     BungalowCategory,
     BungalowCategoryID,
 )
+from byceps.services.bungalow.models.log import (
+    BungalowLogEntryCursor,
+    BungalowLogEntryData,
+)
 from byceps.services.bungalow.models.occupation import (
     BungalowOccupancy,
     CategoryOccupationSummary,
@@ -47,13 +55,8 @@ from byceps.services.ticketing import (
     ticket_bundle_service,
     ticket_category_service,
 )
-from byceps.services.ticketing.models.ticket import (
-    TicketBundle,
-    TicketBundleID,
-    TicketCategoryID,
-)
-from byceps.services.user import user_service
-from byceps.services.user.models import UserID
+from byceps.services.ticketing.models.ticket import TicketBundle, TicketBundleID
+from byceps.services.user.models import User, UserID
 from byceps.util.export import serialize_tuples_to_csv
 from byceps.util.framework.blueprint import create_blueprint
 from byceps.util.framework.flash import flash_error, flash_success
@@ -64,10 +67,10 @@ from byceps.util.views import (
     redirect_to,
     respond_no_content,
     respond_no_content_with_location,
-    textified,
 )
 
 from . import service
+from .export import respond_with_text_stream
 from .forms import (
     AppointManagerForm,
     BuildingCreateForm,
@@ -76,6 +79,7 @@ from .forms import (
     InternalRemarkUpdateForm,
     OccupancyMoveForm,
     OfferCreateForm,
+    OrdersCancelForm,
     TicketBundleOccupyBungalowForm,
 )
 from .models import BungalowTicketBundle
@@ -84,6 +88,18 @@ from .models import BungalowTicketBundle
 blueprint = create_blueprint('bungalow_admin', __name__)
 
 
+LOG_ENTRIES_PER_PAGE = 100
+
+LOG_EVENT_TYPE_LABELS = {
+    'bungalow-reserved': 'Bungalow reserviert',
+    'bungalow-occupied': 'Bungalow belegt',
+    'bungalow-released': 'Bungalow freigegeben',
+    'manager-appointed': 'Verwalter eingetragen',
+    'occupancy-moved-away': 'Belegung wegverschoben',
+    'occupancy-moved-here': 'Belegung hierher verschoben',
+}
+
+
 @blueprint.get('/buildings/for_brand/<brand_id>')
 @permission_required('bungalow.view')
 @templated
@@ -156,25 +172,26 @@ def offer_index(party_id):
     """List all bungalows for the party."""
     party = _get_party_or_404(party_id)
 
-    bungalows = bungalow_service.get_bungalows_for_party(party.id)
-
-    occupancies = {b.occupancy for b in bungalows if b.occupancy}
+    bungalows = bungalow_board_service.get_entries_for_party(party.id)
 
     order_numbers = {
-        occupancy.order_number
-        for occupancy in occupancies
-        if occupancy.order_number is not None
+        bungalow.order_number
+        for bungalow in bungalows
+        if bungalow.order_number is not None
     }
     orders = order_service.get_orders_for_order_numbers(order_numbers)
     orders_by_order_number = {order.order_number: order for order in orders}
 
-    user_ids = _collect_occupancy_user_ids(occupancies)
-    users_by_id = user_service.get_users_indexed_by_id(
-        user_ids, include_avatars=True
-    )
+    user_ids = {
+        user_id
+        for bungalow in bungalows
+        for user_id in (bungalow.occupier_id, bungalow.manager_id)
+        if user_id is not None
+    }
+    users_by_id = user_loading.get_user_loader().get_many(user_ids)
 
     offered_seats_total = sum(
-        bungalow.category.capacity for bungalow in bungalows
+        bungalow.category_capacity for bungalow in bungalows
     )
 
     return {
@@ -208,22 +225,29 @@ def offer_view(bungalow_id):
         bungalow.id
     )
 
+    user_loader = user_loading.get_user_loader()
+
     order = None
-    users_by_id = {}
+    user_ids: set[UserID] = set()
     if occupancy:
         if occupancy.order_number:
             order = order_service.find_order_by_order_number(
                 occupancy.order_number
             )
 
+        # Look up the occupier and the manager along with the occupants.
         user_ids = _collect_occupancy_user_ids([occupancy])
-        users_by_id = user_service.get_users_indexed_by_id(
-            user_ids, include_avatars=True
-        )
+        user_loader.prime(user_ids)
 
     occupant_slots = _get_occupant_slots(bungalow, occupancy)
 
-    log_entries = list(service.get_log_entries(bungalow.id))
+    users_by_id = user_loader.get_many(user_ids)
+
+    log_entries_before = _get_log_entry_cursor_arg('log_before')
+    log_entries = service.get_log_entries(
+        bungalow.id, LOG_ENTRIES_PER_PAGE, before=log_entries_before
+    )
+    older_log_entries_cursor = _get_next_log_entry_cursor(log_entries)
 
     return {
         'party': party,
@@ -233,6 +257,7 @@ def offer_view(bungalow_id):
         'order': order,
         'occupant_slots': occupant_slots,
         'log_entries': log_entries,
+        'older_log_entries_cursor': older_log_entries_cursor,
     }
 
 
@@ -260,7 +285,7 @@ def _get_occupant_slots(
         return None
 
     return bungalow_occupancy_service.get_occupant_slots_for_occupancy(
-        occupancy.id
+        occupancy.id, get_users=user_loading.get_user_loader().get_many
     )
 
 
@@ -372,7 +397,8 @@ def occupant_index(party_id):
     }
     occupant_slots_by_occupancy_id = (
         bungalow_occupancy_service.get_occupant_slots_for_occupancies(
-            occupancy_ids, for_admin=True
+            occupancy_ids,
+            get_users=user_loading.get_admin_user_loader().get_many,
         )
     )
 
@@ -384,6 +410,77 @@ def occupant_index(party_id):
     }
 
 
+@blueprint.get('/<party_id>/activity')
+@permission_required('bungalow.view')
+@templated
+def activity_feed(party_id):
+    """List the latest events regarding the party's bungalows."""
+    party = _get_party_or_404(party_id)
+
+    before = _get_log_entry_cursor_arg('before')
+    event_type = request.args.get('event_type') or None
+
+    initiator = _find_user_for_arg('initiator_id')
+
+    log_entries = service.get_log_entries_for_party(
+        party.id,
+        LOG_ENTRIES_PER_PAGE,
+        before=before,
+        event_type=event_type,
+        initiator_id=initiator.id if initiator else None,
+    )
+    older_log_entries_cursor = _get_next_log_entry_cursor(log_entries)
+
+    return {
+        'party': party,
+        'log_entries': log_entries,
+        'older_log_entries_cursor': older_log_entries_cursor,
+        'event_type': event_type,
+        'event_types': LOG_EVENT_TYPE_LABELS,
+        'initiator': initiator,
+    }
+
+
+def _find_user_for_arg(name: str) -> User | None:
+    value = request.args.get(name)
+    if not value:
+        return None
+
+    try:
+        user_id = UserID(UUID(value))
+    except ValueError:
+        abort(400, 'Invalid user ID')
+
+    return user_loading.get_user_loader().find(user_id)
+
+
+def _get_log_entry_cursor_arg(name: str) -> BungalowLogEntryCursor | None:
+    value = request.args.get(name)
+    if not value:
+        return None
+
+    cursor = BungalowLogEntryCursor.parse(value)
+    if cursor is None:
+        abort(400, 'Invalid log entry cursor')
+
+    return cursor
+
+
+def _get_next_log_entry_cursor(
+    log_entries: list[BungalowLogEntryData],
+) -> BungalowLogEntryCursor | None:
+    """Return the cursor for the page following that of the entries, or
+    `None` if that page is the last.
+    """
+    if len(log_entries) < LOG_ENTRIES_PER_PAGE:
+        return None
+
+    oldest_log_entry = min(
+        log_entries, key=lambda entry: (entry['occurred_at'], entry['id'])
+    )
+    return oldest_log_entry['cursor']
+
+
 @blueprint.post('/<bungalow_id>/flags/distributes_network')
 @permission_required('bungalow.update')
 @respond_no_content
@@ -466,6 +563,61 @@ def internal_remark_update(occupancy_id):
     return redirect_to('.offer_index', party_id=bungalow.party_id)
 
 
+@blueprint.get('/orders/for_party/<party_id>/cancel')
+@permission_required('bungalow_order.cancel')
+@templated
+def orders_cancel_form(party_id, erroneous_form=None):
+    """Show a form to cancel open bungalow orders in bulk."""
+    party = _get_party_or_404(party_id)
+
+    form = erroneous_form if erroneous_form else OrdersCancelForm()
+
+    return {
+        'party': party,
+        'form': form,
+    }
+
+
+@blueprint.post('/orders/for_party/<party_id>/cancel')
+@permission_required('bungalow_order.cancel')
+def orders_cancel(party_id):
+    """Cancel open bungalow orders in bulk, releasing their bungalows."""
+    party = _get_party_or_404(party_id)
+
+    form = OrdersCancelForm(request.form)
+    if not form.validate():
+        return orders_cancel_form(party.id, form)
+
+    order_numbers = form.get_order_numbers()
+    reason = form.reason.data.strip()
+    initiator = g.user.as_user()
+
+    match bungalow_order_cancellation_service.cancel_orders(
+        party.id, order_numbers, initiator, reason
+    ):
+        case Ok(result):
+            pass
+        case Err(errors):
+            for error in errors:
+                flash_error(error)
+            flash_error('Es wurden keine Bestellungen storniert.')
+            return orders_cancel_form(party.id, form)
+
+    flash_success(
+        f'{len(result.released_bungalow_numbers)} Bungalow(s) wurden '
+        f'freigegeben und {len(result.canceled_order_numbers)} '
+        'Bestellung(en) storniert.'
+    )
+    if result.failed_order_numbers:
+        failed_order_numbers_text = ', '.join(result.failed_order_numbers)
+        flash_error(
+            'Folgende Bestellungen konnten nicht storniert werden: '
+            f'{failed_order_numbers_text}'
+        )
+
+    return redirect_to('.offer_index', party_id=party.id)
+
+
 @blueprint.get('/ticket_bundles/for_party/<party_id>')
 @permission_required('bungalow.view')
 @templated
@@ -521,10 +673,8 @@ def ticket_bundle_occupy_bungalow_form(
 
     party = party_service.get_party(bundle.party_id)
 
-    bungalow_candidates = (
-        _get_candidate_bungalows_for_occupation_without_reservation(
-            party.id, bundle.ticket_category.id
-        )
+    bungalow_candidates = bungalow_service.get_candidate_bungalows(
+        party.id, bundle.ticket_category.id, bundle.ticket_quantity
     )
     if not bungalow_candidates:
         flash_error('Es sind keine passenden Bungalows frei.')
@@ -550,10 +700,8 @@ def ticket_bundle_occupy_bungalow(bundle_id: TicketBundleID):
 
     party = party_service.get_party(bundle.party_id)
 
-    bungalow_candidates = (
-        _get_candidate_bungalows_for_occupation_without_reservation(
-            party.id, bundle.ticket_category.id
-        )
+    bungalow_candidates = bungalow_service.get_candidate_bungalows(
+        party.id, bundle.ticket_category.id, bundle.ticket_quantity
     )
     if not bungalow_candidates:
         flash_error('Es sind keine passenden Bungalows frei.')
@@ -596,18 +744,6 @@ def ticket_bundle_occupy_bungalow(bundle_id: TicketBundleID):
     return redirect_to('.ticket_bundle_index', party_id=party.id)
 
 
-def _get_candidate_bungalows_for_occupation_without_reservation(
-    party_id: PartyID, ticket_category_id: TicketCategoryID
-) -> list[Bungalow]:
-    return [
-        bungalow
-        for bungalow in bungalow_service.get_available_bungalows_for_party(
-            party_id
-        )
-        if bungalow.category.ticket_category_id == ticket_category_id
-    ]
-
-
 @blueprint.get('/occupancies/<occupancy_id>/manager/update')
 @permission_required('bungalow.update')
 @templated
@@ -898,48 +1034,27 @@ def category_update(category_id):
 
 @blueprint.get('/<party_id>/occupants/export')
 @permission_required('bungalow.view')
-@textified
 def export_occupants(party_id):
     """Export bungalow occupants with realname, bungalow number, and
     main tenant flag.
     """
     party = _get_party_or_404(party_id)
 
-    bungalows = bungalow_occupancy_service.get_occupied_bungalows_for_party(
-        party.id
-    )
+    occupants = bungalow_occupancy_service.get_occupants_for_party(party.id)
 
-    occupancy_ids = {
-        bungalow.occupancy.id for bungalow in bungalows if bungalow.occupancy
-    }
-    occupant_slots_by_occupancy_id = (
-        bungalow_occupancy_service.get_occupant_slots_for_occupancies(
-            occupancy_ids, for_admin=True
-        )
-    )
+    def generate_rows() -> Iterator[tuple[int | str, ...]]:
+        yield 'Bungalow', 'Name', 'Bemerkung'
 
-    rows = [('Bungalow', 'Name', 'Bemerkung')]
-
-    for bungalow in bungalows:
-        occupancy = bungalow.occupancy
-        occupant_slots = occupant_slots_by_occupancy_id[occupancy.id]
-        for occupant_slot in occupant_slots:
-            occupant = occupant_slot.occupant
-            if occupant:
-                full_name = occupant.detail.full_name or 'nicht angegeben'
-                remark = (
-                    'Hauptmieter/in'
-                    if occupancy.manager_id == occupant.id
-                    else ''
-                )
-                rows.append((bungalow.number, full_name, remark))
+        for bungalow_number, occupant, is_manager in occupants:
+            full_name = occupant.detail.full_name or 'nicht angegeben'
+            remark = 'Hauptmieter/in' if is_manager else ''
+            yield bungalow_number, full_name, remark
 
-    return serialize_tuples_to_csv(rows)
+    return respond_with_text_stream(serialize_tuples_to_csv(generate_rows()))
 
 
 @blueprint.get('/<party_id>/occupied_bungalow_numbers_and_titles')
 @permission_required('bungalow.view')
-@textified
 def export_bungalow_numbers_and_titles(party_id):
     """Export numbers and titles of all occupied bungalows for this
     party, one set per line.
@@ -958,12 +1073,11 @@ def export_bungalow_numbers_and_titles(party_id):
         for number, title in numbers_and_titles:
             yield f'{number:d} {title or "unbenannt"}\n'
 
-    return generate()
+    return respond_with_text_stream(generate())
 
 
 @blueprint.get('/<party_id>/first_time_attendees')
 @permission_required('bungalow.view')
-@textified
 def export_first_time_attendees(party_id):
     party = _get_party_or_404(party_id)
 
@@ -971,19 +1085,19 @@ def export_first_time_attendees(party_id):
         first_attendance_service.get_first_time_attendees_by_bungalow(party)
     )
 
-    rows = [('Bungalow', 'Anzahl', 'Namen')]
+    def generate_rows() -> Iterator[tuple[int | str, ...]]:
+        yield 'Bungalow', 'Anzahl', 'Namen'
 
-    for bungalow_number, attendees in sorted(
-        first_time_attendees_by_bungalow_number.items(),
-        key=lambda item: item[0],
-    ):
-        attendee_count = len(attendees)
-        joined_screen_names = ', '.join(
-            (attendee.screen_name or 'unbekannt') for attendee in attendees
-        )
-        rows.append((bungalow_number, attendee_count, joined_screen_names))
+        for bungalow_number, screen_names in (
+            first_time_attendees_by_bungalow_number
+        ):
+            attendee_count = len(screen_names)
+            joined_screen_names = ', '.join(
+                (screen_name or 'unbekannt') for screen_name in screen_names
+            )
+            yield bungalow_number, attendee_count, joined_screen_names
 
-    return serialize_tuples_to_csv(rows)
+    return respond_with_text_stream(serialize_tuples_to_csv(generate_rows()))
 
 
 # -------------------------------------------------------------------- #
@@ -0,0 +1,136 @@
+"""
+byceps.services.bungalow.blueprints.site.board_feed
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+In-process feed of changes to the parties' bungalow boards
+
+Changes are published once per process and then read by any number of
+waiting clients, so the cost of a change does not grow with the number
+of clients.
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from threading import Condition, Lock
+
+from byceps.services.bungalow.models.bungalow import Bungalow
+from byceps.services.party.models import PartyID
+
+from .models import BungalowBoardChange
+
+
+class BoardFeed:
+    """The recent changes to a party's bungalow board."""
+
+    def __init__(self, capacity: int, started_at: datetime) -> None:
+        self._condition = Condition()
+        self._changes: deque[BungalowBoardChange] = deque(maxlen=capacity)
+        # All changes after this point in time are retained.
+        self._complete_after = started_at
+        self._last_changed_at = started_at
+
+    def publish(self, bungalows: Iterable[Bungalow]) -> None:
+        """Publish the current state of the bungalows, and wake up all
+        waiting clients.
+        """
+        with self._condition:
+            for bungalow in bungalows:
+                change = self._build_change(bungalow)
+
+                if len(self._changes) == self._changes.maxlen:
+                    self._complete_after = self._changes[0].changed_at
+
+                self._changes.append(change)
+
+            self._condition.notify_all()
+
+    def publish_reload(self) -> None:
+        """Discard all changes so that every client reloads the board,
+        and wake up all waiting clients.
+
+        Use this if any of the party's bungalows might have changed.
+        """
+        with self._condition:
+            self._changes.clear()
+            self._complete_after = self._next_position()
+
+            self._condition.notify_all()
+
+    def _build_change(self, bungalow: Bungalow) -> BungalowBoardChange:
+        changed_at = self._next_position()
+
+        occupancy = bungalow.occupancy
+
+        return BungalowBoardChange(
+            changed_at=changed_at,
+            bungalow_number=bungalow.number,
+            occupation_state=bungalow.occupation_state,
+            title=occupancy.title if occupancy is not None else None,
+            avatar_url=bungalow.avatar_url,
+        )
+
+    def _next_position(self) -> datetime:
+        # Keep points in time unique, so they can serve as positions in
+        # the feed.
+        position = max(
+            datetime.utcnow(),
+            self._last_changed_at + timedelta(microseconds=1),
+        )
+        self._last_changed_at = position
+
+        return position
+
+    def wait_for_changes_after(
+        self, position: datetime, timeout: float
+    ) -> list[BungalowBoardChange] | None:
+        """Return the changes after that position, waiting up to
+        `timeout` seconds for one to be published.
+
+        Return `None` if changes after that position might be missing,
+        i.e. if they have been discarded or had been published before
+        this feed was started.
+        """
+        with self._condition:
+            if position < self._complete_after:
+                return None
+
+            self._condition.wait_for(
+                lambda: self._last_changed_at > position, timeout
+            )
+
+            if position < self._complete_after:
+                # A reload has been published while waiting.
+                return None
+
+            return [
+                change
+                for change in self._changes
+                if change.changed_at > position
+            ]
+
+
+class BoardFeeds:
+    """The board feeds of all parties, created on demand."""
+
+    def __init__(self, capacity: int) -> None:
+        self._capacity = capacity
+        self._started_at = datetime.utcnow()
+        self._lock = Lock()
+        self._feeds: dict[PartyID, BoardFeed] = {}
+
+    def get_feed(self, party_id: PartyID) -> BoardFeed:
+        with self._lock:
+            feed = self._feeds.get(party_id)
+            if feed is None:
+                # Publishing creates the feed, so no change has been
+                # missed since the process has been started.
+                feed = BoardFeed(self._capacity, self._started_at)
+                self._feeds[party_id] = feed
+
+            return feed
@@ -6,11 +6,22 @@ byceps.services.bungalow.blueprints.site.models
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
+from __future__ import annotations
+
 from dataclasses import dataclass
+from datetime import datetime
 
 from moneyed import Money
 
-from byceps.services.bungalow.models.category import BungalowCategoryID
+from byceps.services.bungalow.models.board import BungalowBoardEntry
+from byceps.services.bungalow.models.bungalow import BungalowOccupationState
+from byceps.services.bungalow.models.category import (
+    BungalowCategory,
+    BungalowCategoryID,
+)
+from byceps.services.bungalow.models.occupation import CategoryOccupationSummary
+from byceps.services.shop.product.models import ProductID
+from byceps.services.ticketing.models.ticket import TicketCategoryID
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -23,3 +34,33 @@ class BungalowCategorySummary:
     quantity_occupied: int
     quantity_total: int
     available: bool
+
+
+@dataclass(frozen=True, kw_only=True)
+class BungalowBoard:
+    """A party's bungalows, their occupation, and related data as shown
+    on the public board.
+    """
+
+    built_at: datetime
+    bungalows: list[BungalowBoardEntry]
+    bungalows_by_number: dict[int, BungalowBoardEntry]
+    bungalow_categories_by_id: dict[BungalowCategoryID, BungalowCategory]
+    total_amounts_by_product_id: dict[ProductID, Money]
+    occupation_summaries_by_ticket_category_id: dict[
+        TicketCategoryID, CategoryOccupationSummary
+    ]
+    statistics_total: CategoryOccupationSummary
+
+
+@dataclass(frozen=True, kw_only=True)
+class BungalowBoardChange:
+    """The current state of a bungalow on the board, published after it
+    has changed.
+    """
+
+    changed_at: datetime
+    bungalow_number: int
+    occupation_state: BungalowOccupationState
+    title: str | None
+    avatar_url: str | None
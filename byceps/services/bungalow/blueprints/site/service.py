@@ -6,37 +6,251 @@ byceps.services.bungalow.blueprints.site.service
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
-from byceps.services.bungalow import bungalow_category_service
+from datetime import datetime, timedelta
+
+from moneyed import Money
+
+from byceps.services.bungalow import (
+    bungalow_board_service,
+    bungalow_category_service,
+    bungalow_hold_service,
+    bungalow_invalidation_service,
+    bungalow_service,
+    bungalow_stats_service,
+    signals as bungalow_signals,
+)
+from byceps.services.bungalow.caching import ExpiringCache
+from byceps.services.bungalow.events import BungalowOccupancyMovedEvent
+from byceps.services.bungalow.models.bungalow import BungalowID
 from byceps.services.party.models import PartyID
 from byceps.services.shop.product import product_domain_service, product_service
+from byceps.services.shop.product.models import ProductID
+from byceps.services.user.models import UserID
 
-from .models import BungalowCategorySummary
+from .board_feed import BoardFeed, BoardFeeds
+from .models import BungalowBoard, BungalowCategorySummary
 
 
-def get_bungalow_category_summaries(
-    party_id: PartyID,
-) -> list[BungalowCategorySummary]:
-    """Assemble bungalow category summaries."""
-    categories = bungalow_category_service.get_categories_for_party(party_id)
+# Changes to bungalows evict the boards right away, in all processes.
+# The time to live only limits the staleness caused by changes that are
+# not announced (e.g. to products).
+_board_cache: ExpiringCache[PartyID, BungalowBoard] = ExpiringCache(
+    timedelta(minutes=1)
+)
+bungalow_invalidation_service.register_party_cache(_board_cache)
 
-    product_ids = {category.product.id for category in categories}
+_board_feeds = BoardFeeds(capacity=1000)
 
-    products = product_service.get_products(product_ids)
-    products_by_id = {product.id: product for product in products}
+# Prices of bungalow categories rarely change during a party. Changes to
+# categories evict the price tables right away, in all processes, but
+# changes to single bungalows do not. The time to live limits the
+# staleness caused by changes to the products' compilations.
+_category_prices_cache: ExpiringCache[PartyID, dict[ProductID, Money]] = (
+    ExpiringCache(timedelta(minutes=10))
+)
+
+# Holds are neither announced nor evicted when they expire. The short
+# time to live keeps them from appearing on the board for much longer
+# than they are in effect.
+_bungalow_holders_cache: ExpiringCache[PartyID, dict[BungalowID, UserID]] = (
+    ExpiringCache(timedelta(seconds=5))
+)
+
+
+def get_board(party_id: PartyID) -> BungalowBoard:
+    """Return the party's bungalow board.
+
+    The board is assembled once and then served from memory until a
+    bungalow of the party changes.
+    """
+    return _board_cache.get_or_build(party_id, lambda: _build_board(party_id))
+
+
+def _build_board(party_id: PartyID) -> BungalowBoard:
+    built_at = datetime.utcnow()
+
+    bungalows = bungalow_board_service.get_entries_for_party(party_id)
+
+    bungalows_by_number = {bungalow.number: bungalow for bungalow in bungalows}
+
+    bungalow_categories = bungalow_category_service.get_categories_for_party(
+        party_id
+    )
+    bungalow_categories_by_id = {c.id: c for c in bungalow_categories}
+
+    product_ids = {c.product.id for c in bungalow_categories}
+    total_amounts_by_product_id = _get_category_total_amounts(
+        party_id, product_ids
+    )
+
+    ticket_categories_and_occupation_summaries = list(
+        bungalow_stats_service.get_statistics_by_category(party_id)
+    )
+
+    occupation_summaries_by_ticket_category_id = {
+        tc.id: os for tc, os in ticket_categories_and_occupation_summaries
+    }
+
+    statistics_total = bungalow_stats_service.get_statistics_total(
+        ticket_categories_and_occupation_summaries
+    )
+
+    return BungalowBoard(
+        built_at=built_at,
+        bungalows=bungalows,
+        bungalows_by_number=bungalows_by_number,
+        bungalow_categories_by_id=bungalow_categories_by_id,
+        total_amounts_by_product_id=total_amounts_by_product_id,
+        occupation_summaries_by_ticket_category_id=occupation_summaries_by_ticket_category_id,
+        statistics_total=statistics_total,
+    )
+
+
+def get_bungalow_holders(party_id: PartyID) -> dict[BungalowID, UserID]:
+    """Return the users that provisionally hold bungalows of the party,
+    indexed by bungalow ID.
+    """
+    return _bungalow_holders_cache.get_or_build(
+        party_id,
+        lambda: bungalow_hold_service.get_holders_by_bungalow_id(
+            party_id, datetime.utcnow()
+        ),
+    )
+
+
+def _get_category_total_amounts(
+    party_id: PartyID, product_ids: set[ProductID]
+) -> dict[ProductID, Money]:
+    """Return the total amounts of the compilations of the party's
+    bungalow category products.
+
+    They are calculated once and then served from memory until a
+    category of the party changes.
+    """
+    total_amounts_by_product_id = _category_prices_cache.find(party_id)
+    if total_amounts_by_product_id is not None:
+        if product_ids <= total_amounts_by_product_id.keys():
+            return total_amounts_by_product_id
+
+        # A category has been added or has had its product replaced,
+        # but the change notification has not arrived yet.
+        _category_prices_cache.evict(party_id)
 
+    return _category_prices_cache.get_or_build(
+        party_id, lambda: _calculate_total_amounts(product_ids)
+    )
+
+
+@bungalow_invalidation_service.register_handler
+def _evict_category_prices(
+    party_id: PartyID, bungalow_ids: frozenset[BungalowID]
+) -> None:
+    """Evict the party's category prices if its categories might have
+    changed.
+
+    Changes to categories are announced for the whole party, i.e.
+    without bungalow IDs.
+    """
+    if not bungalow_ids:
+        _category_prices_cache.evict(party_id)
+
+
+def _calculate_total_amounts(
+    product_ids: set[ProductID],
+) -> dict[ProductID, Money]:
     product_compilations_by_product_id = (
         product_service.get_product_compilations_for_single_products(
             product_ids
         )
     )
 
-    total_amounts_by_product_id = {
+    return {
         product_id: product_domain_service.calculate_product_compilation_total_amount(
             product_compilations_by_product_id[product_id]
         ).unwrap()
         for product_id in product_ids
     }
 
+
+def evict_board_of_bungalow(bungalow_id: BungalowID) -> None:
+    """Evict the board of the party the bungalow belongs to.
+
+    Evicting also keeps a board that is being built at the same time
+    from being cached.
+    """
+    db_bungalow = bungalow_service.find_db_bungalow(bungalow_id)
+    if db_bungalow is None:
+        return
+
+    _board_cache.evict(db_bungalow.party_id)
+
+
+@bungalow_signals.bungalow_reserved.connect
+@bungalow_signals.bungalow_occupied.connect
+@bungalow_signals.bungalow_released.connect
+@bungalow_signals.occupancy_moved.connect
+@bungalow_signals.avatar_updated.connect
+@bungalow_signals.description_updated.connect
+@bungalow_signals.occupant_added.connect
+@bungalow_signals.occupant_removed.connect
+def _on_bungalow_changed(sender, *, event) -> None:
+    # Evict right away, without waiting for the change notification, so
+    # that users see their own changes.
+    if isinstance(event, BungalowOccupancyMovedEvent):
+        bungalow_ids = {event.source_bungalow_id, event.target_bungalow_id}
+    else:
+        bungalow_ids = {event.bungalow_id}
+
+    for bungalow_id in bungalow_ids:
+        evict_board_of_bungalow(bungalow_id)
+
+
+def get_board_feed(party_id: PartyID) -> BoardFeed:
+    """Return the feed of changes to the party's bungalow board."""
+    return _board_feeds.get_feed(party_id)
+
+
+@bungalow_invalidation_service.register_handler
+def _publish_board_changes(
+    party_id: PartyID, bungalow_ids: frozenset[BungalowID]
+) -> None:
+    """Publish the current state of the changed bungalows to the
+    party's board feed.
+
+    This happens in every process, once per change. The bungalows are
+    looked up once, regardless of how many clients follow the feed.
+
+    If no bungalows are given, any of the party's bungalows might have
+    changed, and the clients are told to reload the board.
+    """
+    feed = get_board_feed(party_id)
+
+    if not bungalow_ids:
+        feed.publish_reload()
+        return
+
+    bungalows = bungalow_service.get_bungalows(set(bungalow_ids))
+    if not bungalows:
+        return
+
+    feed.publish(bungalows)
+
+
+def get_bungalow_category_summaries(
+    party_id: PartyID,
+) -> list[BungalowCategorySummary]:
+    """Assemble bungalow category summaries."""
+    categories = bungalow_category_service.get_categories_for_party(party_id)
+
+    product_ids = {category.product.id for category in categories}
+
+    products = product_service.get_products(product_ids)
+    products_by_id = {product.id: product for product in products}
+
+    total_amounts_by_product_id = _get_category_total_amounts(
+        party_id, product_ids
+    )
+
     summaries = []
 
     for category in categories:
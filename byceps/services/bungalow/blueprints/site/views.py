@@ -6,20 +6,37 @@ byceps.services.bungalow.blueprints.site.views
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
-from datetime import datetime
+from collections.abc import Iterator
+from datetime import datetime, timedelta
 from functools import wraps
-
-from flask import abort, g, render_template, request
+import json
+from time import monotonic
+from uuid import UUID
+
+from flask import (
+    abort,
+    current_app,
+    g,
+    render_template,
+    request,
+    Response,
+    session,
+)
 from flask_babel import gettext
 
 from byceps.services.bungalow import (
+    bungalow_admission_service,
+    bungalow_board_service,
     bungalow_category_service,
+    bungalow_hold_service,
+    bungalow_invalidation_service,
     bungalow_occupancy_avatar_service,
     bungalow_occupancy_service,
     bungalow_order_service,
+    bungalow_outbox_service,
     bungalow_service,
-    bungalow_stats_service,
     signals as bungalow_signals,
+    user_loading,
 )
 from byceps.services.bungalow.dbmodels.bungalow import DbBungalow
 from byceps.services.bungalow.errors import (
@@ -33,6 +50,7 @@ from byceps.services.bungalow.events import (
     BungalowOccupantAddedEvent,
     BungalowOccupantRemovedEvent,
 )
+from byceps.services.bungalow.models.admission import AdmissionTicket
 from byceps.services.bungalow.models.bungalow import (
     BungalowID,
     BungalowOccupationState,
@@ -43,12 +61,15 @@ from byceps.services.bungalow.models.category import (
 )
 from byceps.services.bungalow.models.occupation import (
     BungalowOccupancy,
+    BungalowOrderRequest,
     OccupancyID,
     OccupantSlot,
+    OccupantTicketCursor,
 )
 from byceps.services.country import country_service
 from byceps.services.orga_team import orga_team_service
 from byceps.services.party import party_service
+from byceps.services.party.models import PartyID
 from byceps.services.shop.order import signals as shop_order_signals
 from byceps.services.shop.order.blueprints.site.forms import OrderForm
 from byceps.services.shop.order.email import order_email_service
@@ -71,15 +92,41 @@ from byceps.util.framework.flash import flash_error, flash_notice, flash_success
 from byceps.util.framework.templating import templated
 from byceps.util.image.image_type import get_image_type_names
 from byceps.util.result import Err, Ok
+from byceps.util.uuid import generate_uuid7
 from byceps.util.views import login_required, redirect_to, respond_no_content
 
 from . import service
 from .forms import AvatarUpdateForm, DescriptionUpdateForm, OccupantAddForm
+from .models import BungalowBoardChange
 
 
 blueprint = create_blueprint('bungalow', __name__)
 
 
+ADMISSION_REFRESH_INTERVAL_IN_SECONDS = 5
+ADMISSION_TICKETS_SESSION_KEY = 'bungalow_admission_tickets'
+
+BOARD_CHANGES_KEEPALIVE_INTERVAL_IN_SECONDS = 15
+BOARD_CHANGES_RECONNECT_DELAY_IN_MILLISECONDS = 3000
+# Streams are ended after this time to free the worker serving them. The
+# client reconnects on its own and resumes after the last change it has
+# received.
+BOARD_CHANGES_STREAM_DURATION_IN_SECONDS = 30
+# Changes are resent from a little earlier than requested when a client
+# reconnects.
+BOARD_CHANGES_CATCH_UP_MARGIN = timedelta(seconds=5)
+
+# Search results are counted only up to this number.
+OCCUPANT_SEARCH_COUNT_LIMIT = 1000
+
+
+@blueprint.before_app_request
+def _start_bungalow_invalidation_listener() -> None:
+    bungalow_invalidation_service.start_listener(
+        current_app._get_current_object()
+    )
+
+
 def bungalow_support_required(func):
     """Ensure that the site is configured to support bungalows."""
 
@@ -93,6 +140,38 @@ def bungalow_support_required(func):
     return wrapper
 
 
+def admission_required(func):
+    """Let users in only once they have been admitted by the party's
+    admission queue.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        now = datetime.utcnow()
+
+        ticket = _find_admission_ticket(g.party.id)
+        if ticket is None:
+            ticket = bungalow_admission_service.issue_ticket(g.party.id, now)
+            _store_admission_ticket(ticket)
+
+        if not ticket.is_admitted(now):
+            seconds_to_wait = ticket.get_seconds_to_wait(now)
+            refresh_interval_in_seconds = min(
+                max(seconds_to_wait, 1), ADMISSION_REFRESH_INTERVAL_IN_SECONDS
+            )
+
+            return render_template(
+                'site/bungalow/admission_waiting.html',
+                position=ticket.get_position(now),
+                seconds_to_wait=seconds_to_wait,
+                refresh_interval_in_seconds=refresh_interval_in_seconds,
+            )
+
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
 def enabled_bungalow_customization_required(func):
     """Require bungalow customization to be enabled."""
 
@@ -131,80 +210,124 @@ def enabled_ticket_management_required(func):
 @subnavigation_for_view('bungalows')
 def index():
     """List all bungalows."""
-    db_bungalows = bungalow_service.get_bungalows_extended_for_party(g.party.id)
+    board = service.get_board(g.party.id)
 
-    bungalows_by_number = {
-        db_bungalow.number: db_bungalow for db_bungalow in db_bungalows
-    }
-
-    bungalow_categories = bungalow_category_service.get_categories_for_party(
-        g.party.id
-    )
-    bungalow_categories_by_id = {c.id: c for c in bungalow_categories}
-
-    product_ids = {c.product.id for c in bungalow_categories}
-    product_compilations_by_product_id = (
-        product_service.get_product_compilations_for_single_products(
-            product_ids
-        )
+    my_bungalow = bungalow_service.find_bungalow_inhabited_by_user(
+        g.user.id, g.party.id
     )
 
-    total_amounts_by_product_id = {
-        product_id: product_domain_service.calculate_product_compilation_total_amount(
-            product_compilations_by_product_id[product_id]
-        ).unwrap()
-        for product_id in product_ids
+    held_bungalow_ids = {
+        bungalow_id
+        for bungalow_id, holder_id in service.get_bungalow_holders(
+            g.party.id
+        ).items()
+        if holder_id != g.user.id
     }
 
-    occupancy_ids = {
-        db_bungalow.occupancy.id
-        for db_bungalow in db_bungalows
-        if db_bungalow.occupancy
+    return {
+        'bungalows': board.bungalows,
+        'bungalows_by_number': board.bungalows_by_number,
+        'bungalow_categories_by_id': board.bungalow_categories_by_id,
+        'total_amounts_by_product_id': board.total_amounts_by_product_id,
+        'is_product_available_now': product_domain_service.is_product_available_now,
+        'my_bungalow_id': my_bungalow.id if my_bungalow is not None else None,
+        'occupation_summaries_by_ticket_category_id': board.occupation_summaries_by_ticket_category_id,
+        'statistics_total': board.statistics_total,
+        'board_built_at': board.built_at,
+        'held_bungalow_ids': held_bungalow_ids,
     }
-    occupant_slots_by_occupancy_id = (
-        bungalow_occupancy_service.get_occupant_slots_for_occupancies(
-            occupancy_ids
-        )
-    )
 
-    occupancy_user_ids = {
-        db_bungalow.occupancy.occupied_by_id
-        for db_bungalow in db_bungalows
-        if db_bungalow.occupancy
-    }
-    user_ids = occupancy_user_ids
-    users_by_id = user_service.get_users_indexed_by_id(
-        user_ids, include_avatars=True
-    )
 
-    my_bungalow = bungalow_service.find_bungalow_inhabited_by_user(
-        g.user.id, g.party.id
-    )
+@blueprint.get('/board/changes')
+@bungalow_support_required
+def board_changes():
+    """Stream changes to the bungalow board as server-sent events."""
+    position = _get_board_changes_position()
+    feed = service.get_board_feed(g.party.id)
+
+    def generate() -> Iterator[str]:
+        yield f'retry: {BOARD_CHANGES_RECONNECT_DELAY_IN_MILLISECONDS:d}\n\n'
+
+        ends_at = monotonic() + BOARD_CHANGES_STREAM_DURATION_IN_SECONDS
+
+        current_position = position
+        while (remaining_seconds := ends_at - monotonic()) > 0:
+            changes = feed.wait_for_changes_after(
+                current_position,
+                min(
+                    BOARD_CHANGES_KEEPALIVE_INTERVAL_IN_SECONDS,
+                    remaining_seconds,
+                ),
+            )
+
+            if changes is None:
+                # Changes might have been missed; start over.
+                yield 'event: reload\ndata: \n\n'
+                return
 
-    ticket_categories_and_occupation_summaries = list(
-        bungalow_stats_service.get_statistics_by_category(g.party.id)
+            if not changes:
+                yield ': keepalive\n\n'
+                continue
+
+            for change in changes:
+                yield _format_board_change_event(change)
+
+            current_position = changes[-1].changed_at
+
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            # Prevent reverse proxies from buffering the stream.
+            'X-Accel-Buffering': 'no',
+        },
     )
 
-    occupation_summaries_by_ticket_category_id = {
-        tc.id: os for tc, os in ticket_categories_and_occupation_summaries
-    }
 
-    statistics_total = bungalow_stats_service.get_statistics_total(
-        ticket_categories_and_occupation_summaries
+def _get_board_changes_position() -> datetime:
+    """Return the position in the board feed after which to send
+    changes.
+
+    A new client starts after the point in time its board was built at,
+    a reconnecting one after the last event it has received.
+    """
+    last_event_id = request.headers.get('Last-Event-ID')
+    if last_event_id:
+        position = _parse_board_changes_position(last_event_id)
+        if position is not None:
+            # The client might have been connected to another process,
+            # which has received changes in a slightly different order.
+            return position - BOARD_CHANGES_CATCH_UP_MARGIN
+
+    position = _parse_board_changes_position(request.args.get('since'))
+    if position is not None:
+        return position
+
+    return datetime.utcnow()
+
+
+def _parse_board_changes_position(value: str | None) -> datetime | None:
+    if not value:
+        return None
+
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _format_board_change_event(change: BungalowBoardChange) -> str:
+    data = json.dumps(
+        {
+            'number': change.bungalow_number,
+            'state': change.occupation_state.name,
+            'title': change.title,
+            'avatar_url': change.avatar_url,
+        }
     )
 
-    return {
-        'bungalows': db_bungalows,
-        'bungalows_by_number': bungalows_by_number,
-        'bungalow_categories_by_id': bungalow_categories_by_id,
-        'total_amounts_by_product_id': total_amounts_by_product_id,
-        'occupant_slots_by_occupancy_id': occupant_slots_by_occupancy_id,
-        'users_by_id': users_by_id,
-        'is_product_available_now': product_domain_service.is_product_available_now,
-        'my_bungalow_id': my_bungalow.id if my_bungalow is not None else None,
-        'occupation_summaries_by_ticket_category_id': occupation_summaries_by_ticket_category_id,
-        'statistics_total': statistics_total,
-    }
+    return f'id: {change.changed_at.isoformat()}\ndata: {data}\n\n'
 
 
 @blueprint.get('/<int:number>')
@@ -218,33 +341,37 @@ def view(number: int):
     ticket_management_enabled = _is_ticket_management_enabled()
     bungalow_customization_enabled = _get_bungalow_customization_enabled()
 
-    if db_bungalow.reserved:
-        reserved_by = user_service.find_user(
-            db_bungalow.occupancy.occupied_by_id, include_avatar=True
-        )
-    else:
-        reserved_by = None
+    user_loader = user_loading.get_user_loader()
 
     if db_bungalow.occupied:
         manager_id = db_bungalow.occupancy.manager_id
-        manager = user_service.get_user(manager_id)
 
-        current_user_is_main_occupant = (
-            db_bungalow.occupancy.occupied_by_id == g.user.id
-        )
-        current_user_is_manager = manager.id == g.user.id
+        # Look up the manager along with the occupants.
+        user_loader.prime([manager_id])
 
         occupant_slots = (
             bungalow_occupancy_service.get_occupant_slots_for_occupancy(
-                db_bungalow.occupancy.id
+                db_bungalow.occupancy.id, get_users=user_loader.get_many
             )
         )
+
+        manager = user_loader.get(manager_id)
+
+        current_user_is_main_occupant = (
+            db_bungalow.occupancy.occupied_by_id == g.user.id
+        )
+        current_user_is_manager = manager.id == g.user.id
     else:
         current_user_is_main_occupant = False
         current_user_is_manager = False
         manager = None
         occupant_slots = None
 
+    if db_bungalow.reserved:
+        reserved_by = user_loader.find(db_bungalow.occupancy.occupied_by_id)
+    else:
+        reserved_by = None
+
     return {
         'bungalow': db_bungalow,
         'reserved_by': reserved_by,
@@ -282,6 +409,7 @@ def view_mine():
 @blueprint.get('/order_with_preselection/<uuid:bungalow_id>')
 @login_required
 @bungalow_support_required
+@admission_required
 @templated
 @subnavigation_for_view('bungalows')
 def order_with_preselection_form(
@@ -335,6 +463,15 @@ def order_with_preselection_form(
         )
         return {'bungalow': None}
 
+    # Keep others from starting to order the bungalow while the form
+    # is being filled in.
+    match bungalow_hold_service.hold_bungalow(
+        db_bungalow.id, g.party.id, g.user.id, datetime.utcnow()
+    ):
+        case Err(_):
+            _flash_bungalow_held_by_another_user(db_bungalow)
+            return {'bungalow': None}
+
     form = erroneous_form if erroneous_form else OrderForm(obj=user_detail)
 
     country_names = country_service.get_country_names()
@@ -348,6 +485,9 @@ def order_with_preselection_form(
             flash_error('Für einige Artikel ist keine Stückzahl vorgegeben.')
             return {'bungalow': None}
 
+    # Keep the key of a form that is shown again after a failed attempt.
+    request_key = request.form.get('request_key') or str(generate_uuid7())
+
     return {
         'bungalow': db_bungalow,
         'form': form,
@@ -355,14 +495,34 @@ def order_with_preselection_form(
         'collections': collections,
         'images_by_product_id': {},
         'total_amount': total_amount,
+        'request_key': request_key,
     }
 
 
 @blueprint.post('/order_with_preselection/<uuid:bungalow_id>')
 @bungalow_support_required
 @login_required
+@admission_required
 def order_with_preselection(bungalow_id: BungalowID):
     """Order a bungalow."""
+    request_key = _get_order_request_key_or_400()
+
+    # Claim the key before anything else. A repeated submission of the
+    # form (e.g. a double click or a retry) is answered right away from
+    # the state of the original request instead of ordering again.
+    order_request = bungalow_order_service.claim_order_request(
+        request_key, g.user.id
+    )
+    if order_request is not None:
+        return _replay_order_request(order_request)
+
+    try:
+        return _order_with_preselection(bungalow_id, request_key)
+    finally:
+        bungalow_order_service.conclude_order_request(request_key)
+
+
+def _order_with_preselection(bungalow_id: BungalowID, request_key: UUID):
     db_bungalow = _get_bungalow_for_id_or_404(bungalow_id)
 
     db_product = db_bungalow.category.product
@@ -381,6 +541,14 @@ def order_with_preselection(bungalow_id: BungalowID):
         flash_error(f'Bungalow {db_bungalow.number} ist bereits reserviert.')
         return order_with_preselection_form(bungalow_id)
 
+    if bungalow_hold_service.is_bungalow_held_by_another_user(
+        db_bungalow.id, g.user.id, datetime.utcnow()
+    ):
+        # Showing the form again would try to hold the bungalow (and
+        # fail) once more.
+        _flash_bungalow_held_by_another_user(db_bungalow)
+        return redirect_to('.index')
+
     if (
         not db_product
         or db_product.quantity < 1
@@ -407,7 +575,9 @@ def order_with_preselection(bungalow_id: BungalowID):
 
     orderer = form.get_orderer(user)
 
-    match bungalow_occupancy_service.reserve_bungalow(db_bungalow.id, user):
+    match bungalow_occupancy_service.reserve_bungalow(
+        db_bungalow.id, user, request_key=request_key
+    ):
         case Ok((reservation, occupancy, bungalow_reserved_event)):
             pass
         case Err(_):
@@ -422,7 +592,11 @@ def order_with_preselection(bungalow_id: BungalowID):
     )
 
     match bungalow_occupancy_service.place_bungalow_with_preselection_order(
-        storefront, reservation.id, occupancy.id, orderer
+        storefront,
+        reservation.id,
+        occupancy.id,
+        orderer,
+        request_key=request_key,
     ):
         case Ok((order, order_placed_event)):
             pass
@@ -446,6 +620,36 @@ def order_with_preselection(bungalow_id: BungalowID):
     return redirect_to('shop_orders.view', order_id=order.id)
 
 
+def _flash_bungalow_held_by_another_user(db_bungalow: DbBungalow) -> None:
+    flash_error(
+        f'Bungalow {db_bungalow.number} wird gerade von jemand anderem '
+        'gebucht. Bitte versuche es in ein paar Minuten erneut.'
+    )
+
+
+def _get_order_request_key_or_400() -> UUID:
+    try:
+        return UUID(request.form.get('request_key', ''))
+    except ValueError:
+        abort(400)
+
+
+def _replay_order_request(order_request: BungalowOrderRequest):
+    if order_request.user_id != g.user.id:
+        abort(400)
+
+    if order_request.order_id is not None:
+        return redirect_to('shop_orders.view', order_id=order_request.order_id)
+
+    if not order_request.concluded:
+        flash_notice('Deine Bestellung wird noch bearbeitet.')
+        return redirect_to('shop_orders.index')
+
+    # The original request has failed after reserving the bungalow.
+    flash_error(gettext('Placing the order has failed.'))
+    return redirect_to('.index')
+
+
 # -------------------------------------------------------------------- #
 # categories
 
@@ -610,41 +814,47 @@ def category_order(category_id: BungalowCategoryID):
 # occupants
 
 
-@blueprint.get('/occupants', defaults={'page': 1})
-@blueprint.get('/occupants/pages/<int:page>')
+@blueprint.get('/occupants')
 @bungalow_support_required
 @templated
 @subnavigation_for_view('occupants')
-def occupant_index_all(page: int):
+def occupant_index_all():
     """List occupants of all bungalows."""
     per_page = request.args.get('per_page', type=int, default=20)
     search_term = request.args.get('search_term', default='').strip()
+    after = OccupantTicketCursor.parse(request.args.get('after', default=''))
 
-    tickets = bungalow_service.get_all_occupant_tickets_paginated(
-        g.party.id, page, per_page, search_term=search_term
+    tickets, next_cursor = bungalow_service.get_occupant_tickets(
+        g.party.id, per_page, after=after, search_term=search_term
     )
 
-    ticket_user_ids = {
-        ticket.used_by_id for ticket in tickets.items if ticket.used_by_id
-    }
-    if g.party:
-        orga_ids = orga_team_service.select_orgas_for_party(
-            ticket_user_ids, g.party.id
+    # Only count search results, and only on the first page.
+    if search_term and (after is None):
+        total = bungalow_service.count_occupant_tickets(
+            g.party.id,
+            search_term=search_term,
+            up_to=OCCUPANT_SEARCH_COUNT_LIMIT,
         )
     else:
-        orga_ids = set()
+        total = None
+
+    ticket_user_ids = {
+        ticket.used_by_id for ticket in tickets if ticket.used_by_id
+    }
+    orga_ids = orga_team_service.select_orgas_for_party(
+        ticket_user_ids, g.party.id
+    )
 
-    ticket_bundle_ids = {t.bundle_id for t in tickets.items}
+    ticket_bundle_ids = {t.bundle_id for t in tickets}
     bungalows_by_ticket_bundle_id = (
         bungalow_occupancy_service.get_bungalows_for_ticket_bundles(
             ticket_bundle_ids
         )
     )
 
-    tickets_and_bungalows = tickets
-    tickets_and_bungalows.items = [
+    tickets_and_bungalows = [
         (ticket, bungalows_by_ticket_bundle_id.get(ticket.bundle_id))
-        for ticket in tickets.items
+        for ticket in tickets
     ]
 
     return {
@@ -652,6 +862,10 @@ def occupant_index_all(page: int):
         'orga_ids': orga_ids,
         'per_page': per_page,
         'search_term': search_term,
+        'after': after,
+        'next_cursor': next_cursor,
+        'total': total,
+        'total_limit': OCCUPANT_SEARCH_COUNT_LIMIT,
     }
 
 
@@ -773,6 +987,9 @@ def occupant_add(ticket_id: TicketID):
     occupant = form.occupant.data
 
     ticket_user_management_service.appoint_user(ticket.id, occupant, manager)
+    bungalow_board_service.refresh_entries(
+        db_bungalow.party_id, [db_bungalow.id]
+    )
 
     flash_success(
         f'"{occupant.screen_name}" wurde als Mitbewohner '
@@ -786,6 +1003,7 @@ def occupant_add(ticket_id: TicketID):
         bungalow_number=db_bungalow.number,
         occupant=occupant,
     )
+    bungalow_outbox_service.persist_event(event)
     bungalow_signals.occupant_added.send(None, event=event)
 
     return redirect_to('.occupant_index', number=db_bungalow.number)
@@ -849,6 +1067,9 @@ def occupant_remove(ticket_id: TicketID):
     occupant = user_service.get_user(occupant_id)
 
     ticket_user_management_service.withdraw_user(ticket.id, manager)
+    bungalow_board_service.refresh_entries(
+        db_bungalow.party_id, [db_bungalow.id]
+    )
 
     flash_success(
         f'"{occupant.screen_name}" wurde als Mitbewohner '
@@ -862,6 +1083,7 @@ def occupant_remove(ticket_id: TicketID):
         bungalow_number=db_bungalow.number,
         occupant=occupant,
     )
+    bungalow_outbox_service.persist_event(event)
     bungalow_signals.occupant_removed.send(None, event=event)
 
     return redirect_to('.occupant_index', number=db_bungalow.number)
@@ -1021,6 +1243,7 @@ def avatar_update(occupancy_id: OccupancyID):
         bungalow_id=db_bungalow.id,
         bungalow_number=db_bungalow.number,
     )
+    bungalow_outbox_service.persist_event(event)
     bungalow_signals.avatar_updated.send(None, event=event)
 
     return redirect_to('.view', number=db_bungalow.number)
@@ -1123,3 +1346,28 @@ def _get_bungalow_for_ticket_bundle(
     return bungalow_occupancy_service.get_bungalow_for_ticket_bundle(
         ticket_bundle_id
     )
+
+
+def _find_admission_ticket(party_id: PartyID) -> AdmissionTicket | None:
+    tickets_by_party_id = session.get(ADMISSION_TICKETS_SESSION_KEY, {})
+
+    ticket_data = tickets_by_party_id.get(str(party_id))
+    if ticket_data is None:
+        return None
+
+    return AdmissionTicket(
+        party_id=party_id,
+        admissible_at=datetime.fromisoformat(ticket_data['admissible_at']),
+        admission_rate=ticket_data['admission_rate'],
+    )
+
+
+def _store_admission_ticket(ticket: AdmissionTicket) -> None:
+    tickets_by_party_id = session.get(ADMISSION_TICKETS_SESSION_KEY, {})
+
+    tickets_by_party_id[str(ticket.party_id)] = {
+        'admissible_at': ticket.admissible_at.isoformat(),
+        'admission_rate': ticket.admission_rate,
+    }
+
+    session[ADMISSION_TICKETS_SESSION_KEY] = tickets_by_party_id
@@ -0,0 +1,101 @@
+"""
+byceps.services.bungalow.bungalow_admission_service
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Admission queue in front of the ordering flow
+
+Every user gets a ticket with the point in time at which they will be
+admitted. Tickets are spaced by the party's admission rate, so only a
+limited number of users per second reach the ordering flow.
+
+Issuing a ticket takes a single statement. The ticket is then kept by
+the user, so waiting for admission does not touch the database.
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects.postgresql import insert
+
+from byceps.database import db
+from byceps.services.party import party_setting_service
+from byceps.services.party.models import PartyID
+
+from .dbmodels.admission import DbBungalowAdmissionQueue
+from .models.admission import AdmissionTicket
+
+
+ADMISSION_RATE_SETTING_NAME = 'bungalow_admission_rate'
+
+
+def get_admission_rate(party_id: PartyID) -> float | None:
+    """Return the number of users per second to admit to the party's
+    ordering flow, or `None` if admission is not limited.
+    """
+    value = party_setting_service.find_setting_value(
+        party_id, ADMISSION_RATE_SETTING_NAME
+    )
+    if value is None:
+        return None
+
+    try:
+        admission_rate = float(value)
+    except ValueError:
+        return None
+
+    if admission_rate <= 0:
+        return None
+
+    return admission_rate
+
+
+def issue_ticket(party_id: PartyID, now: datetime) -> AdmissionTicket:
+    """Issue a ticket for the party's admission queue."""
+    admission_rate = get_admission_rate(party_id)
+    if admission_rate is None:
+        return AdmissionTicket(
+            party_id=party_id, admissible_at=now, admission_rate=None
+        )
+
+    admissible_at = _claim_next_admission_slot(
+        party_id, now, timedelta(seconds=1 / admission_rate)
+    )
+
+    return AdmissionTicket(
+        party_id=party_id,
+        admissible_at=admissible_at,
+        admission_rate=admission_rate,
+    )
+
+
+def _claim_next_admission_slot(
+    party_id: PartyID, now: datetime, slot_interval: timedelta
+) -> datetime:
+    """Claim the next free admission slot and return its point in time.
+
+    A slot is never earlier than `now`, so unused slots of quiet periods
+    do not pile up and let a subsequent rush in all at once.
+    """
+    table = DbBungalowAdmissionQueue.__table__
+
+    next_admission_at = db.session.scalar(
+        insert(table)
+        .values(party_id=party_id, next_admission_at=now + slot_interval)
+        .on_conflict_do_update(
+            index_elements=[table.c.party_id],
+            set_={
+                'next_admission_at': db.func.greatest(
+                    table.c.next_admission_at, now
+                )
+                + slot_interval
+            },
+        )
+        .returning(table.c.next_admission_at)
+    )
+    db.session.commit()
+
+    return next_admission_at - slot_interval
@@ -0,0 +1,225 @@
+"""
+byceps.services.bungalow.bungalow_board_repository
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Bungalows as shown on the boards, one row per bungalow
+
+The entries are updated in the same transaction that changes what they
+show, but are not committed here.
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from byceps.database import db
+from byceps.services.party.models import PartyID
+from byceps.services.ticketing.dbmodels.ticket import DbTicket
+from byceps.services.ticketing.models.ticket import TicketBundleID
+from byceps.services.user.dbmodels import DbUser
+from byceps.services.user.models import UserID
+
+from .dbmodels.board_entry import DbBungalowBoardEntry
+from .dbmodels.bungalow import DbBungalow
+from .dbmodels.occupancy import DbBungalowOccupancy
+from .models.bungalow import BungalowID
+
+
+def update_entries(bungalow_ids: Iterable[BungalowID]) -> None:
+    """Bring the bungalows' entries up to date."""
+    bungalow_ids = set(bungalow_ids)
+    if not bungalow_ids:
+        return
+
+    # Reload the bungalows even if they are in the session already, as
+    # their relationships do not reflect occupancies that have just
+    # been removed or moved.
+    db_bungalows = db.session.scalars(
+        select(DbBungalow)
+        .filter(DbBungalow.id.in_(bungalow_ids))
+        .options(
+            db.joinedload(DbBungalow.category),
+            db.joinedload(DbBungalow.occupancy).joinedload(
+                DbBungalowOccupancy.avatar
+            ),
+        )
+        .execution_options(populate_existing=True)
+    ).unique().all()
+
+    _write_entries(db_bungalows)
+
+
+def update_entries_for_party(party_id: PartyID) -> None:
+    """Bring the entries of all of the party's bungalows up to date."""
+    bungalow_ids = db.session.scalars(
+        select(DbBungalow.id).filter_by(party_id=party_id)
+    ).all()
+
+    update_entries(bungalow_ids)
+
+
+def rebuild_entries(party_id: PartyID) -> None:
+    """Recreate the entries of all of the party's bungalows."""
+    db.session.execute(
+        delete(DbBungalowBoardEntry).filter_by(party_id=party_id)
+    )
+
+    update_entries_for_party(party_id)
+
+    db.session.commit()
+
+
+def _write_entries(db_bungalows: Sequence[DbBungalow]) -> None:
+    if not db_bungalows:
+        return
+
+    db_occupancies = [
+        db_bungalow.occupancy
+        for db_bungalow in db_bungalows
+        if db_bungalow.occupancy
+    ]
+
+    screen_names_by_user_id = _get_screen_names(
+        {db_occupancy.occupied_by_id for db_occupancy in db_occupancies}
+    )
+
+    slot_counts_by_ticket_bundle_id = _get_slot_counts(
+        {
+            db_occupancy.ticket_bundle_id
+            for db_occupancy in db_occupancies
+            if db_occupancy.ticket_bundle_id
+        }
+    )
+
+    rows = [
+        _build_row(
+            db_bungalow,
+            screen_names_by_user_id,
+            slot_counts_by_ticket_bundle_id,
+        )
+        for db_bungalow in db_bungalows
+    ]
+
+    table = DbBungalowBoardEntry.__table__
+    insert_stmt = insert(table).values(rows)
+
+    db.session.execute(
+        insert_stmt.on_conflict_do_update(
+            index_elements=[table.c.bungalow_id],
+            set_={
+                column.name: insert_stmt.excluded[column.name]
+                for column in table.columns
+                if column.name != 'bungalow_id'
+            },
+        )
+    )
+
+
+def _get_screen_names(user_ids: set[UserID]) -> dict[UserID, str | None]:
+    if not user_ids:
+        return {}
+
+    rows = db.session.execute(
+        select(DbUser.id, DbUser.screen_name).filter(DbUser.id.in_(user_ids))
+    ).all()
+
+    return dict(rows)
+
+
+def _get_slot_counts(
+    ticket_bundle_ids: set[TicketBundleID],
+) -> dict[TicketBundleID, tuple[int, int]]:
+    """Return the number of occupied and of all slots per bundle."""
+    if not ticket_bundle_ids:
+        return {}
+
+    rows = db.session.execute(
+        select(
+            DbTicket.bundle_id,
+            db.func.count(DbTicket.used_by_id),
+            db.func.count(DbTicket.id),
+        )
+        .filter(DbTicket.bundle_id.in_(ticket_bundle_ids))
+        .group_by(DbTicket.bundle_id)
+    ).all()
+
+    return {
+        bundle_id: (occupied_slots, total_slots)
+        for bundle_id, occupied_slots, total_slots in rows
+    }
+
+
+def _build_row(
+    db_bungalow: DbBungalow,
+    screen_names_by_user_id: dict[UserID, str | None],
+    slot_counts_by_ticket_bundle_id: dict[TicketBundleID, tuple[int, int]],
+) -> dict[str, Any]:
+    db_category = db_bungalow.category
+    db_occupancy = db_bungalow.occupancy
+
+    row = {
+        'bungalow_id': db_bungalow.id,
+        'party_id': db_bungalow.party_id,
+        'number': db_bungalow.number,
+        'occupation_state': db_bungalow.occupation_state.name,
+        'distributes_network': db_bungalow.distributes_network,
+        'category_id': db_category.id,
+        'category_title': db_category.title,
+        'category_capacity': db_category.capacity,
+        'occupancy_id': None,
+        'occupancy_title': None,
+        'avatar_url': None,
+        'occupier_id': None,
+        'occupier_screen_name': None,
+        'manager_id': None,
+        'order_number': None,
+        'ticket_bundle_id': None,
+        'pinned': False,
+        'internal_remark': None,
+        'occupied_slots': 0,
+        'total_slots': 0,
+    }
+
+    if db_occupancy:
+        occupied_slots, total_slots = slot_counts_by_ticket_bundle_id.get(
+            db_occupancy.ticket_bundle_id, (0, 0)
+        )
+
+        row.update(
+            {
+                'occupancy_id': db_occupancy.id,
+                'occupancy_title': db_occupancy.title,
+                'avatar_url': db_occupancy.get_avatar_url(db_bungalow.party_id),
+                'occupier_id': db_occupancy.occupied_by_id,
+                'occupier_screen_name': screen_names_by_user_id.get(
+                    db_occupancy.occupied_by_id
+                ),
+                'manager_id': db_occupancy.manager_id,
+                'order_number': db_occupancy.order_number,
+                'ticket_bundle_id': db_occupancy.ticket_bundle_id,
+                'pinned': db_occupancy.pinned,
+                'internal_remark': db_occupancy.internal_remark,
+                'occupied_slots': occupied_slots,
+                'total_slots': total_slots,
+            }
+        )
+
+    return row
+
+
+def get_entries_for_party(
+    party_id: PartyID,
+) -> Sequence[DbBungalowBoardEntry]:
+    """Return the entries of the party's bungalows, ordered by number."""
+    return db.session.scalars(
+        select(DbBungalowBoardEntry)
+        .filter_by(party_id=party_id)
+        .order_by(DbBungalowBoardEntry.number)
+    ).all()
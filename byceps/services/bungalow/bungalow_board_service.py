@@ -0,0 +1,78 @@
+"""
+byceps.services.bungalow.bungalow_board_service
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from byceps.database import db
+from byceps.services.party.models import PartyID
+
+from . import bungalow_board_repository, bungalow_invalidation_service
+from .dbmodels.board_entry import DbBungalowBoardEntry
+from .models.board import BungalowBoardEntry
+from .models.bungalow import BungalowID
+
+
+def get_entries_for_party(party_id: PartyID) -> list[BungalowBoardEntry]:
+    """Return the party's bungalows as shown on the boards, ordered by
+    number.
+    """
+    db_entries = bungalow_board_repository.get_entries_for_party(party_id)
+
+    return [_db_entity_to_entry(db_entry) for db_entry in db_entries]
+
+
+def refresh_entries(
+    party_id: PartyID, bungalow_ids: Iterable[BungalowID]
+) -> None:
+    """Bring the bungalows' entries up to date after a change that has
+    been made outside of the bungalow services, e.g. to their tickets.
+    """
+    bungalow_ids = set(bungalow_ids)
+
+    bungalow_board_repository.update_entries(bungalow_ids)
+    bungalow_invalidation_service.notify_bungalows_changed(
+        party_id, bungalow_ids
+    )
+
+    db.session.commit()
+
+
+def rebuild_entries(party_id: PartyID) -> None:
+    """Recreate the entries of all of the party's bungalows.
+
+    Use this to create entries for bungalows offered before the entries
+    were introduced, and to repair entries that have diverged.
+    """
+    bungalow_board_repository.rebuild_entries(party_id)
+
+
+def _db_entity_to_entry(db_entry: DbBungalowBoardEntry) -> BungalowBoardEntry:
+    return BungalowBoardEntry(
+        id=db_entry.bungalow_id,
+        party_id=db_entry.party_id,
+        number=db_entry.number,
+        occupation_state=db_entry.occupation_state,
+        distributes_network=db_entry.distributes_network,
+        category_id=db_entry.category_id,
+        category_title=db_entry.category_title,
+        category_capacity=db_entry.category_capacity,
+        occupancy_id=db_entry.occupancy_id,
+        occupancy_title=db_entry.occupancy_title,
+        avatar_url=db_entry.avatar_url,
+        occupier_id=db_entry.occupier_id,
+        occupier_screen_name=db_entry.occupier_screen_name,
+        manager_id=db_entry.manager_id,
+        order_number=db_entry.order_number,
+        ticket_bundle_id=db_entry.ticket_bundle_id,
+        pinned=db_entry.pinned,
+        internal_remark=db_entry.internal_remark,
+        occupied_slots=db_entry.occupied_slots,
+        total_slots=db_entry.total_slots,
+    )
@@ -16,6 +16,11 @@ from byceps.services.shop.product.models import ProductID
 from byceps.services.ticketing.models.ticket import TicketCategoryID
 from byceps.util.uuid import generate_uuid7
 
+from . import (
+    bungalow_board_repository,
+    bungalow_invalidation_service,
+    bungalow_occupation_counter_repository,
+)
 from .dbmodels.category import DbBungalowCategory
 from .model_converters import _db_entity_to_bungalow_category
 from .models.category import BungalowCategory, BungalowCategoryID
@@ -48,6 +53,9 @@ def create_category(
     )
 
     db.session.add(db_bungalow_category)
+
+    bungalow_invalidation_service.notify_party_changed(party_id)
+
     db.session.commit()
 
     return _db_entity_to_bungalow_category(db_bungalow_category)
@@ -63,12 +71,24 @@ def update_category(
     image_width: int,
     image_height: int,
 ) -> BungalowCategory:
-    """Update a bungalow category."""
+    """Update a bungalow category.
+
+    If the ticket category changes, the occupation counters of the
+    category's bungalows move along.
+    """
     db_bungalow_category = _find_db_category(category_id)
 
     if db_bungalow_category is None:
         raise ValueError(f'Unknown bungalow category ID "{category_id}"')
 
+    if ticket_category_id != db_bungalow_category.ticket_category_id:
+        bungalow_occupation_counter_repository.move_category_counts(
+            db_bungalow_category.party_id,
+            category_id,
+            db_bungalow_category.ticket_category_id,
+            ticket_category_id,
+        )
+
     db_bungalow_category.title = title
     db_bungalow_category.capacity = capacity
     db_bungalow_category.ticket_category_id = ticket_category_id
@@ -77,6 +97,13 @@ def update_category(
     db_bungalow_category.image_width = image_width
     db_bungalow_category.image_height = image_height
 
+    bungalow_board_repository.update_entries_for_party(
+        db_bungalow_category.party_id
+    )
+    bungalow_invalidation_service.notify_party_changed(
+        db_bungalow_category.party_id
+    )
+
     db.session.commit()
 
     return _db_entity_to_bungalow_category(db_bungalow_category)
@@ -0,0 +1,148 @@
+"""
+byceps.services.bungalow.bungalow_hold_service
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Provisional holds on bungalows while users fill in the order form
+
+A hold keeps other users from starting to order the same bungalow for a
+few minutes. It does not reserve the bungalow; only placing the order
+does that. Showing the form again extends the hold, but only up to a
+maximum age.
+
+Holds expire on their own: A hold is in effect as long as its time of
+expiry lies in the future. Expired holds need not be removed.
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from byceps.database import db
+from byceps.services.party.models import PartyID
+from byceps.services.user.models import UserID
+from byceps.util.result import Err, Ok, Result
+
+from .dbmodels.hold import DbBungalowHold
+from .models.bungalow import BungalowID
+
+
+HOLD_TIME_TO_LIVE = timedelta(minutes=5)
+HOLD_MAX_AGE = timedelta(minutes=15)
+
+
+def hold_bungalow(
+    bungalow_id: BungalowID, party_id: PartyID, user_id: UserID, now: datetime
+) -> Result[datetime, datetime]:
+    """Hold the bungalow for the user, or extend the user's hold on it.
+
+    A hold is not extended beyond its maximum age. Once it has expired,
+    the user can hold the bungalow anew, unless another user has taken
+    it over in the meantime.
+
+    A user holds at most one bungalow per party; other holds of the user
+    are released.
+
+    Return the point in time at which the hold expires. If another user
+    holds the bungalow, return the point in time at which their hold
+    expires instead.
+    """
+    table = DbBungalowHold.__table__
+    expires_at = now + HOLD_TIME_TO_LIVE
+
+    # Keep the creation time of the user's hold that is still in effect.
+    created_at = case(
+        (
+            (table.c.user_id == user_id) & (table.c.expires_at > now),
+            table.c.created_at,
+        ),
+        else_=now,
+    )
+
+    db.session.execute(
+        delete(DbBungalowHold)
+        .filter_by(party_id=party_id)
+        .filter_by(user_id=user_id)
+        .filter(DbBungalowHold.bungalow_id != bungalow_id)
+    )
+
+    held_until = db.session.scalar(
+        insert(table)
+        .values(
+            bungalow_id=bungalow_id,
+            party_id=party_id,
+            user_id=user_id,
+            created_at=now,
+            expires_at=expires_at,
+        )
+        .on_conflict_do_update(
+            index_elements=[table.c.bungalow_id],
+            set_={
+                'user_id': user_id,
+                'created_at': created_at,
+                'expires_at': func.least(
+                    expires_at, created_at + HOLD_MAX_AGE
+                ),
+            },
+            where=(table.c.user_id == user_id) | (table.c.expires_at <= now),
+        )
+        .returning(table.c.expires_at)
+    )
+
+    if held_until is not None:
+        db.session.commit()
+        return Ok(held_until)
+
+    other_held_until = db.session.scalar(
+        select(table.c.expires_at).filter_by(bungalow_id=bungalow_id)
+    )
+
+    db.session.commit()
+
+    return Err(other_held_until)
+
+
+def is_bungalow_held_by_another_user(
+    bungalow_id: BungalowID, user_id: UserID, now: datetime
+) -> bool:
+    """Return `True` if a user other than that one holds the bungalow."""
+    return db.session.scalar(
+        select(
+            select(DbBungalowHold)
+            .filter_by(bungalow_id=bungalow_id)
+            .filter(DbBungalowHold.user_id != user_id)
+            .filter(DbBungalowHold.expires_at > now)
+            .exists()
+        )
+    )
+
+
+def get_holders_by_bungalow_id(
+    party_id: PartyID, now: datetime
+) -> dict[BungalowID, UserID]:
+    """Return the users holding bungalows of the party, indexed by
+    bungalow ID.
+    """
+    rows = db.session.execute(
+        select(DbBungalowHold.bungalow_id, DbBungalowHold.user_id)
+        .filter_by(party_id=party_id)
+        .filter(DbBungalowHold.expires_at > now)
+    ).all()
+
+    return dict(rows)
+
+
+def release_hold(bungalow_id: BungalowID) -> None:
+    """Release the hold on the bungalow, if any.
+
+    Not committed here, so that the hold can be released in the same
+    transaction that reserves the bungalow.
+    """
+    db.session.execute(
+        delete(DbBungalowHold).filter_by(bungalow_id=bungalow_id)
+    )
@@ -0,0 +1,258 @@
+"""
+byceps.services.bungalow.bungalow_invalidation_service
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Keep in-process caches of bungalow data coherent across processes
+
+Changes to a party's bungalows are announced with PostgreSQL's `NOTIFY`
+in the transaction that makes them, so the notification is delivered
+if, and only once, the transaction has been committed. Every process
+runs a thread that `LISTEN`s for these notifications and evicts the
+affected entries from the registered caches.
+
+All parties share a single channel, with the party's ID as part of the
+payload. A channel per party would require knowing all parties to
+listen to up front.
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import os
+from threading import Lock, Thread
+from time import sleep
+from typing import Any
+from uuid import UUID
+
+from flask import Flask
+import psycopg
+from sqlalchemy import select
+import structlog
+
+from byceps.database import db
+from byceps.services.party.models import PartyID
+
+from .caching import ExpiringCache
+from .models.bungalow import BungalowID
+
+
+log = structlog.get_logger()
+
+
+CHANNEL = 'bungalow_changes'
+
+# Notification payloads must be shorter than 8000 bytes, so larger sets
+# of bungalows are announced as a change of the whole party.
+MAX_BUNGALOW_IDS_PER_NOTIFICATION = 100
+
+RECONNECT_DELAY_IN_SECONDS = 5
+
+
+# Receives the party's ID and the IDs of the changed bungalows. An empty
+# set means that any of the party's bungalows might have changed.
+InvalidationHandler = Callable[[PartyID, frozenset[BungalowID]], None]
+
+
+_party_caches: list[ExpiringCache[PartyID, Any]] = []
+_handlers: list[InvalidationHandler] = []
+
+_listener_lock = Lock()
+_listener_pid: int | None = None
+
+# While notifications are deferred, the IDs of the changed bungalows per
+# party. `None` stands for a change of the whole party.
+_deferred_notifications: ContextVar[
+    dict[PartyID, set[BungalowID] | None] | None
+] = ContextVar('bungalow_deferred_notifications', default=None)
+
+
+def register_party_cache(cache: ExpiringCache[PartyID, Any]) -> None:
+    """Evict a party's entry from the cache whenever bungalows of the
+    party change.
+    """
+    _party_caches.append(cache)
+
+
+def register_handler(handler: InvalidationHandler) -> InvalidationHandler:
+    """Call the handler whenever bungalows change, in any process.
+
+    Handlers are called from the listener thread, within an application
+    context.
+    """
+    _handlers.append(handler)
+    return handler
+
+
+def notify_bungalows_changed(
+    party_id: PartyID, bungalow_ids: Iterable[BungalowID]
+) -> None:
+    """Announce that the bungalows have changed.
+
+    The notification is part of the current transaction and is only
+    delivered once it has been committed.
+    """
+    deferred = _deferred_notifications.get()
+    if deferred is not None:
+        _defer_notification(deferred, party_id, bungalow_ids)
+        return
+
+    unique_bungalow_ids = {str(bungalow_id) for bungalow_id in bungalow_ids}
+    if len(unique_bungalow_ids) > MAX_BUNGALOW_IDS_PER_NOTIFICATION:
+        unique_bungalow_ids = set()
+
+    payload = json.dumps(
+        {
+            'party_id': party_id,
+            'bungalow_ids': sorted(unique_bungalow_ids),
+        }
+    )
+
+    db.session.execute(select(db.func.pg_notify(CHANNEL, payload)))
+
+
+def notify_party_changed(party_id: PartyID) -> None:
+    """Announce that any of the party's bungalows might have changed.
+
+    The notification is part of the current transaction and is only
+    delivered once it has been committed.
+    """
+    notify_bungalows_changed(party_id, [])
+
+
+@contextmanager
+def deferred_notifications() -> Iterator[None]:
+    """Collect the notifications sent within the block, and announce
+    them combined, once per party, when leaving it.
+
+    Use this around operations that change many bungalows and commit
+    after each one, so that caches are evicted once instead of once per
+    bungalow. The combined notifications are committed on their own.
+    """
+    deferred: dict[PartyID, set[BungalowID] | None] = {}
+    token = _deferred_notifications.set(deferred)
+
+    try:
+        yield
+    except BaseException:
+        # Changes committed before the failure still have to be
+        # announced.
+        db.session.rollback()
+        raise
+    finally:
+        _deferred_notifications.reset(token)
+
+        for party_id, bungalow_ids in deferred.items():
+            notify_bungalows_changed(party_id, bungalow_ids or [])
+
+        db.session.commit()
+
+
+def _defer_notification(
+    deferred: dict[PartyID, set[BungalowID] | None],
+    party_id: PartyID,
+    bungalow_ids: Iterable[BungalowID],
+) -> None:
+    bungalow_ids = set(bungalow_ids)
+
+    if (party_id in deferred) and (deferred[party_id] is None):
+        # The whole party is going to be announced anyway.
+        return
+
+    if not bungalow_ids:
+        deferred[party_id] = None
+        return
+
+    deferred.setdefault(party_id, set()).update(bungalow_ids)
+
+
+def start_listener(app: Flask) -> None:
+    """Start this process' listener thread, unless it is running
+    already.
+
+    The check is cheap, so this can be called on every request. It also
+    starts a new thread in processes forked from one that was listening.
+    """
+    global _listener_pid
+
+    pid = os.getpid()
+    if _listener_pid == pid:
+        return
+
+    with _listener_lock:
+        if _listener_pid == pid:
+            return
+
+        thread = Thread(
+            target=_listen,
+            args=(app,),
+            name='bungalow-invalidation-listener',
+            daemon=True,
+        )
+        thread.start()
+
+        _listener_pid = pid
+
+
+def _listen(app: Flask) -> None:
+    while True:
+        try:
+            _listen_until_disconnected(app)
+        except Exception:
+            log.exception('Listening for bungalow changes failed')
+
+        sleep(RECONNECT_DELAY_IN_SECONDS)
+
+
+def _listen_until_disconnected(app: Flask) -> None:
+    with app.app_context():
+        url = db.engine.url.set(drivername='postgresql')
+    conninfo = url.render_as_string(hide_password=False)
+
+    with psycopg.connect(conninfo, autocommit=True) as connection:
+        connection.execute(f'LISTEN {CHANNEL}')
+
+        # Notifications sent while not listening have been missed.
+        _evict_all()
+
+        for notification in connection.notifies():
+            _handle_notification(app, notification.payload)
+
+
+def _evict_all() -> None:
+    for cache in _party_caches:
+        cache.evict_all()
+
+
+def _handle_notification(app: Flask, payload: str) -> None:
+    try:
+        data = json.loads(payload)
+        party_id = PartyID(data['party_id'])
+        bungalow_ids = frozenset(
+            BungalowID(UUID(bungalow_id))
+            for bungalow_id in data['bungalow_ids']
+        )
+    except (KeyError, TypeError, ValueError):
+        log.warning(
+            'Ignoring malformed bungalow change notification',
+            payload=payload,
+        )
+        return
+
+    for cache in _party_caches:
+        cache.evict(party_id)
+
+    with app.app_context():
+        for handler in _handlers:
+            try:
+                handler(party_id, bungalow_ids)
+            except Exception:
+                log.exception(
+                    'Handling bungalow change notification failed',
+                    party_id=party_id,
+                )
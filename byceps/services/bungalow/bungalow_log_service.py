@@ -10,18 +10,25 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 
 from byceps.database import db
+from byceps.services.party.models import PartyID
+from byceps.services.user.models import UserID
 from byceps.util.uuid import generate_uuid7
 
 from .dbmodels.log import DbBungalowLogEntry
 from .models.bungalow import BungalowID
-from .models.log import BungalowLogEntry, BungalowLogEntryData
+from .models.log import (
+    BungalowLogEntry,
+    BungalowLogEntryCursor,
+    BungalowLogEntryData,
+)
 
 
 def build_entry(
     event_type: str,
+    party_id: PartyID,
     bungalow_id: BungalowID,
     data: BungalowLogEntryData,
     *,
@@ -37,6 +44,7 @@ def build_entry(
         id=entry_id,
         occurred_at=occurred_at,
         event_type=event_type,
+        party_id=party_id,
         bungalow_id=bungalow_id,
         data=data,
     )
@@ -44,13 +52,16 @@ def build_entry(
 
 def create_entry(
     event_type: str,
+    party_id: PartyID,
     bungalow_id: BungalowID,
     data: BungalowLogEntryData,
     *,
     occurred_at: datetime | None = None,
 ) -> None:
     """Create a bungalow log entry."""
-    entry = build_entry(event_type, bungalow_id, data, occurred_at=occurred_at)
+    entry = build_entry(
+        event_type, party_id, bungalow_id, data, occurred_at=occurred_at
+    )
 
     db_entry = to_db_entry(entry)
 
@@ -64,22 +75,87 @@ def to_db_entry(entry: BungalowLogEntry) -> DbBungalowLogEntry:
         entry.id,
         entry.occurred_at,
         entry.event_type,
+        entry.party_id,
         entry.bungalow_id,
         entry.data,
     )
 
 
-def get_entries_for_bungalow(bungalow_id: BungalowID) -> list[BungalowLogEntry]:
-    """Return the log entries for that bungalow."""
+def get_entries_for_bungalow(
+    bungalow_id: BungalowID,
+    *,
+    limit: int | None = None,
+    before: BungalowLogEntryCursor | None = None,
+) -> list[BungalowLogEntry]:
+    """Return the log entries for that bungalow, oldest first.
+
+    If a limit is given, return only that many of the latest entries
+    (that occurred before the cursor, if given).
+    """
+    stmt = select(DbBungalowLogEntry).filter_by(bungalow_id=bungalow_id)
+
+    if before is not None:
+        stmt = stmt.filter(_is_before(before))
+
+    if limit is None:
+        db_entries = db.session.scalars(
+            stmt.order_by(DbBungalowLogEntry.occurred_at, DbBungalowLogEntry.id)
+        ).all()
+    else:
+        db_entries = db.session.scalars(
+            stmt.order_by(
+                DbBungalowLogEntry.occurred_at.desc(),
+                DbBungalowLogEntry.id.desc(),
+            ).limit(limit)
+        ).all()
+        db_entries = list(reversed(db_entries))
+
+    return [_db_entity_to_entry(db_entry) for db_entry in db_entries]
+
+
+def get_entries_for_party(
+    party_id: PartyID,
+    limit: int,
+    *,
+    before: BungalowLogEntryCursor | None = None,
+    event_type: str | None = None,
+    initiator_id: UserID | None = None,
+) -> list[BungalowLogEntry]:
+    """Return up to `limit` log entries for the party's bungalows, latest
+    first.
+
+    Pass the cursor for the last entry of a page as `before` to get the
+    next page.
+    """
+    stmt = select(DbBungalowLogEntry).filter_by(party_id=party_id)
+
+    if before is not None:
+        stmt = stmt.filter(_is_before(before))
+
+    if event_type is not None:
+        stmt = stmt.filter_by(event_type=event_type)
+
+    if initiator_id is not None:
+        stmt = stmt.filter(
+            DbBungalowLogEntry.data['initiator_id'].astext == str(initiator_id)
+        )
+
     db_entries = db.session.scalars(
-        select(DbBungalowLogEntry)
-        .filter_by(bungalow_id=bungalow_id)
-        .order_by(DbBungalowLogEntry.occurred_at)
+        stmt.order_by(
+            DbBungalowLogEntry.occurred_at.desc(),
+            DbBungalowLogEntry.id.desc(),
+        ).limit(limit)
     ).all()
 
     return [_db_entity_to_entry(db_entry) for db_entry in db_entries]
 
 
+def _is_before(cursor: BungalowLogEntryCursor):
+    return tuple_(DbBungalowLogEntry.occurred_at, DbBungalowLogEntry.id) < (
+        tuple_(cursor.occurred_at, cursor.entry_id)
+    )
+
+
 def get_entries_of_type_for_bungalow(
     bungalow_id: BungalowID, event_type: str
 ) -> list[BungalowLogEntry]:
@@ -99,6 +175,7 @@ def _db_entity_to_entry(db_entry: DbBungalowLogEntry) -> BungalowLogEntry:
         id=db_entry.id,
         occurred_at=db_entry.occurred_at,
         event_type=db_entry.event_type,
+        party_id=db_entry.party_id,
         bungalow_id=db_entry.bungalow_id,
         data=db_entry.data.copy(),
     )
@@ -55,7 +55,7 @@ def reserve_bungalow(
         occupier, bungalow.id, bungalow.number
     )
 
-    log_entry = _build_bungalow_reserved_log_entry(bungalow.id, occupier)
+    log_entry = _build_bungalow_reserved_log_entry(bungalow, occupier)
 
     return Ok((reservation, occupancy, event, log_entry))
 
@@ -110,11 +110,12 @@ def _build_bungalow_reserved_event(
 
 
 def _build_bungalow_reserved_log_entry(
-    bungalow_id: BungalowID, initiator: User
+    bungalow: Bungalow, initiator: User
 ) -> BungalowLogEntry:
     return bungalow_log_service.build_entry(
         'bungalow-reserved',
-        bungalow_id,
+        bungalow.party_id,
+        bungalow.id,
         data={'initiator_id': str(initiator.id)},
     )
 
@@ -148,7 +149,7 @@ def occupy_reserved_bungalow(
         bungalow.id, bungalow.number, occupier, initiator
     )
 
-    log_entry = _build_bungalow_occupied_log_entry(bungalow.id, initiator)
+    log_entry = _build_bungalow_occupied_log_entry(bungalow, initiator)
 
     return Ok((updated_occupancy, event, log_entry))
 
@@ -175,7 +176,7 @@ def occupy_bungalow_without_reservation(
         bungalow.id, bungalow.number, occupier, initiator
     )
 
-    log_entry = _build_bungalow_occupied_log_entry(bungalow.id, initiator)
+    log_entry = _build_bungalow_occupied_log_entry(bungalow, initiator)
 
     return Ok((occupancy, event, log_entry))
 
@@ -220,11 +221,12 @@ def _build_bungalow_occupied_event(
 
 
 def _build_bungalow_occupied_log_entry(
-    bungalow_id: BungalowID, initiator: User
+    bungalow: Bungalow, initiator: User
 ) -> BungalowLogEntry:
     return bungalow_log_service.build_entry(
         'bungalow-occupied',
-        bungalow_id,
+        bungalow.party_id,
+        bungalow.id,
         data={'initiator_id': str(initiator.id)},
     )
 
@@ -242,7 +244,7 @@ def release_bungalow(
         initiator, bungalow.id, bungalow.number
     )
 
-    log_entry = _build_bungalow_released_log_entry(bungalow.id, initiator)
+    log_entry = _build_bungalow_released_log_entry(bungalow, initiator)
 
     return Ok((event, log_entry))
 
@@ -259,10 +261,11 @@ def _build_bungalow_released_event(
 
 
 def _build_bungalow_released_log_entry(
-    bungalow_id: BungalowID, initiator: User
+    bungalow: Bungalow, initiator: User
 ) -> BungalowLogEntry:
     return bungalow_log_service.build_entry(
         'bungalow-released',
-        bungalow_id,
+        bungalow.party_id,
+        bungalow.id,
         data={'initiator_id': str(initiator.id)},
     )
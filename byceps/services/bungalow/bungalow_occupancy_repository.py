@@ -8,14 +8,15 @@ byceps.services.bungalow.bungalow_occupancy_repository
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, text, update
 
 from byceps.database import db
 from byceps.services.party.models import PartyID
+from byceps.services.shop.order.models.number import OrderNumber
 from byceps.services.shop.product.models import ProductID
 from byceps.services.ticketing.dbmodels.ticket import DbTicket
 from byceps.services.ticketing.dbmodels.ticket_bundle import DbTicketBundle
@@ -24,22 +25,41 @@ from byceps.services.user.models import UserID
 from byceps.util.image.image_type import ImageType
 from byceps.util.result import Err, Ok, Result
 
-from . import bungalow_log_service
+from . import (
+    bungalow_board_repository,
+    bungalow_hold_service,
+    bungalow_invalidation_service,
+    bungalow_log_service,
+    bungalow_occupation_counter_repository,
+    bungalow_order_repository,
+    bungalow_outbox_service,
+)
 from .dbmodels.avatar import DbBungalowAvatar
 from .dbmodels.bungalow import DbBungalow
 from .dbmodels.category import DbBungalowCategory
 from .dbmodels.log import DbBungalowLogEntry
 from .dbmodels.occupancy import DbBungalowOccupancy, DbBungalowReservation
+from .events import (
+    BungalowOccupancyDescriptionUpdatedEvent,
+    BungalowOccupancyMovedEvent,
+    BungalowOccupiedEvent,
+    BungalowReleasedEvent,
+    BungalowReservedEvent,
+)
 from .models.bungalow import BungalowID, BungalowOccupationState
 from .models.log import BungalowLogEntry
 from .models.occupation import (
     BungalowOccupancy,
     BungalowReservation,
     OccupancyID,
+    OccupancyState,
     ReservationID,
 )
 
 
+STREAMING_BATCH_SIZE = 500
+
+
 def find_reservation(
     reservation_id: ReservationID,
 ) -> DbBungalowReservation | None:
@@ -157,27 +177,61 @@ def get_occupied_bungalows_for_party(party_id: PartyID) -> Sequence[DbBungalow]:
 
 def get_occupied_bungalow_numbers_and_titles(
     party_id: PartyID,
-) -> Sequence[tuple[int, str | None]]:
-    """Return the numbers and titles of all occupied bungalows for the
+) -> Iterator[tuple[int, str | None]]:
+    """Yield the numbers and titles of all occupied bungalows for the
     party, ordered by number.
+
+    Rows are fetched in batches from a server-side cursor.
     """
-    return (
-        db.session.execute(
-            select(
-                DbBungalow.number,
-                DbBungalowOccupancy.title,
-            )
-            .join(DbBungalowOccupancy)
-            .filter(DbBungalow.party_id == party_id)
-            .filter(
-                DbBungalowOccupancy._state
-                == BungalowOccupationState.occupied.name
-            )
-            .order_by(DbBungalow.number)
+    yield from db.session.execute(
+        select(
+            DbBungalow.number,
+            DbBungalowOccupancy.title,
         )
-        .tuples()
-        .all()
-    )
+        .join(DbBungalowOccupancy)
+        .filter(DbBungalow.party_id == party_id)
+        .filter(
+            DbBungalowOccupancy._state == BungalowOccupationState.occupied.name
+        )
+        .order_by(DbBungalow.number)
+        .execution_options(yield_per=STREAMING_BATCH_SIZE)
+    ).tuples()
+
+
+def get_occupant_batches_for_party(
+    party_id: PartyID,
+) -> Iterator[Sequence[tuple[int, UserID | None, UserID]]]:
+    """Yield batches of the occupants of all occupied bungalows for the
+    party as (bungalow number, manager ID, occupant ID) tuples, ordered
+    by bungalow number.
+
+    Rows are fetched in batches from a server-side cursor.
+    """
+    result = db.session.execute(
+        select(
+            DbBungalow.number,
+            DbBungalowOccupancy.manager_id,
+            DbTicket.used_by_id,
+        )
+        .join(
+            DbBungalowOccupancy,
+            DbBungalowOccupancy.bungalow_id == DbBungalow.id,
+        )
+        .join(
+            DbTicket,
+            DbTicket.bundle_id == DbBungalowOccupancy.ticket_bundle_id,
+        )
+        .filter(DbBungalow.party_id == party_id)
+        .filter(
+            DbBungalow._occupation_state
+            == BungalowOccupationState.occupied.name
+        )
+        .filter(DbTicket.used_by_id.is_not(None))
+        .order_by(DbBungalow.number, DbTicket.created_at)
+        .execution_options(yield_per=STREAMING_BATCH_SIZE)
+    ).tuples()
+
+    yield from result.partitions()
 
 
 def has_user_occupied_any_bungalow(party_id: PartyID, user_id: UserID) -> bool:
@@ -252,9 +306,26 @@ def reserve_bungalow(
     reservation: BungalowReservation,
     occupancy: BungalowOccupancy,
     log_entry: BungalowLogEntry,
-) -> None:
-    """Create a reservation for this bungalow."""
-    db_bungalow.occupation_state = BungalowOccupationState.reserved
+    event: BungalowReservedEvent,
+    *,
+    request_key: UUID | None = None,
+) -> Result[None, str]:
+    """Create a reservation for this bungalow.
+
+    The bungalow is claimed atomically: Its row is locked, but only if
+    it is still available. Concurrent attempts to reserve the same
+    bungalow do not wait for the lock holder but fail right away.
+
+    If a request key is given, the reservation is recorded for the
+    request.
+
+    A hold on the bungalow, if any, is released.
+    """
+    if not _claim_available_bungalow(db_bungalow.id):
+        db.session.rollback()
+        return Err('Bungalow is not available.')
+
+    _change_occupation_state(db_bungalow, BungalowOccupationState.reserved)
 
     db_reservation = DbBungalowReservation(
         reservation.id,
@@ -273,16 +344,67 @@ def reserve_bungalow(
     )
     db.session.add(db_occupancy)
 
+    if request_key is not None:
+        bungalow_order_repository.record_reservation_for_request(
+            request_key, reservation.id, occupancy.id
+        )
+
+    bungalow_hold_service.release_hold(db_bungalow.id)
+
     db_log_entry = bungalow_log_service.to_db_entry(log_entry)
     db.session.add(db_log_entry)
 
+    bungalow_outbox_service.add_event(event)
+
+    _record_bungalow_change(db_bungalow)
+
     db.session.commit()
 
+    return Ok(None)
+
+
+def _claim_available_bungalow(bungalow_id: BungalowID) -> bool:
+    """Lock the bungalow's row for the current transaction if the
+    bungalow is available.
+
+    Return `False` if the bungalow is not available (anymore) or if
+    another transaction is holding the lock, i.e. is about to reserve
+    or occupy it.
+    """
+    claimed_bungalow_id = db.session.scalar(
+        select(DbBungalow.id)
+        .filter_by(id=bungalow_id)
+        .filter_by(_occupation_state=BungalowOccupationState.available.name)
+        .with_for_update(skip_locked=True)
+    )
+
+    return claimed_bungalow_id is not None
+
+
+def _record_bungalow_change(db_bungalow: DbBungalow) -> None:
+    bungalow_board_repository.update_entries([db_bungalow.id])
+    bungalow_invalidation_service.notify_bungalows_changed(
+        db_bungalow.party_id, [db_bungalow.id]
+    )
+
+
+def _change_occupation_state(
+    db_bungalow: DbBungalow, state: BungalowOccupationState
+) -> None:
+    bungalow_occupation_counter_repository.record_bungalow_state_change(
+        db_bungalow, db_bungalow.occupation_state, state
+    )
+
+    db_bungalow.occupation_state = state
+
 
 def transfer_reservation(db_bungalow: DbBungalow, occupier_id: UserID) -> None:
     """Transfer bungalow reservation to another user."""
     db_bungalow.occupancy.occupied_by_id = occupier_id
     db_bungalow.reservation.reserved_by = occupier_id
+
+    _record_bungalow_change(db_bungalow)
+
     db.session.commit()
 
 
@@ -291,8 +413,15 @@ def occupy_reserved_bungalow(
     reservation_id: ReservationID,
     updated_occupancy: BungalowOccupancy,
     log_entry: BungalowLogEntry,
+    event: BungalowOccupiedEvent,
+    *,
+    assign_first_ticket_to_main_occupant: bool = False,
 ) -> Result[None, str]:
-    """Mark a reserved bungalow as occupied."""
+    """Mark a reserved bungalow as occupied.
+
+    Optionally also assign the bundle's first ticket to the main
+    occupant, in the same transaction.
+    """
     match get_reservation(reservation_id):
         case Ok(db_reservation):
             pass
@@ -305,28 +434,77 @@ def occupy_reserved_bungalow(
         case Err(occupancy_lookup_error):
             return Err(occupancy_lookup_error)
 
-    db_bungalow.occupation_state = BungalowOccupationState.occupied
+    _change_occupation_state(db_bungalow, BungalowOccupationState.occupied)
 
     db.session.delete(db_reservation)
 
     db_occupancy.state = updated_occupancy.state
     db_occupancy.ticket_bundle_id = updated_occupancy.ticket_bundle_id
 
+    if assign_first_ticket_to_main_occupant:
+        _assign_first_ticket_to_main_occupant(
+            db_bungalow.party_id,
+            updated_occupancy.ticket_bundle_id,
+            updated_occupancy.occupied_by_id,
+        )
+
     db_log_entry = bungalow_log_service.to_db_entry(log_entry)
     db.session.add(db_log_entry)
 
+    bungalow_outbox_service.add_event(event)
+
+    _record_bungalow_change(db_bungalow)
+
     db.session.commit()
 
     return Ok(None)
 
 
+def _assign_first_ticket_to_main_occupant(
+    party_id: PartyID,
+    ticket_bundle_id: TicketBundleID | None,
+    main_occupant_id: UserID,
+) -> None:
+    """Assign the bundle's first ticket to the bungalow's main occupant.
+
+    If the user already uses another ticket, none of this bundle will be
+    assigned to them.
+    """
+    if ticket_bundle_id is None:
+        return
+
+    already_uses_ticket = db.session.scalar(
+        select(
+            select(DbTicket)
+            .filter_by(party_id=party_id)
+            .filter_by(used_by_id=main_occupant_id)
+            .filter_by(revoked=False)
+            .exists()
+        )
+    )
+    if already_uses_ticket:
+        return
+
+    db_first_ticket = db.session.scalars(
+        select(DbTicket)
+        .filter_by(bundle_id=ticket_bundle_id)
+        .order_by(DbTicket.created_at)
+        .limit(1)
+    ).first()
+    if db_first_ticket is None:
+        return
+
+    db_first_ticket.used_by_id = main_occupant_id
+
+
 def occupy_bungalow_without_reservation(
     db_bungalow: DbBungalow,
     occupancy: BungalowOccupancy,
     log_entry: BungalowLogEntry,
+    event: BungalowOccupiedEvent,
 ) -> None:
     """Occupy the bungalow without previous reservation."""
-    db_bungalow.occupation_state = BungalowOccupationState.occupied
+    _change_occupation_state(db_bungalow, BungalowOccupationState.occupied)
 
     db_occupancy = DbBungalowOccupancy(
         occupancy.id,
@@ -342,6 +520,10 @@ def occupy_bungalow_without_reservation(
     db_log_entry = bungalow_log_service.to_db_entry(log_entry)
     db.session.add(db_log_entry)
 
+    bungalow_outbox_service.add_event(event)
+
+    _record_bungalow_change(db_bungalow)
+
     db.session.commit()
 
 
@@ -361,6 +543,8 @@ def appoint_bungalow_manager(
 
     db.session.add(db_log_entry)
 
+    _record_bungalow_change(db_occupancy.bungalow)
+
     db.session.commit()
 
     return Ok(None)
@@ -378,6 +562,8 @@ def set_internal_remark(
 
     db_occupancy.internal_remark = remark
 
+    _record_bungalow_change(db_occupancy.bungalow)
+
     db.session.commit()
 
     return Ok(None)
@@ -387,6 +573,7 @@ def update_description(
     occupancy_id: OccupancyID,
     title: str | None,
     description: str | None,
+    event: BungalowOccupancyDescriptionUpdatedEvent,
 ) -> Result[None, str]:
     """Update the occupancy's title and description."""
     match get_occupancy(occupancy_id):
@@ -398,6 +585,10 @@ def update_description(
     db_occupancy.title = title
     db_occupancy.description = description
 
+    bungalow_outbox_service.add_event(event)
+
+    _record_bungalow_change(db_occupancy.bungalow)
+
     db.session.commit()
 
     return Ok(None)
@@ -431,6 +622,8 @@ def assign_avatar_image(
 
     db_occupancy.avatar_id = avatar_id
 
+    _record_bungalow_change(db_occupancy.bungalow)
+
     db.session.commit()
 
     return Ok(None)
@@ -450,20 +643,24 @@ def remove_avatar_image(occupancy_id: OccupancyID) -> Result[None, str]:
 
     db_occupancy.avatar_id = None
 
+    _record_bungalow_change(db_occupancy.bungalow)
+
     db.session.commit()
 
     return Ok(None)
 
 
 def release_bungalow(
-    db_bungalow: DbBungalow, db_log_entry: DbBungalowLogEntry
+    db_bungalow: DbBungalow,
+    db_log_entry: DbBungalowLogEntry,
+    event: BungalowReleasedEvent,
 ) -> None:
     """Release the bungalow occupied by the occupancy so it becomes available
     again.
 
     If a reservation exists, delete it.
     """
-    db_bungalow.occupation_state = BungalowOccupationState.available
+    _change_occupation_state(db_bungalow, BungalowOccupationState.available)
 
     if db_bungalow.reservation:
         db.session.delete(db_bungalow.reservation)
@@ -472,4 +669,201 @@ def release_bungalow(
 
     db.session.add(db_log_entry)
 
+    bungalow_outbox_service.add_event(event)
+
+    _record_bungalow_change(db_bungalow)
+
+    db.session.commit()
+
+
+def release_bungalows(
+    bungalow_ids: set[BungalowID],
+    db_log_entries: list[DbBungalowLogEntry],
+    events: list[BungalowReleasedEvent],
+) -> None:
+    """Release the bungalows so they become available again, in a single
+    transaction.
+
+    Delete their reservations, if any.
+    """
+    db_bungalows = db.session.scalars(
+        select(DbBungalow)
+        .filter(DbBungalow.id.in_(bungalow_ids))
+        .options(
+            db.selectinload(DbBungalow.reservation),
+            db.selectinload(DbBungalow.occupancy),
+        )
+    ).all()
+
+    bungalow_ids_by_party_id: dict[PartyID, set[BungalowID]] = {}
+
+    for db_bungalow in db_bungalows:
+        _change_occupation_state(db_bungalow, BungalowOccupationState.available)
+
+        if db_bungalow.reservation:
+            db.session.delete(db_bungalow.reservation)
+
+        db.session.delete(db_bungalow.occupancy)
+
+        bungalow_ids_by_party_id.setdefault(db_bungalow.party_id, set()).add(
+            db_bungalow.id
+        )
+
+    db.session.add_all(db_log_entries)
+
+    for event in events:
+        bungalow_outbox_service.add_event(event)
+
+    bungalow_board_repository.update_entries(bungalow_ids)
+    for party_id, party_bungalow_ids in bungalow_ids_by_party_id.items():
+        bungalow_invalidation_service.notify_bungalows_changed(
+            party_id, party_bungalow_ids
+        )
+
+    db.session.commit()
+
+
+def get_occupancies(
+    occupancy_ids: set[OccupancyID],
+) -> Sequence[DbBungalowOccupancy]:
+    """Return the occupancies with those IDs."""
+    if not occupancy_ids:
+        return []
+
+    return db.session.scalars(
+        select(DbBungalowOccupancy).filter(
+            DbBungalowOccupancy.id.in_(occupancy_ids)
+        )
+    ).all()
+
+
+def lock_bungalows(
+    bungalow_ids: set[BungalowID],
+) -> dict[BungalowID, DbBungalow]:
+    """Lock the bungalows' rows for the current transaction and return
+    the bungalows, indexed by ID.
+
+    The bungalows are reloaded even if they are in the session already,
+    so that the caller sees their state as of acquiring the locks.
+    """
+    if not bungalow_ids:
+        return {}
+
+    db_bungalows = db.session.scalars(
+        select(DbBungalow)
+        .filter(DbBungalow.id.in_(bungalow_ids))
+        .order_by(DbBungalow.id)
+        .options(
+            db.selectinload(DbBungalow.category),
+            db.selectinload(DbBungalow.occupancy),
+            db.selectinload(DbBungalow.reservation),
+        )
+        .with_for_update(of=DbBungalow)
+        .execution_options(populate_existing=True)
+    ).all()
+
+    return {db_bungalow.id: db_bungalow for db_bungalow in db_bungalows}
+
+
+def move_occupancies(
+    moves: Sequence[tuple[DbBungalowOccupancy, DbBungalow]],
+    db_log_entries: list[DbBungalowLogEntry],
+    events: list[BungalowOccupancyMovedEvent],
+) -> None:
+    """Move each occupancy, and its reservation if any, to its target
+    bungalow in a single transaction.
+
+    The moves are expected to have been validated, and their bungalows
+    to be locked. A target bungalow must be available or be vacated by
+    another of the moves. The uniqueness of bungalows per occupancy and
+    per reservation is only checked at commit time, so occupancies can
+    swap bungalows or move in a cycle.
+    """
+    if not moves:
+        return
+
+    db.session.execute(
+        text(
+            'SET CONSTRAINTS '
+            'bungalow_occupancies_bungalow_id_key, '
+            'bungalow_reservations_bungalow_id_key '
+            'DEFERRED'
+        )
+    )
+
+    db_bungalows_by_id: dict[BungalowID, DbBungalow] = {}
+    new_states_by_bungalow_id: dict[BungalowID, BungalowOccupationState] = {}
+    occupancy_rows = []
+    reservation_rows = []
+
+    for db_occupancy, db_target_bungalow in moves:
+        db_source_bungalow = db_occupancy.bungalow
+
+        db_bungalows_by_id[db_source_bungalow.id] = db_source_bungalow
+        db_bungalows_by_id[db_target_bungalow.id] = db_target_bungalow
+
+        new_states_by_bungalow_id.setdefault(
+            db_source_bungalow.id, BungalowOccupationState.available
+        )
+        new_states_by_bungalow_id[db_target_bungalow.id] = (
+            db_source_bungalow.occupation_state
+        )
+
+        occupancy_rows.append(
+            {'id': db_occupancy.id, 'bungalow_id': db_target_bungalow.id}
+        )
+
+        db_reservation = db_source_bungalow.reservation
+        if db_reservation:
+            reservation_rows.append(
+                {'id': db_reservation.id, 'bungalow_id': db_target_bungalow.id}
+            )
+
+    # Moves stay within a ticket category, and every bungalow that gains
+    # an occupation state hands it over to another. So the occupation
+    # counters remain the same.
+    for bungalow_id, state in new_states_by_bungalow_id.items():
+        db_bungalows_by_id[bungalow_id].occupation_state = state
+
+    db.session.execute(update(DbBungalowOccupancy), occupancy_rows)
+    if reservation_rows:
+        db.session.execute(update(DbBungalowReservation), reservation_rows)
+
+    db.session.add_all(db_log_entries)
+
+    for event in events:
+        bungalow_outbox_service.add_event(event)
+
+    bungalow_ids = set(db_bungalows_by_id)
+    bungalow_board_repository.update_entries(bungalow_ids)
+
+    bungalow_ids_by_party_id: dict[PartyID, set[BungalowID]] = {}
+    for db_bungalow in db_bungalows_by_id.values():
+        bungalow_ids_by_party_id.setdefault(db_bungalow.party_id, set()).add(
+            db_bungalow.id
+        )
+    for party_id, party_bungalow_ids in bungalow_ids_by_party_id.items():
+        bungalow_invalidation_service.notify_bungalows_changed(
+            party_id, party_bungalow_ids
+        )
+
     db.session.commit()
+
+
+def get_reserved_bungalow_ids(
+    party_id: PartyID, order_numbers: set[OrderNumber]
+) -> dict[OrderNumber, BungalowID]:
+    """Return the IDs of the party's bungalows that are reserved for
+    those orders, indexed by order number.
+    """
+    rows = db.session.execute(
+        select(
+            DbBungalowOccupancy.order_number, DbBungalowOccupancy.bungalow_id
+        )
+        .join(DbBungalow)
+        .filter(DbBungalow.party_id == party_id)
+        .filter(DbBungalowOccupancy.order_number.in_(order_numbers))
+        .filter(DbBungalowOccupancy._state == OccupancyState.reserved.name)
+    ).all()
+
+    return dict(rows)
@@ -9,7 +9,9 @@ byceps.services.bungalow.bungalow_occupancy_service
 from __future__ import annotations
 
 from collections import defaultdict
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from datetime import datetime
+from uuid import UUID
 
 from byceps.database import db
 from byceps.services.party.models import PartyID
@@ -30,10 +32,15 @@ from byceps.services.user.models import User, UserForAdmin, UserID
 from byceps.util.result import Err, Ok, Result
 
 from . import (
+    bungalow_board_repository,
+    bungalow_invalidation_service,
     bungalow_log_service,
     bungalow_occupancy_domain_service,
     bungalow_occupancy_repository,
+    bungalow_occupation_counter_repository,
+    bungalow_order_repository,
     bungalow_order_service,
+    bungalow_outbox_service,
     bungalow_service,
 )
 from .dbmodels.bungalow import DbBungalow
@@ -147,11 +154,18 @@ def find_occupancy_for_bungalow(
 
 
 def reserve_bungalow(
-    bungalow_id: BungalowID, occupier: User
+    bungalow_id: BungalowID,
+    occupier: User,
+    *,
+    request_key: UUID | None = None,
 ) -> Result[
     tuple[BungalowReservation, BungalowOccupancy, BungalowReservedEvent], str
 ]:
-    """Create a reservation for this bungalow."""
+    """Create a reservation for this bungalow.
+
+    If a request key is given, the reservation is recorded for the
+    request.
+    """
     db_bungalow = bungalow_service.get_db_bungalow(bungalow_id)
     bungalow = _db_entity_to_bungalow(db_bungalow)
 
@@ -163,9 +177,16 @@ def reserve_bungalow(
         case Err(e):
             return Err(e)
 
-    bungalow_occupancy_repository.reserve_bungalow(
-        db_bungalow, reservation, occupancy, log_entry
-    )
+    match bungalow_occupancy_repository.reserve_bungalow(
+        db_bungalow,
+        reservation,
+        occupancy,
+        log_entry,
+        event,
+        request_key=request_key,
+    ):
+        case Err(e):
+            return Err(e)
 
     return Ok((reservation, occupancy, event))
 
@@ -175,8 +196,13 @@ def place_bungalow_with_preselection_order(
     reservation_id: ReservationID,
     occupancy_id: OccupancyID,
     orderer: Orderer,
+    *,
+    request_key: UUID | None = None,
 ) -> Result[tuple[Order, ShopOrderPlacedEvent], str]:
-    """Place an order for the bungalow."""
+    """Place an order for the bungalow.
+
+    If a request key is given, the order is recorded for the request.
+    """
     match bungalow_occupancy_repository.get_reservation(reservation_id):
         case Ok(db_reservation):
             pass
@@ -210,6 +236,11 @@ def place_bungalow_with_preselection_order(
 
     db_reservation.order_number = order.order_number
     db_occupancy.order_number = order.order_number
+    if request_key is not None:
+        bungalow_order_repository.record_order_for_request(
+            request_key, order.id, order.order_number
+        )
+    bungalow_board_repository.update_entries([db_occupancy.bungalow_id])
     db.session.commit()
 
     return Ok((order, order_placed_event))
@@ -296,8 +327,15 @@ def occupy_reserved_bungalow(
     occupancy_id: OccupancyID,
     ticket_bundle: TicketBundle,
     initiator: User,
+    *,
+    assign_first_ticket_to_main_occupant: bool = False,
 ) -> Result[tuple[BungalowOccupancy, BungalowOccupiedEvent], str]:
-    """Mark a reserved bungalow as occupied."""
+    """Mark a reserved bungalow as occupied.
+
+    Optionally also assign the bundle's first ticket to the main
+    occupant (unless they already use a ticket for the party), in the
+    same transaction.
+    """
     match get_occupancy(occupancy_id):
         case Ok(current_occupancy):
             pass
@@ -318,9 +356,18 @@ def occupy_reserved_bungalow(
         case Err(e):
             return Err(e)
 
-    bungalow_occupancy_repository.occupy_reserved_bungalow(
-        db_bungalow, reservation_id, updated_occupancy, log_entry
-    )
+    match bungalow_occupancy_repository.occupy_reserved_bungalow(
+        db_bungalow,
+        reservation_id,
+        updated_occupancy,
+        log_entry,
+        event,
+        assign_first_ticket_to_main_occupant=(
+            assign_first_ticket_to_main_occupant
+        ),
+    ):
+        case Err(e):
+            return Err(e)
 
     return Ok((updated_occupancy, event))
 
@@ -344,7 +391,7 @@ def occupy_bungalow_without_reservation(
             return Err(e)
 
     bungalow_occupancy_repository.occupy_bungalow_without_reservation(
-        db_bungalow, occupancy, log_entry
+        db_bungalow, occupancy, log_entry, event
     )
 
     return Ok((occupancy, event))
@@ -365,44 +412,31 @@ def move_occupancy(
     db_source_bungalow = db_occupancy.bungalow
     db_target_bungalow = bungalow_service.get_db_bungalow(target_bungalow_id)
 
-    if db_occupancy.pinned:
-        return Err(
-            f'Bungalow {db_source_bungalow.number} ist fest zugewiesen und '
-            'kann nicht gewechselt werden.'
-        )
-
-    if db_target_bungalow.id == db_source_bungalow.id:
-        # Source and target bungalow are the same; nothing to do.
-        return Err(
-            f'Die Belegung ist bereits Bungalow {db_source_bungalow.number} zugewiesen.'
-        )
-
-    # Abort if source and target bungalows have different capacities.
-    if (
-        db_source_bungalow.category.capacity
-        != db_target_bungalow.category.capacity
-    ):
-        return Err('Der Ziel-Bungalow bietet eine unpassende Anzahl Plätze.')
-
-    # Abort if source and target bungalows belong to different ticket
-    # categories.
-    if (
-        db_source_bungalow.category.ticket_category_id
-        != db_target_bungalow.category.ticket_category_id
-    ):
-        return Err(
-            'Der Ziel-Bungalow gehört zu einer anderen Ticket-Kategorie.'
-        )
+    match _check_move(db_occupancy, db_source_bungalow, db_target_bungalow):
+        case Err(e):
+            return Err(e)
 
     if db_target_bungalow.reserved_or_occupied:
         return Err(f'Bungalow {db_target_bungalow.number} ist bereits belegt.')
 
+    bungalow_occupation_counter_repository.record_bungalow_state_change(
+        db_target_bungalow,
+        db_target_bungalow.occupation_state,
+        db_source_bungalow.occupation_state,
+    )
+    bungalow_occupation_counter_repository.record_bungalow_state_change(
+        db_source_bungalow,
+        db_source_bungalow.occupation_state,
+        BungalowOccupationState.available,
+    )
+
     db_target_bungalow.occupation_state = db_source_bungalow.occupation_state
     db_source_bungalow.occupation_state = BungalowOccupationState.available
 
     db_occupancy.bungalow = db_target_bungalow
 
     log_entry = _build_bungalow_occupany_moved_away_log_entry(
+        db_source_bungalow.party_id,
         db_source_bungalow.id,
         db_target_bungalow.id,
         db_target_bungalow.number,
@@ -412,6 +446,7 @@ def move_occupancy(
     db.session.add(db_log_entry)
 
     log_entry = _build_bungalow_occupany_moved_here_log_entry(
+        db_target_bungalow.party_id,
         db_target_bungalow.id,
         db_source_bungalow.id,
         db_source_bungalow.number,
@@ -420,8 +455,6 @@ def move_occupancy(
     db_log_entry = bungalow_log_service.to_db_entry(log_entry)
     db.session.add(db_log_entry)
 
-    db.session.commit()
-
     event = _build_bungalow_occupancy_moved_event(
         initiator,
         db_source_bungalow.id,
@@ -429,11 +462,184 @@ def move_occupancy(
         db_target_bungalow.id,
         db_target_bungalow.number,
     )
+    bungalow_outbox_service.add_event(event)
+
+    bungalow_ids = [db_source_bungalow.id, db_target_bungalow.id]
+    bungalow_board_repository.update_entries(bungalow_ids)
+    bungalow_invalidation_service.notify_bungalows_changed(
+        db_source_bungalow.party_id, bungalow_ids
+    )
+
+    db.session.commit()
 
     return Ok(event)
 
 
+def move_occupancies(
+    target_bungalow_ids_by_occupancy_id: Mapping[OccupancyID, BungalowID],
+    initiator: User,
+) -> Result[list[BungalowOccupancyMovedEvent], str]:
+    """Move occupancies to other bungalows in a single transaction.
+
+    The occupancies may trade bungalows among each other, e.g. two of
+    them may swap their bungalows. Each target bungalow has to be
+    available or be vacated by another of the moves.
+
+    The whole plan is validated up front. Either all of the occupancies
+    are moved, or none is.
+    """
+    if not target_bungalow_ids_by_occupancy_id:
+        return Ok([])
+
+    target_bungalow_ids = list(target_bungalow_ids_by_occupancy_id.values())
+    if len(set(target_bungalow_ids)) != len(target_bungalow_ids):
+        return Err(
+            'Mehrere Belegungen können nicht in denselben Bungalow wechseln.'
+        )
+
+    db_occupancies = bungalow_occupancy_repository.get_occupancies(
+        set(target_bungalow_ids_by_occupancy_id)
+    )
+    if len(db_occupancies) != len(target_bungalow_ids_by_occupancy_id):
+        return Err('Unknown occupancy ID(s)')
+
+    source_bungalow_ids = {
+        db_occupancy.bungalow_id for db_occupancy in db_occupancies
+    }
+
+    db_bungalows_by_id = bungalow_occupancy_repository.lock_bungalows(
+        source_bungalow_ids | set(target_bungalow_ids)
+    )
+
+    match _plan_moves(
+        db_occupancies, target_bungalow_ids_by_occupancy_id, db_bungalows_by_id
+    ):
+        case Ok(moves):
+            pass
+        case Err(e):
+            # Release the locks.
+            db.session.rollback()
+            return Err(e)
+
+    db_log_entries = []
+    events = []
+
+    for db_occupancy, db_target_bungalow in moves:
+        db_source_bungalow = db_bungalows_by_id[db_occupancy.bungalow_id]
+
+        for log_entry in [
+            _build_bungalow_occupany_moved_away_log_entry(
+                db_source_bungalow.party_id,
+                db_source_bungalow.id,
+                db_target_bungalow.id,
+                db_target_bungalow.number,
+                initiator,
+            ),
+            _build_bungalow_occupany_moved_here_log_entry(
+                db_target_bungalow.party_id,
+                db_target_bungalow.id,
+                db_source_bungalow.id,
+                db_source_bungalow.number,
+                initiator,
+            ),
+        ]:
+            db_log_entries.append(bungalow_log_service.to_db_entry(log_entry))
+
+        events.append(
+            _build_bungalow_occupancy_moved_event(
+                initiator,
+                db_source_bungalow.id,
+                db_source_bungalow.number,
+                db_target_bungalow.id,
+                db_target_bungalow.number,
+            )
+        )
+
+    bungalow_occupancy_repository.move_occupancies(
+        moves, db_log_entries, events
+    )
+
+    return Ok(events)
+
+
+def _plan_moves(
+    db_occupancies: Sequence[DbBungalowOccupancy],
+    target_bungalow_ids_by_occupancy_id: Mapping[OccupancyID, BungalowID],
+    db_bungalows_by_id: dict[BungalowID, DbBungalow],
+) -> Result[list[tuple[DbBungalowOccupancy, DbBungalow]], str]:
+    """Validate the moves and pair each occupancy with its target
+    bungalow.
+    """
+    vacated_bungalow_ids = {
+        db_occupancy.bungalow_id for db_occupancy in db_occupancies
+    }
+
+    moves = []
+
+    for db_occupancy in db_occupancies:
+        db_source_bungalow = db_bungalows_by_id.get(db_occupancy.bungalow_id)
+        db_target_bungalow = db_bungalows_by_id.get(
+            target_bungalow_ids_by_occupancy_id[db_occupancy.id]
+        )
+        if (db_source_bungalow is None) or (db_target_bungalow is None):
+            return Err('Unknown bungalow ID(s)')
+
+        match _check_move(db_occupancy, db_source_bungalow, db_target_bungalow):
+            case Err(e):
+                return Err(f'Bungalow {db_source_bungalow.number}: {e}')
+
+        if (
+            db_target_bungalow.reserved_or_occupied
+            and db_target_bungalow.id not in vacated_bungalow_ids
+        ):
+            return Err(
+                f'Bungalow {db_target_bungalow.number} ist bereits belegt.'
+            )
+
+        moves.append((db_occupancy, db_target_bungalow))
+
+    return Ok(moves)
+
+
+def _check_move(
+    db_occupancy: DbBungalowOccupancy,
+    db_source_bungalow: DbBungalow,
+    db_target_bungalow: DbBungalow,
+) -> Result[None, str]:
+    if db_occupancy.pinned:
+        return Err(
+            f'Bungalow {db_source_bungalow.number} ist fest zugewiesen und '
+            'kann nicht gewechselt werden.'
+        )
+
+    if db_target_bungalow.id == db_source_bungalow.id:
+        # Source and target bungalow are the same; nothing to do.
+        return Err(
+            f'Die Belegung ist bereits Bungalow {db_source_bungalow.number} zugewiesen.'
+        )
+
+    # Abort if source and target bungalows have different capacities.
+    if (
+        db_source_bungalow.category.capacity
+        != db_target_bungalow.category.capacity
+    ):
+        return Err('Der Ziel-Bungalow bietet eine unpassende Anzahl Plätze.')
+
+    # Abort if source and target bungalows belong to different ticket
+    # categories.
+    if (
+        db_source_bungalow.category.ticket_category_id
+        != db_target_bungalow.category.ticket_category_id
+    ):
+        return Err(
+            'Der Ziel-Bungalow gehört zu einer anderen Ticket-Kategorie.'
+        )
+
+    return Ok(None)
+
+
 def _build_bungalow_occupany_moved_away_log_entry(
+    party_id: PartyID,
     source_bungalow_id: BungalowID,
     target_bungalow_id: BungalowID,
     target_bungalow_number: int,
@@ -441,6 +647,7 @@ def _build_bungalow_occupany_moved_away_log_entry(
 ) -> BungalowLogEntry:
     return bungalow_log_service.build_entry(
         'occupancy-moved-away',
+        party_id,
         source_bungalow_id,
         data={
             'target_bungalow_id': str(target_bungalow_id),
@@ -451,6 +658,7 @@ def _build_bungalow_occupany_moved_away_log_entry(
 
 
 def _build_bungalow_occupany_moved_here_log_entry(
+    party_id: PartyID,
     target_bungalow_id: BungalowID,
     source_bungalow_id: BungalowID,
     source_bungalow_number: int,
@@ -458,6 +666,7 @@ def _build_bungalow_occupany_moved_here_log_entry(
 ) -> BungalowLogEntry:
     return bungalow_log_service.build_entry(
         'occupancy-moved-here',
+        party_id,
         target_bungalow_id,
         data={
             'source_bungalow_id': str(source_bungalow_id),
@@ -513,11 +722,47 @@ def release_bungalow(
 
     db_log_entry = bungalow_log_service.to_db_entry(log_entry)
 
-    bungalow_occupancy_repository.release_bungalow(db_bungalow, db_log_entry)
+    bungalow_occupancy_repository.release_bungalow(
+        db_bungalow, db_log_entry, event
+    )
 
     return Ok(event)
 
 
+def release_bungalows(
+    bungalow_ids: set[BungalowID], initiator: User
+) -> Result[list[BungalowReleasedEvent], str]:
+    """Release the bungalows so they become available again, in a single
+    transaction.
+
+    Either all of the bungalows are released, or none is.
+    """
+    bungalows = bungalow_service.get_bungalows(bungalow_ids)
+    if len(bungalows) != len(bungalow_ids):
+        return Err('Unknown bungalow ID(s)')
+
+    events = []
+    db_log_entries = []
+
+    for bungalow in bungalows:
+        match bungalow_occupancy_domain_service.release_bungalow(
+            bungalow, initiator
+        ):
+            case Ok((event, log_entry)):
+                events.append(event)
+                db_log_entries.append(
+                    bungalow_log_service.to_db_entry(log_entry)
+                )
+            case Err(e):
+                return Err(f'Bungalow {bungalow.number}: {e}')
+
+    bungalow_occupancy_repository.release_bungalows(
+        bungalow_ids, db_log_entries, events
+    )
+
+    return Ok(events)
+
+
 def appoint_bungalow_manager(
     occupancy_id: OccupancyID, new_manager: User, initiator: User
 ) -> Result[None, str]:
@@ -536,8 +781,9 @@ def appoint_bungalow_manager(
         return Err('Occupancy has no ticket bundle assigned.')
 
     # Set bungalow manager.
+    db_bungalow = bungalow_service.get_db_bungalow(occupancy.bungalow_id)
     log_entry = _build_manager_appointed_log_entry(
-        occupancy.bungalow_id, new_manager, initiator
+        db_bungalow.party_id, db_bungalow.id, new_manager, initiator
     )
     db_log_entry = bungalow_log_service.to_db_entry(log_entry)
     match bungalow_occupancy_repository.appoint_bungalow_manager(
@@ -559,10 +805,14 @@ def appoint_bungalow_manager(
 
 
 def _build_manager_appointed_log_entry(
-    bungalow_id: BungalowID, new_manager: User, initiator: User
+    party_id: PartyID,
+    bungalow_id: BungalowID,
+    new_manager: User,
+    initiator: User,
 ) -> BungalowLogEntry:
     return bungalow_log_service.build_entry(
         'manager-appointed',
+        party_id,
         bungalow_id,
         data={
             'new_manager_id': str(new_manager.id),
@@ -593,14 +843,6 @@ def update_description(
         case Err(occupancy_lookup_error):
             return Err(occupancy_lookup_error)
 
-    match bungalow_occupancy_repository.update_description(
-        occupancy.id, title, description
-    ):
-        case Ok(_):
-            pass
-        case Err(e):
-            return Err(e)
-
     updated_at = datetime.utcnow()
     db_bungalow = bungalow_service.get_db_bungalow(occupancy.bungalow_id)
 
@@ -608,6 +850,14 @@ def update_description(
         updated_at, initiator, db_bungalow.id, db_bungalow.number
     )
 
+    match bungalow_occupancy_repository.update_description(
+        occupancy.id, title, description, event
+    ):
+        case Ok(_):
+            pass
+        case Err(e):
+            return Err(e)
+
     return Ok(event)
 
 
@@ -647,17 +897,34 @@ def get_occupied_bungalows_for_party(party_id: PartyID) -> list[DbBungalow]:
 
 def get_occupied_bungalow_numbers_and_titles(
     party_id: PartyID,
-) -> list[tuple[int, str | None]]:
-    """Return the numbers and titles of all occupied bungalows for the
+) -> Iterator[tuple[int, str | None]]:
+    """Yield the numbers and titles of all occupied bungalows for the
     party, ordered by number.
     """
-    numbers_and_titles = (
-        bungalow_occupancy_repository.get_occupied_bungalow_numbers_and_titles(
-            party_id
-        )
+    return bungalow_occupancy_repository.get_occupied_bungalow_numbers_and_titles(
+        party_id
     )
 
-    return list(numbers_and_titles)
+
+def get_occupants_for_party(
+    party_id: PartyID,
+) -> Iterator[tuple[int, UserForAdmin, bool]]:
+    """Yield the occupants of all occupied bungalows for the party as
+    (bungalow number, occupant, is manager) tuples, ordered by bungalow
+    number.
+
+    Occupants are fetched in batches, so memory usage does not grow with
+    the number of occupants.
+    """
+    for rows in bungalow_occupancy_repository.get_occupant_batches_for_party(
+        party_id
+    ):
+        user_ids = {user_id for _, _, user_id in rows}
+        users = user_service.get_users_for_admin(user_ids)
+        users_by_id = {user.id: user for user in users}
+
+        for bungalow_number, manager_id, user_id in rows:
+            yield bungalow_number, users_by_id[user_id], user_id == manager_id
 
 
 def has_user_occupied_any_bungalow(party_id: PartyID, user_id: UserID) -> bool:
@@ -669,29 +936,37 @@ def has_user_occupied_any_bungalow(party_id: PartyID, user_id: UserID) -> bool:
 
 def get_occupant_slots_for_occupancy(
     occupancy_id: OccupancyID,
+    *,
+    get_users: Callable[[set[UserID]], Mapping[UserID, User]] | None = None,
 ) -> list[OccupantSlot]:
     """Return the occupant slots for an occupancy."""
     occupant_slots_by_occupancy_id = get_occupant_slots_for_occupancies(
-        {occupancy_id}
+        {occupancy_id}, get_users=get_users
     )
     return occupant_slots_by_occupancy_id[occupancy_id]
 
 
 def get_occupant_slots_for_occupancies(
-    occupancy_ids: set[OccupancyID], *, for_admin: bool = False
+    occupancy_ids: set[OccupancyID],
+    *,
+    get_users: Callable[[set[UserID]], Mapping[UserID, User]] | None = None,
 ) -> dict[OccupancyID, list[OccupantSlot]]:
-    """Return the occupant slots for multiple occupancies."""
+    """Return the occupant slots for multiple occupancies.
+
+    Occupants are looked up with `get_users`, if given, which allows to
+    combine their lookup with that of other users.
+    """
     rows = bungalow_occupancy_repository.get_occupant_slots_for_occupancies(
         occupancy_ids
     )
 
     user_ids = {user_id for _, _, user_id in rows if user_id is not None}
-    users: set[User] | set[UserForAdmin]
-    if for_admin:
-        users = user_service.get_users_for_admin(user_ids)
+    users_by_id: Mapping[UserID, User]
+    if get_users is not None:
+        users_by_id = get_users(user_ids)
     else:
         users = user_service.get_users(user_ids, include_avatars=True)
-    users_by_id = {user.id: user for user in users}
+        users_by_id = {user.id: user for user in users}
 
     occupant_slots_by_occupancy_id = defaultdict(list)
     for occupancy_id, ticket_id, user_id in rows:
@@ -0,0 +1,211 @@
+"""
+byceps.services.bungalow.bungalow_occupation_counter_repository
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Number of bungalows per party, ticket category, and occupation state
+
+The counters are adjusted in the same transaction that changes a
+bungalow's occupation state, but are not committed here.
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from byceps.database import db
+from byceps.services.party.models import PartyID
+from byceps.services.ticketing.dbmodels.category import DbTicketCategory
+from byceps.services.ticketing.models.ticket import TicketCategoryID
+
+from .dbmodels.bungalow import DbBungalow
+from .dbmodels.category import DbBungalowCategory
+from .dbmodels.occupation_counter import DbBungalowOccupationCounter
+from .models.bungalow import BungalowOccupationState
+from .models.category import BungalowCategoryID
+
+
+def record_bungalow_state_change(
+    db_bungalow: DbBungalow,
+    from_state: BungalowOccupationState | None,
+    to_state: BungalowOccupationState | None,
+) -> None:
+    """Account for the bungalow having changed from one occupation
+    state to another.
+
+    Use `None` as the previous state for a bungalow that has just been
+    offered, and as the new state for one that is being removed.
+    """
+    record_state_change(
+        db_bungalow.party_id,
+        db_bungalow.category.ticket_category_id,
+        from_state,
+        to_state,
+    )
+
+
+def record_state_change(
+    party_id: PartyID,
+    ticket_category_id: TicketCategoryID,
+    from_state: BungalowOccupationState | None,
+    to_state: BungalowOccupationState | None,
+) -> None:
+    """Account for a bungalow having changed from one occupation state
+    to another.
+    """
+    deltas: Counter[tuple[TicketCategoryID, BungalowOccupationState]] = (
+        Counter()
+    )
+    if from_state is not None:
+        deltas[ticket_category_id, from_state] -= 1
+    if to_state is not None:
+        deltas[ticket_category_id, to_state] += 1
+
+    _apply_deltas(party_id, deltas)
+
+
+def move_category_counts(
+    party_id: PartyID,
+    bungalow_category_id: BungalowCategoryID,
+    from_ticket_category_id: TicketCategoryID,
+    to_ticket_category_id: TicketCategoryID,
+) -> None:
+    """Account for the bungalows of that category now counting towards
+    another ticket category.
+
+    The bungalows are locked so that their occupation states cannot
+    change until the transaction ends.
+    """
+    state_names = db.session.scalars(
+        select(DbBungalow._occupation_state)
+        .filter_by(category_id=bungalow_category_id)
+        .with_for_update()
+    ).all()
+
+    deltas: Counter[tuple[TicketCategoryID, BungalowOccupationState]] = (
+        Counter()
+    )
+    for state_name in state_names:
+        state = BungalowOccupationState[state_name]
+        deltas[from_ticket_category_id, state] -= 1
+        deltas[to_ticket_category_id, state] += 1
+
+    _apply_deltas(party_id, deltas)
+
+
+def _apply_deltas(
+    party_id: PartyID,
+    deltas: Counter[tuple[TicketCategoryID, BungalowOccupationState]],
+) -> None:
+    # Always lock the counter rows in the same order to avoid deadlocks
+    # between transactions that change states in opposite directions.
+    rows = [
+        {
+            'party_id': party_id,
+            'ticket_category_id': ticket_category_id,
+            'state': state.name,
+            'count': delta,
+        }
+        for (ticket_category_id, state), delta in sorted(
+            deltas.items(), key=lambda item: (str(item[0][0]), item[0][1].name)
+        )
+        if delta != 0
+    ]
+
+    if not rows:
+        return
+
+    table = DbBungalowOccupationCounter.__table__
+    insert_stmt = insert(table).values(rows)
+
+    db.session.execute(
+        insert_stmt.on_conflict_do_update(
+            index_elements=[
+                table.c.party_id,
+                table.c.ticket_category_id,
+                table.c.state,
+            ],
+            set_={'count': table.c.count + insert_stmt.excluded.count},
+        )
+    )
+
+
+def rebuild_counters(party_id: PartyID) -> None:
+    """Recount the party's bungalows per ticket category and occupation
+    state, replacing the existing counters.
+    """
+    db.session.execute(
+        delete(DbBungalowOccupationCounter).filter_by(party_id=party_id)
+    )
+
+    rows = db.session.execute(
+        select(
+            DbBungalowCategory.ticket_category_id,
+            DbBungalow._occupation_state,
+            db.func.count(DbBungalow.id),
+        )
+        .join(DbBungalowCategory)
+        .filter(DbBungalow.party_id == party_id)
+        .group_by(
+            DbBungalowCategory.ticket_category_id,
+            DbBungalow._occupation_state,
+        )
+    ).all()
+
+    for ticket_category_id, state_name, count in rows:
+        db_counter = DbBungalowOccupationCounter(
+            party_id,
+            ticket_category_id,
+            BungalowOccupationState[state_name],
+            count,
+        )
+        db.session.add(db_counter)
+
+    db.session.commit()
+
+
+def get_counts_by_state(party_id: PartyID) -> Sequence[tuple[str, int]]:
+    """Return the number of the party's bungalows per occupation state."""
+    return (
+        db.session.execute(
+            select(
+                DbBungalowOccupationCounter._state,
+                db.func.sum(DbBungalowOccupationCounter.count),
+            )
+            .filter_by(party_id=party_id)
+            .group_by(DbBungalowOccupationCounter._state)
+        )
+        .tuples()
+        .all()
+    )
+
+
+def get_counts_by_ticket_category_and_state(
+    party_id: PartyID,
+) -> Sequence[tuple[DbTicketCategory, str, int]]:
+    """Return the number of the party's bungalows per ticket category
+    and occupation state.
+    """
+    return (
+        db.session.execute(
+            select(
+                DbTicketCategory,
+                DbBungalowOccupationCounter._state,
+                DbBungalowOccupationCounter.count,
+            )
+            .join(
+                DbTicketCategory,
+                DbTicketCategory.id
+                == DbBungalowOccupationCounter.ticket_category_id,
+            )
+            .filter(DbBungalowOccupationCounter.party_id == party_id)
+        )
+        .tuples()
+        .all()
+    )
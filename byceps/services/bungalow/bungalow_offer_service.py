@@ -6,15 +6,21 @@ byceps.services.bungalow.bungalow_offer_service
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
-from sqlalchemy import delete
+from sqlalchemy import delete, select
 
 from byceps.database import db
 from byceps.services.party.models import PartyID
+from byceps.services.ticketing.models.ticket import TicketCategoryID
 from byceps.util.uuid import generate_uuid7
 
-from . import bungalow_service
-from .bungalow_service import _db_entity_to_bungalow
+from . import (
+    bungalow_board_repository,
+    bungalow_invalidation_service,
+    bungalow_occupation_counter_repository,
+    bungalow_service,
+)
 from .dbmodels.bungalow import DbBungalow
+from .dbmodels.category import DbBungalowCategory
 from .dbmodels.log import DbBungalowLogEntry
 from .models.building import BungalowBuilding
 from .models.bungalow import Bungalow, BungalowID
@@ -27,10 +33,20 @@ def offer_bungalow(
     bungalow_category_id: BungalowCategoryID,
 ) -> Bungalow:
     """Offer this building in that category."""
-    db_bungalow = _offer_bungalow(party_id, building, bungalow_category_id)
+    ticket_category_id = _get_ticket_category_id(bungalow_category_id)
+
+    db_bungalow = _offer_bungalow(
+        party_id, building, bungalow_category_id, ticket_category_id
+    )
+
+    bungalow_board_repository.update_entries([db_bungalow.id])
+    bungalow_invalidation_service.notify_bungalows_changed(
+        party_id, [db_bungalow.id]
+    )
+
     db.session.commit()
 
-    return _db_entity_to_bungalow(db_bungalow)
+    return bungalow_service.get_bungalow(db_bungalow.id)
 
 
 def offer_bungalows(
@@ -39,8 +55,19 @@ def offer_bungalows(
     bungalow_category_id: BungalowCategoryID,
 ) -> None:
     """Offer these buildings in that category."""
+    ticket_category_id = _get_ticket_category_id(bungalow_category_id)
+
+    bungalow_ids = []
     for building in buildings:
-        _offer_bungalow(party_id, building, bungalow_category_id)
+        db_bungalow = _offer_bungalow(
+            party_id, building, bungalow_category_id, ticket_category_id
+        )
+        bungalow_ids.append(db_bungalow.id)
+
+    bungalow_board_repository.update_entries(bungalow_ids)
+    bungalow_invalidation_service.notify_bungalows_changed(
+        party_id, bungalow_ids
+    )
 
     db.session.commit()
 
@@ -49,6 +76,7 @@ def _offer_bungalow(
     party_id: PartyID,
     building: BungalowBuilding,
     bungalow_category_id: BungalowCategoryID,
+    ticket_category_id: TicketCategoryID,
 ) -> DbBungalow:
     bungalow_id = BungalowID(generate_uuid7())
     distributes_network = False
@@ -62,9 +90,23 @@ def _offer_bungalow(
     )
     db.session.add(db_bungalow)
 
+    bungalow_occupation_counter_repository.record_state_change(
+        party_id, ticket_category_id, None, db_bungalow.occupation_state
+    )
+
     return db_bungalow
 
 
+def _get_ticket_category_id(
+    bungalow_category_id: BungalowCategoryID,
+) -> TicketCategoryID:
+    return db.session.scalars(
+        select(DbBungalowCategory.ticket_category_id).filter_by(
+            id=bungalow_category_id
+        )
+    ).one()
+
+
 def delete_offer(bungalow_id: BungalowID) -> None:
     """Remove bungalow offer."""
     db_bungalow = bungalow_service.get_db_bungalow(bungalow_id)
@@ -74,12 +116,21 @@ def delete_offer(bungalow_id: BungalowID) -> None:
             'Bungalow is reserved or occupied, it must not be deleted.'
         )
 
+    bungalow_occupation_counter_repository.record_bungalow_state_change(
+        db_bungalow, db_bungalow.occupation_state, None
+    )
+
     db.session.execute(
         delete(DbBungalowLogEntry).where(
             DbBungalowLogEntry.bungalow_id == bungalow_id
         )
     )
     db.session.delete(db_bungalow)
+
+    bungalow_invalidation_service.notify_bungalows_changed(
+        db_bungalow.party_id, [db_bungalow.id]
+    )
+
     db.session.commit()
 
 
@@ -88,6 +139,12 @@ def set_distributes_network_flag(bungalow_id: BungalowID) -> None:
     db_bungalow = bungalow_service.get_db_bungalow(bungalow_id)
 
     db_bungalow.distributes_network = True
+
+    bungalow_board_repository.update_entries([db_bungalow.id])
+    bungalow_invalidation_service.notify_bungalows_changed(
+        db_bungalow.party_id, [db_bungalow.id]
+    )
+
     db.session.commit()
 
 
@@ -96,4 +153,10 @@ def unset_distributes_network_flag(bungalow_id: BungalowID) -> None:
     db_bungalow = bungalow_service.get_db_bungalow(bungalow_id)
 
     db_bungalow.distributes_network = False
+
+    bungalow_board_repository.update_entries([db_bungalow.id])
+    bungalow_invalidation_service.notify_bungalows_changed(
+        db_bungalow.party_id, [db_bungalow.id]
+    )
+
     db.session.commit()
@@ -0,0 +1,142 @@
+"""
+byceps.services.bungalow.bungalow_order_cancellation_service
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Cancel many open bungalow orders at once
+
+All affected bungalows are released in a single transaction before the
+orders are canceled. The orders' actions then find nothing left to
+release.
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import structlog
+
+from byceps.database import db
+from byceps.services.party.models import PartyID
+from byceps.services.shop.order import (
+    order_command_service,
+    signals as shop_order_signals,
+)
+from byceps.services.shop.order.models.number import OrderNumber
+from byceps.services.user.models import User
+from byceps.util.result import Err, Ok, Result
+
+from . import (
+    bungalow_occupancy_repository,
+    bungalow_occupancy_service,
+    bungalow_order_repository,
+    signals as bungalow_signals,
+)
+
+
+log = structlog.get_logger()
+
+
+@dataclass(frozen=True, kw_only=True)
+class OrderCancellationResult:
+    released_bungalow_numbers: list[int]
+    canceled_order_numbers: list[OrderNumber]
+    failed_order_numbers: list[OrderNumber]
+
+
+def cancel_orders(
+    party_id: PartyID,
+    order_numbers: Iterable[OrderNumber],
+    initiator: User,
+    reason: str,
+) -> Result[OrderCancellationResult, list[str]]:
+    """Release the bungalows reserved for the orders, then cancel the
+    orders.
+
+    All orders are validated first. If any of them is unknown, not open,
+    or has no bungalow of the party reserved, nothing is changed.
+
+    The orders are locked from their validation until their bungalows
+    have been released, so that they cannot be paid in between.
+
+    Events are sent only after all changes have been committed.
+    """
+    order_numbers = set(order_numbers)
+    if not order_numbers:
+        return Err(['Es wurden keine Bestellnummern angegeben.'])
+
+    orders_by_number = (
+        bungalow_order_repository.lock_orders_and_get_payment_states(
+            order_numbers
+        )
+    )
+    bungalow_ids_by_order_number = (
+        bungalow_occupancy_repository.get_reserved_bungalow_ids(
+            party_id, order_numbers
+        )
+    )
+
+    errors = []
+    for order_number in sorted(order_numbers):
+        if order_number not in orders_by_number:
+            errors.append(f'Bestellung {order_number} existiert nicht.')
+        elif orders_by_number[order_number][1] != 'open':
+            errors.append(f'Bestellung {order_number} ist nicht offen.')
+        elif order_number not in bungalow_ids_by_order_number:
+            errors.append(
+                f'Für Bestellung {order_number} ist kein Bungalow reserviert.'
+            )
+    if errors:
+        db.session.rollback()
+        return Err(errors)
+
+    # Committing the release also releases the locks on the orders.
+    match bungalow_occupancy_service.release_bungalows(
+        set(bungalow_ids_by_order_number.values()), initiator
+    ):
+        case Ok(bungalow_released_events):
+            pass
+        case Err(e):
+            db.session.rollback()
+            return Err([e])
+
+    canceled_order_numbers = []
+    failed_order_numbers = []
+    order_canceled_events = []
+
+    for order_number in sorted(order_numbers):
+        order_id, _ = orders_by_number[order_number]
+
+        match order_command_service.cancel_order(order_id, initiator, reason):
+            case Ok((_, order_canceled_event)):
+                canceled_order_numbers.append(order_number)
+                order_canceled_events.append(order_canceled_event)
+            case Err(e):
+                # The bungalow has been released nonetheless.
+                log.warning(
+                    'Canceling bungalow order failed',
+                    order_number=order_number,
+                    error=str(e),
+                )
+                failed_order_numbers.append(order_number)
+
+    for bungalow_released_event in bungalow_released_events:
+        bungalow_signals.bungalow_released.send(
+            None, event=bungalow_released_event
+        )
+
+    for order_canceled_event in order_canceled_events:
+        shop_order_signals.order_canceled.send(None, event=order_canceled_event)
+
+    return Ok(
+        OrderCancellationResult(
+            released_bungalow_numbers=sorted(
+                event.bungalow_number for event in bungalow_released_events
+            ),
+            canceled_order_numbers=canceled_order_numbers,
+            failed_order_numbers=failed_order_numbers,
+        )
+    )
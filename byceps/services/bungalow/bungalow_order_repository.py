@@ -6,15 +6,30 @@ byceps.services.bungalow.bungalow_order_repository
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
-from sqlalchemy import select
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
 
 from byceps.database import db
 from byceps.services.party.models import PartyID
 from byceps.services.shop.order.dbmodels.order import DbLineItem, DbOrder
+from byceps.services.shop.order.models.number import OrderNumber
+from byceps.services.shop.order.models.order import OrderID
 from byceps.services.shop.product.dbmodels.product import DbProduct
 from byceps.services.user.models import UserID
 
+from .dbmodels.bungalow import DbBungalow
 from .dbmodels.category import DbBungalowCategory
+from .dbmodels.occupancy import DbBungalowReservation
+from .dbmodels.order_request import DbBungalowOrderRequest
+from .models.occupation import (
+    BungalowOrderRequest,
+    ExpiredReservation,
+    OccupancyID,
+    ReservationID,
+)
 
 
 def has_user_ordered_any_bungalow_category(
@@ -38,3 +53,183 @@ def has_user_ordered_any_bungalow_category(
         )
         or False
     )
+
+
+def lock_orders_and_get_payment_states(
+    order_numbers: set[OrderNumber],
+) -> dict[OrderNumber, tuple[OrderID, str]]:
+    """Lock the orders with those numbers and return their IDs and
+    payment states, indexed by order number.
+
+    The locks are held until the transaction ends, so that the orders
+    cannot be paid in the meantime.
+    """
+    rows = db.session.execute(
+        select(DbOrder.order_number, DbOrder.id, DbOrder._payment_state)
+        .filter(DbOrder.order_number.in_(order_numbers))
+        # Always lock in the same order to avoid deadlocks.
+        .order_by(DbOrder.id)
+        .with_for_update()
+    ).all()
+
+    return {
+        order_number: (order_id, payment_state)
+        for order_number, order_id, payment_state in rows
+    }
+
+
+def lock_order_and_get_payment_state(order_id: OrderID) -> str | None:
+    """Lock the order and return its current payment state.
+
+    Return `None` if the order does not exist.
+
+    The lock is held until the transaction ends.
+    """
+    db_order = db.session.scalars(
+        select(DbOrder)
+        .filter_by(id=order_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).one_or_none()
+
+    if db_order is None:
+        return None
+
+    return db_order._payment_state
+
+
+def get_expired_reservations(
+    party_id: PartyID, created_before: datetime
+) -> list[ExpiredReservation]:
+    """Return the party's reservations whose orders have been placed
+    before that time and are still open, oldest first.
+
+    Pinned reservations are left alone.
+    """
+    rows = db.session.execute(
+        select(
+            DbBungalowReservation.id,
+            DbBungalow.id,
+            DbBungalow.number,
+            DbOrder.id,
+            DbOrder.order_number,
+            DbOrder.created_at,
+        )
+        .join(DbBungalow, DbBungalow.id == DbBungalowReservation.bungalow_id)
+        .join(
+            DbOrder, DbOrder.order_number == DbBungalowReservation.order_number
+        )
+        .filter(DbBungalow.party_id == party_id)
+        .filter(DbBungalowReservation.pinned == False)  # noqa: E712
+        .filter(DbOrder._payment_state == 'open')
+        .filter(DbOrder.created_at < created_before)
+        .order_by(DbOrder.created_at)
+    ).all()
+
+    return [
+        ExpiredReservation(
+            reservation_id=reservation_id,
+            bungalow_id=bungalow_id,
+            bungalow_number=bungalow_number,
+            order_id=order_id,
+            order_number=order_number,
+            order_created_at=order_created_at,
+        )
+        for (
+            reservation_id,
+            bungalow_id,
+            bungalow_number,
+            order_id,
+            order_number,
+            order_created_at,
+        ) in rows
+    ]
+
+
+def claim_order_request(key: UUID, user_id: UserID, now: datetime) -> bool:
+    """Record a new order request with that key.
+
+    Return `False` if the key has been claimed already.
+
+    Not committed here.
+    """
+    table = DbBungalowOrderRequest.__table__
+
+    claimed_key = db.session.scalar(
+        insert(table)
+        .values(key=key, created_at=now, user_id=user_id)
+        .on_conflict_do_nothing(index_elements=[table.c.key])
+        .returning(table.c.key)
+    )
+
+    return claimed_key is not None
+
+
+def find_order_request(key: UUID) -> BungalowOrderRequest | None:
+    """Return the order request with that key, or `None` if not found."""
+    # Reload the request as another transaction might be processing it.
+    db_order_request = db.session.get(
+        DbBungalowOrderRequest, key, populate_existing=True
+    )
+
+    if db_order_request is None:
+        return None
+
+    return BungalowOrderRequest(
+        key=db_order_request.key,
+        user_id=db_order_request.user_id,
+        reservation_id=db_order_request.reservation_id,
+        occupancy_id=db_order_request.occupancy_id,
+        order_id=db_order_request.order_id,
+        order_number=db_order_request.order_number,
+        concluded_at=db_order_request.concluded_at,
+    )
+
+
+def record_reservation_for_request(
+    key: UUID, reservation_id: ReservationID, occupancy_id: OccupancyID
+) -> None:
+    """Remember the reservation made for the request.
+
+    Not committed here.
+    """
+    db.session.execute(
+        update(DbBungalowOrderRequest)
+        .filter_by(key=key)
+        .values(reservation_id=reservation_id, occupancy_id=occupancy_id)
+    )
+
+
+def record_order_for_request(
+    key: UUID, order_id: OrderID, order_number: OrderNumber
+) -> None:
+    """Remember the order placed for the request.
+
+    Not committed here.
+    """
+    db.session.execute(
+        update(DbBungalowOrderRequest)
+        .filter_by(key=key)
+        .values(order_id=order_id, order_number=order_number)
+    )
+
+
+def conclude_order_request(key: UUID, now: datetime) -> None:
+    """Mark the request as concluded.
+
+    A request that has not reserved a bungalow is removed instead, so
+    that its key can be claimed again.
+
+    Not committed here.
+    """
+    db.session.execute(
+        delete(DbBungalowOrderRequest)
+        .filter_by(key=key)
+        .filter(DbBungalowOrderRequest.reservation_id.is_(None))
+    )
+
+    db.session.execute(
+        update(DbBungalowOrderRequest)
+        .filter_by(key=key)
+        .values(concluded_at=now)
+    )
@@ -8,6 +8,10 @@ byceps.services.bungalow.bungalow_order_service
 
 from __future__ import annotations
 
+from datetime import datetime
+from uuid import UUID
+
+from byceps.database import db
 from byceps.services.party.models import PartyID
 from byceps.services.shop.cart.models import Cart
 from byceps.services.shop.order import order_checkout_service
@@ -27,6 +31,7 @@ from .errors import (
     ProductUnavailableError,
     StorefrontClosedError,
 )
+from .models.occupation import BungalowOrderRequest
 
 
 def check_category_order_preconditions(
@@ -62,6 +67,68 @@ def has_user_ordered_any_bungalow_category(
     )
 
 
+def claim_order_request(
+    key: UUID, user_id: UserID
+) -> BungalowOrderRequest | None:
+    """Claim the key for the user's request to reserve and order a
+    bungalow.
+
+    Return `None` if the key has been claimed. The caller then processes
+    the request and has to conclude it afterwards.
+
+    If another request has claimed the key already, return that request
+    right away, whether it has been concluded or not.
+    """
+    now = datetime.utcnow()
+
+    claimed = bungalow_order_repository.claim_order_request(key, user_id, now)
+    db.session.commit()
+
+    if claimed:
+        return None
+
+    order_request = bungalow_order_repository.find_order_request(key)
+    if order_request is not None:
+        return order_request
+
+    # The other request has been concluded without a reservation in the
+    # meantime, so the key is free again.
+    claimed = bungalow_order_repository.claim_order_request(key, user_id, now)
+    db.session.commit()
+
+    if claimed:
+        return None
+
+    # Yet another request has claimed the key just now.
+    return BungalowOrderRequest(
+        key=key,
+        user_id=user_id,
+        reservation_id=None,
+        occupancy_id=None,
+        order_id=None,
+        order_number=None,
+        concluded_at=None,
+    )
+
+
+def conclude_order_request(key: UUID) -> None:
+    """Conclude the request, successful or not.
+
+    Changes the request has left uncommitted are discarded.
+    """
+    db.session.rollback()
+
+    bungalow_order_repository.conclude_order_request(key, datetime.utcnow())
+    db.session.commit()
+
+
+def find_order_request(key: UUID) -> BungalowOrderRequest | None:
+    """Return the request to reserve and order a bungalow with that key,
+    or `None` if not found.
+    """
+    return bungalow_order_repository.find_order_request(key)
+
+
 def place_bungalow_order(
     storefront: Storefront,
     product: Product,
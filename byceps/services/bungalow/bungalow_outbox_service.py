@@ -0,0 +1,435 @@
+"""
+byceps.services.bungalow.bungalow_outbox_service
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Deliver bungalow events to announcement webhooks outside of the request
+that caused them.
+
+Events are staged in the outbox in the same transaction as the change
+they describe, so an event is recorded if and only if the change has
+been committed. Workers then pick them up and announce them.
+
+Events of the same type that occur within a short window are coalesced
+into a single digest per webhook, and each webhook has a send budget.
+Events that exceed it are deferred, not dropped.
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+import structlog
+from sqlalchemy import Connection, select, Table
+from sqlalchemy.dialects.postgresql import insert
+
+from byceps.announce.announce import build_announcement_request, call_webhook
+from byceps.announce.helpers import assemble_request_data
+from byceps.database import db
+from byceps.services.user import user_service
+from byceps.services.user.models import User, UserID
+from byceps.services.webhooks import webhook_service
+from byceps.services.webhooks.models import (
+    AnnouncementRequest,
+    OutgoingWebhook,
+)
+from byceps.util.result import Err, Ok, Result
+from byceps.util.uuid import generate_uuid7
+
+from . import announcing, signals as bungalow_signals
+from .dbmodels.outbox import DbBungalowOutboxEvent
+from .dbmodels.webhook_send_budget import DbBungalowWebhookSendBudget
+from .events import (
+    BungalowOccupancyAvatarUpdatedEvent,
+    BungalowOccupancyDescriptionUpdatedEvent,
+    BungalowOccupancyMovedEvent,
+    BungalowOccupantAddedEvent,
+    BungalowOccupantRemovedEvent,
+    BungalowOccupiedEvent,
+    BungalowReleasedEvent,
+    BungalowReservedEvent,
+    _BungalowEvent,
+)
+
+
+log = structlog.get_logger()
+
+
+# Delay announcing events so that those of a burst can be coalesced.
+COALESCING_WINDOW = timedelta(seconds=5)
+
+# Send up to 10 announcements per minute to a webhook, with bursts of up
+# to 3 announcements.
+WEBHOOK_SEND_INTERVAL = timedelta(seconds=6)
+WEBHOOK_SEND_BURST_SIZE = 3
+
+MAX_DELIVERY_ATTEMPTS = 10
+MAX_RETRY_DELAY = timedelta(hours=1)
+
+
+EVENT_TYPES_BY_NAME: dict[str, type[_BungalowEvent]] = {
+    bungalow_signals.bungalow_reserved.name: BungalowReservedEvent,
+    bungalow_signals.bungalow_occupied.name: BungalowOccupiedEvent,
+    bungalow_signals.bungalow_released.name: BungalowReleasedEvent,
+    bungalow_signals.occupancy_moved.name: BungalowOccupancyMovedEvent,
+    bungalow_signals.avatar_updated.name: BungalowOccupancyAvatarUpdatedEvent,
+    bungalow_signals.description_updated.name: (
+        BungalowOccupancyDescriptionUpdatedEvent
+    ),
+    bungalow_signals.occupant_added.name: BungalowOccupantAddedEvent,
+    bungalow_signals.occupant_removed.name: BungalowOccupantRemovedEvent,
+}
+
+EVENT_NAMES_BY_TYPE = {
+    event_type: event_name
+    for event_name, event_type in EVENT_TYPES_BY_NAME.items()
+}
+
+
+# Users are stored by ID and looked up again on delivery.
+_USER_FIELD_NAMES = frozenset({'initiator', 'occupant', 'occupier'})
+
+
+def add_event(event: _BungalowEvent) -> None:
+    """Stage the event for delivery.
+
+    The event is added to the current transaction, but not committed.
+    """
+    db_event = _to_db_event(event)
+    db.session.add(db_event)
+
+
+def persist_event(event: _BungalowEvent) -> None:
+    """Stage the event for delivery and commit it.
+
+    Only use this for events whose change has been committed by a
+    service outside of this package already.
+    """
+    add_event(event)
+    db.session.commit()
+
+
+def _to_db_event(event: _BungalowEvent) -> DbBungalowOutboxEvent:
+    event_id = generate_uuid7()
+    event_name = EVENT_NAMES_BY_TYPE[type(event)]
+    data = _serialize_event(event)
+
+    next_attempt_at = event.occurred_at + COALESCING_WINDOW
+
+    return DbBungalowOutboxEvent(
+        event_id, event.occurred_at, event_name, data, next_attempt_at
+    )
+
+
+def _serialize_event(event: _BungalowEvent) -> dict[str, Any]:
+    data = {}
+
+    for field in dataclasses.fields(event):
+        if field.name == 'occurred_at':
+            continue
+
+        value = getattr(event, field.name)
+
+        if isinstance(value, User):
+            value = str(value.id)
+        elif isinstance(value, UUID):
+            value = str(value)
+
+        data[field.name] = value
+
+    return data
+
+
+def deliver_events(now: datetime, batch_size: int) -> int:
+    """Announce the next batch of due events.
+
+    Return the number of events that have been processed, including
+    those whose delivery failed or has been deferred.
+
+    Events are claimed with `SKIP LOCKED`, so multiple workers can
+    deliver concurrently without processing the same event.
+    """
+    db_events = _claim_due_events(now, batch_size)
+
+    if not db_events:
+        db.session.rollback()
+        return 0
+
+    users_by_id = _get_users_by_id(db_events)
+
+    deliveries_by_event_name: dict[str, list[_Delivery]] = defaultdict(list)
+    for db_event in db_events:
+        try:
+            event = _deserialize_event(db_event, users_by_id)
+        except Exception as exc:
+            _reschedule_delivery(db_event, now, exc)
+        else:
+            delivery = _Delivery(db_event=db_event, event=event)
+            deliveries_by_event_name[db_event.event_name].append(delivery)
+
+    deliveries_by_webhook = _group_deliveries_by_webhook(
+        deliveries_by_event_name
+    )
+
+    for webhook, delivery_groups in deliveries_by_webhook.values():
+        for deliveries in delivery_groups:
+            _announce_to_webhook(webhook, deliveries, now)
+
+    for deliveries in deliveries_by_event_name.values():
+        for delivery in deliveries:
+            _conclude_delivery(delivery, now)
+
+    db.session.commit()
+
+    return len(db_events)
+
+
+@dataclass(kw_only=True)
+class _Delivery:
+    db_event: DbBungalowOutboxEvent
+    event: _BungalowEvent
+    error: Exception | None = None
+    deferred_until: datetime | None = None
+
+    def is_pending_for(self, webhook: OutgoingWebhook) -> bool:
+        return str(webhook.id) not in self.db_event.announced_webhook_ids
+
+    def mark_announced_to(self, webhook: OutgoingWebhook) -> None:
+        self.db_event.announced_webhook_ids = [
+            *self.db_event.announced_webhook_ids,
+            str(webhook.id),
+        ]
+
+    def defer_until(self, until: datetime) -> None:
+        if self.deferred_until is None or until < self.deferred_until:
+            self.deferred_until = until
+
+
+def _group_deliveries_by_webhook(
+    deliveries_by_event_name: dict[str, list[_Delivery]],
+) -> dict[UUID, tuple[OutgoingWebhook, list[list[_Delivery]]]]:
+    """Group the deliveries by webhook, and then by event name."""
+    deliveries_by_webhook: dict[
+        UUID, tuple[OutgoingWebhook, list[list[_Delivery]]]
+    ] = {}
+
+    for event_name, deliveries in deliveries_by_event_name.items():
+        webhooks = webhook_service.get_enabled_outgoing_webhooks(event_name)
+        for webhook in webhooks:
+            pending_deliveries = [
+                delivery
+                for delivery in deliveries
+                if delivery.is_pending_for(webhook)
+            ]
+            if not pending_deliveries:
+                continue
+
+            _, delivery_groups = deliveries_by_webhook.setdefault(
+                webhook.id, (webhook, [])
+            )
+            delivery_groups.append(pending_deliveries)
+
+    return deliveries_by_webhook
+
+
+def _announce_to_webhook(
+    webhook: OutgoingWebhook, deliveries: list[_Delivery], now: datetime
+) -> None:
+    """Announce the events, which are all of the same type, to the
+    webhook.
+
+    A single event is announced on its own, multiple events are
+    coalesced into a digest.
+    """
+    match _claim_send_slot(webhook.id, now):
+        case Err(available_at):
+            for delivery in deliveries:
+                delivery.defer_until(available_at)
+            return
+
+    events = [delivery.event for delivery in deliveries]
+
+    try:
+        _announce(webhook, events)
+    except Exception as exc:
+        for delivery in deliveries:
+            delivery.error = exc
+    else:
+        for delivery in deliveries:
+            delivery.mark_announced_to(webhook)
+
+
+def _conclude_delivery(delivery: _Delivery, now: datetime) -> None:
+    db_event = delivery.db_event
+
+    if delivery.error is not None:
+        _reschedule_delivery(db_event, now, delivery.error)
+    elif delivery.deferred_until is not None:
+        # Running out of send budget does not count as failed attempt.
+        db_event.next_attempt_at = delivery.deferred_until
+    else:
+        db.session.delete(db_event)
+
+
+def _claim_due_events(
+    now: datetime, limit: int
+) -> Sequence[DbBungalowOutboxEvent]:
+    return db.session.scalars(
+        select(DbBungalowOutboxEvent)
+        .filter(DbBungalowOutboxEvent.next_attempt_at <= now)
+        .order_by(DbBungalowOutboxEvent.occurred_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+
+def _get_users_by_id(
+    db_events: Sequence[DbBungalowOutboxEvent],
+) -> dict[UserID, User]:
+    user_ids = {
+        UserID(UUID(db_event.data[field_name]))
+        for db_event in db_events
+        for field_name in _USER_FIELD_NAMES
+        if db_event.data.get(field_name) is not None
+    }
+
+    users = user_service.get_users(user_ids, include_avatars=False)
+
+    return {user.id: user for user in users}
+
+
+def _deserialize_event(
+    db_event: DbBungalowOutboxEvent, users_by_id: dict[UserID, User]
+) -> _BungalowEvent:
+    event_type = EVENT_TYPES_BY_NAME[db_event.event_name]
+
+    attributes: dict[str, Any] = {}
+    for name, value in db_event.data.items():
+        if value is not None:
+            if name in _USER_FIELD_NAMES:
+                value = users_by_id[UserID(UUID(value))]
+            elif name.endswith('_id'):
+                value = UUID(value)
+
+        attributes[name] = value
+
+    return event_type(occurred_at=db_event.occurred_at, **attributes)
+
+
+def _announce(
+    webhook: OutgoingWebhook, events: Sequence[_BungalowEvent]
+) -> None:
+    if len(events) == 1:
+        announcement_request = build_announcement_request(events[0], webhook)
+    else:
+        announcement_request = _build_digest_announcement_request(
+            webhook, events
+        )
+
+    if announcement_request is not None:
+        call_webhook(webhook, announcement_request)
+
+
+def _build_digest_announcement_request(
+    webhook: OutgoingWebhook, events: Sequence[_BungalowEvent]
+) -> AnnouncementRequest | None:
+    event_type = type(events[0])
+    event_name = EVENT_NAMES_BY_TYPE[event_type]
+    announce = announcing.DIGEST_ANNOUNCERS_BY_EVENT_TYPE[event_type]
+
+    announcement = announce(event_name, events, webhook)
+    if announcement is None:
+        return None
+
+    data = assemble_request_data(webhook, announcement.text)
+    return AnnouncementRequest(data=data)
+
+
+def _claim_send_slot(
+    webhook_id: UUID, now: datetime
+) -> Result[None, datetime]:
+    """Take one announcement from the webhook's send budget.
+
+    The budget refills at a steady rate and allows for short bursts.
+
+    Return the point in time at which the next announcement can be sent
+    if the budget is exhausted.
+
+    The slot is claimed in a separate transaction that is committed
+    right away, so that other workers do not have to wait for the
+    budget's row until this worker has made its webhook calls. A slot
+    stays claimed even if the worker's batch fails afterwards.
+    """
+    table = DbBungalowWebhookSendBudget.__table__
+    burst_tolerance = WEBHOOK_SEND_INTERVAL * (WEBHOOK_SEND_BURST_SIZE - 1)
+
+    with db.engine.begin() as connection:
+        return _claim_send_slot_in_transaction(
+            connection, table, webhook_id, now, burst_tolerance
+        )
+
+
+def _claim_send_slot_in_transaction(
+    connection: Connection,
+    table: Table,
+    webhook_id: UUID,
+    now: datetime,
+    burst_tolerance: timedelta,
+) -> Result[None, datetime]:
+    exhausted_until = connection.scalar(
+        insert(table)
+        .values(
+            webhook_id=webhook_id,
+            exhausted_until=now + WEBHOOK_SEND_INTERVAL,
+        )
+        .on_conflict_do_update(
+            index_elements=[table.c.webhook_id],
+            set_={
+                'exhausted_until': db.func.greatest(
+                    table.c.exhausted_until, now
+                )
+                + WEBHOOK_SEND_INTERVAL
+            },
+            where=table.c.exhausted_until <= now + burst_tolerance,
+        )
+        .returning(table.c.exhausted_until)
+    )
+
+    if exhausted_until is not None:
+        return Ok(None)
+
+    exhausted_until = connection.scalar(
+        select(table.c.exhausted_until).filter_by(webhook_id=webhook_id)
+    )
+
+    return Err(exhausted_until - burst_tolerance)
+
+
+def _reschedule_delivery(
+    db_event: DbBungalowOutboxEvent, now: datetime, exc: Exception
+) -> None:
+    db_event.attempts += 1
+    db_event.last_error = repr(exc)
+
+    if db_event.attempts >= MAX_DELIVERY_ATTEMPTS:
+        db_event.next_attempt_at = None
+        log.error(
+            'Giving up on delivering bungalow event',
+            event_id=str(db_event.id),
+            event_name=db_event.event_name,
+            error=db_event.last_error,
+        )
+        return
+
+    retry_delay = min(
+        timedelta(seconds=15 * 2**db_event.attempts), MAX_RETRY_DELAY
+    )
+    db_event.next_attempt_at = now + retry_delay
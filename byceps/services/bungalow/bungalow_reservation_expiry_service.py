@@ -0,0 +1,147 @@
+"""
+byceps.services.bungalow.bungalow_reservation_expiry_service
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Cancel orders of reserved bungalows that have not been paid in time
+
+Canceling the order releases the bungalow through the order's action,
+just like canceling it in the admin UI does.
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import structlog
+
+from byceps.database import db
+from byceps.services.party.models import PartyID
+from byceps.services.shop.order import (
+    order_command_service,
+    signals as shop_order_signals,
+)
+from byceps.services.user.models import User
+from byceps.util.result import Err, Ok
+
+from . import bungalow_invalidation_service, bungalow_order_repository
+from .models.occupation import ExpiredReservation
+
+
+log = structlog.get_logger()
+
+
+CANCELATION_REASON = 'Die Bestellung wurde nicht rechtzeitig bezahlt.'
+
+
+@dataclass(frozen=True, kw_only=True)
+class ExpirySweepResult:
+    canceled: list[ExpiredReservation]
+    skipped: list[ExpiredReservation]
+    failed: list[ExpiredReservation]
+
+
+def get_expired_reservations(
+    party_id: PartyID, ttl: timedelta, now: datetime
+) -> list[ExpiredReservation]:
+    """Return the party's reservations whose orders have been open for
+    longer than the TTL, oldest first.
+    """
+    created_before = now - ttl
+
+    return bungalow_order_repository.get_expired_reservations(
+        party_id, created_before
+    )
+
+
+def cancel_expired_reservations(
+    party_id: PartyID,
+    ttl: timedelta,
+    now: datetime,
+    initiator: User,
+    *,
+    batch_size: int,
+) -> ExpirySweepResult:
+    """Cancel the orders of the party's reservations that have been open
+    for longer than the TTL, which releases the bungalows.
+
+    Orders that have been paid or canceled since the reservations were
+    looked up are skipped.
+
+    Caches of the released bungalows are invalidated once per batch.
+    """
+    expired_reservations = get_expired_reservations(party_id, ttl, now)
+
+    canceled = []
+    skipped = []
+    failed = []
+
+    for batch in _chunk(expired_reservations, batch_size):
+        with bungalow_invalidation_service.deferred_notifications():
+            for expired_reservation in batch:
+                if not _lock_order_if_open(expired_reservation):
+                    skipped.append(expired_reservation)
+                elif _cancel_order(expired_reservation, initiator):
+                    canceled.append(expired_reservation)
+                else:
+                    failed.append(expired_reservation)
+
+    return ExpirySweepResult(canceled=canceled, skipped=skipped, failed=failed)
+
+
+def _lock_order_if_open(expired_reservation: ExpiredReservation) -> bool:
+    """Lock the order until it is canceled, unless it is no longer open.
+
+    Keeps the order from being paid while it is being canceled.
+    """
+    payment_state = bungalow_order_repository.lock_order_and_get_payment_state(
+        expired_reservation.order_id
+    )
+
+    if payment_state == 'open':
+        return True
+
+    db.session.rollback()
+
+    log.info(
+        'Skipping order of expired bungalow reservation that is no longer '
+        'open',
+        order_number=expired_reservation.order_number,
+        payment_state=payment_state,
+    )
+
+    return False
+
+
+def _cancel_order(
+    expired_reservation: ExpiredReservation, initiator: User
+) -> bool:
+    match order_command_service.cancel_order(
+        expired_reservation.order_id, initiator, CANCELATION_REASON
+    ):
+        case Ok((_, event)):
+            pass
+        case Err(e):
+            db.session.rollback()
+            log.warning(
+                'Canceling order of expired bungalow reservation failed',
+                order_number=expired_reservation.order_number,
+                bungalow_number=expired_reservation.bungalow_number,
+                error=str(e),
+            )
+            return False
+
+    shop_order_signals.order_canceled.send(None, event=event)
+
+    return True
+
+
+def _chunk(
+    items: Sequence[ExpiredReservation], size: int
+) -> Iterator[Sequence[ExpiredReservation]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
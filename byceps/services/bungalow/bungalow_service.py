@@ -8,36 +8,65 @@ byceps.services.bungalow.bungalow_service
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
+from datetime import timedelta
 
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 
-from byceps.database import db, paginate, Pagination
-from byceps.services.brand import brand_setting_service
+from byceps.database import db
+from byceps.services.brand.dbmodels import DbBrandSetting
 from byceps.services.brand.models import BrandID
-from byceps.services.party import party_service, party_setting_service
+from byceps.services.party import party_service
+from byceps.services.party.dbmodels import DbPartySetting
 from byceps.services.party.models import Party, PartyID
 from byceps.services.shop.product.dbmodels.product import DbProduct
-from byceps.services.ticketing import ticket_bundle_service, ticket_service
 from byceps.services.ticketing.dbmodels.ticket import DbTicket
 from byceps.services.ticketing.dbmodels.ticket_bundle import DbTicketBundle
+from byceps.services.ticketing.models.ticket import TicketCategoryID
 from byceps.services.user.dbmodels import DbUser
 from byceps.services.user.models import User, UserID
 
+from . import bungalow_invalidation_service
+from .caching import ExpiringCache
 from .dbmodels.bungalow import DbBungalow
 from .dbmodels.category import DbBungalowCategory
 from .dbmodels.occupancy import DbBungalowOccupancy
 from .model_converters import _db_entity_to_bungalow
-from .models.bungalow import Bungalow, BungalowID, BungalowOccupationState
-from .models.occupation import BungalowOccupancy
+from .models.bungalow import (
+    Bungalow,
+    BungalowCandidate,
+    BungalowID,
+    BungalowOccupationState,
+)
+from .models.occupation import OccupantTicketCursor
+
+
+HAS_BUNGALOWS_SETTING_NAME = 'has_bungalows'
+USES_BUNGALOW_PRESELECTION_SETTING_NAME = 'uses_bungalow_preselection'
+
+
+# Settings are changed rarely, but looked up on almost every request.
+# Changes should be followed by invalidating the cached settings. The
+# time to live covers changes made without doing so, e.g. through the
+# BYCEPS admin UI.
+_brand_flags_cache: ExpiringCache[BrandID, bool] = ExpiringCache(
+    timedelta(minutes=1)
+)
+_party_flags_cache: ExpiringCache[PartyID, bool] = ExpiringCache(
+    timedelta(minutes=1)
+)
 
 
 def get_active_bungalow_parties() -> list[Party]:
     """Return active parties that use bungalows."""
+    parties = party_service.get_active_parties()
+
+    brand_ids_with_bungalows = get_brand_ids_with_bungalows(
+        {party.brand_id for party in parties}
+    )
+
     return [
-        party
-        for party in party_service.get_active_parties()
-        if has_brand_bungalows(party.brand_id)
+        party for party in parties if party.brand_id in brand_ids_with_bungalows
     ]
 
 
@@ -47,22 +76,106 @@ def get_active_bungalow_parties() -> list[Party]:
 
 def has_brand_bungalows(brand_id: BrandID) -> bool:
     """Return `True` if the brand's parties are built on bungalows."""
-    has_bungalows = brand_setting_service.find_setting_value(
-        brand_id, 'has_bungalows'
+    return brand_id in get_brand_ids_with_bungalows({brand_id})
+
+
+def get_brand_ids_with_bungalows(brand_ids: Iterable[BrandID]) -> set[BrandID]:
+    """Return those of the brands whose parties are built on bungalows."""
+    flags_by_brand_id = _brand_flags_cache.get_many_or_build(
+        brand_ids, _get_has_bungalows_flags
     )
 
-    return has_bungalows == 'true'
+    return {
+        brand_id
+        for brand_id, has_bungalows in flags_by_brand_id.items()
+        if has_bungalows
+    }
+
+
+def _get_has_bungalows_flags(brand_ids: set[BrandID]) -> dict[BrandID, bool]:
+    brand_ids_with_bungalows = set(
+        db.session.scalars(
+            select(DbBrandSetting.brand_id)
+            .filter(DbBrandSetting.brand_id.in_(brand_ids))
+            .filter_by(name=HAS_BUNGALOWS_SETTING_NAME)
+            .filter_by(value='true')
+        ).all()
+    )
+
+    return {
+        brand_id: brand_id in brand_ids_with_bungalows for brand_id in brand_ids
+    }
 
 
 def does_party_use_bungalow_preselection(party_id: PartyID) -> bool:
     """Return `True` if the party uses preselection of a specific
     bungalow on ordering.
     """
-    uses_bungalow_preselection = party_setting_service.find_setting_value(
-        party_id, 'uses_bungalow_preselection'
+    return party_id in get_party_ids_using_bungalow_preselection({party_id})
+
+
+def get_party_ids_using_bungalow_preselection(
+    party_ids: Iterable[PartyID],
+) -> set[PartyID]:
+    """Return those of the parties that use preselection of a specific
+    bungalow on ordering.
+    """
+    flags_by_party_id = _party_flags_cache.get_many_or_build(
+        party_ids, _get_uses_bungalow_preselection_flags
     )
 
-    return uses_bungalow_preselection == 'true'
+    return {
+        party_id
+        for party_id, uses_bungalow_preselection in flags_by_party_id.items()
+        if uses_bungalow_preselection
+    }
+
+
+def _get_uses_bungalow_preselection_flags(
+    party_ids: set[PartyID],
+) -> dict[PartyID, bool]:
+    party_ids_using_preselection = set(
+        db.session.scalars(
+            select(DbPartySetting.party_id)
+            .filter(DbPartySetting.party_id.in_(party_ids))
+            .filter_by(name=USES_BUNGALOW_PRESELECTION_SETTING_NAME)
+            .filter_by(value='true')
+        ).all()
+    )
+
+    return {
+        party_id: party_id in party_ids_using_preselection
+        for party_id in party_ids
+    }
+
+
+def invalidate_brand_settings(brand_id: BrandID) -> None:
+    """Forget the brand's cached bungalow settings.
+
+    Call this after changing them. Other processes pick up the change
+    once their cached settings have expired.
+    """
+    _brand_flags_cache.evict(brand_id)
+
+
+def invalidate_party_settings(party_id: PartyID) -> None:
+    """Forget the party's cached bungalow settings, in all processes.
+
+    Call this, in the same transaction, after changing them.
+    """
+    _party_flags_cache.evict(party_id)
+    bungalow_invalidation_service.notify_party_changed(party_id)
+
+
+@bungalow_invalidation_service.register_handler
+def _evict_party_settings(
+    party_id: PartyID, bungalow_ids: frozenset[BungalowID]
+) -> None:
+    # Changes to settings are announced for the whole party, i.e.
+    # without bungalow IDs. Changes to single bungalows leave the
+    # settings alone.
+    if not bungalow_ids:
+        _party_flags_cache.evict(party_id)
 
 
 # -------------------------------------------------------------------- #
@@ -73,10 +186,7 @@ def find_bungalow(bungalow_id: BungalowID) -> Bungalow | None:
     """Return the bungalow with that ID, or `None` if not found."""
     db_bungalow = db.session.execute(
         select(DbBungalow)
-        .options(
-            db.joinedload(DbBungalow.category),
-            db.joinedload(DbBungalow.occupancy),
-        )
+        .options(*_get_bungalow_conversion_load_options())
         .filter_by(id=bungalow_id)
     ).scalar_one_or_none()
 
@@ -96,6 +206,28 @@ def get_bungalow(bungalow_id: BungalowID) -> Bungalow:
     return bungalow
 
 
+def get_bungalows(bungalow_ids: Iterable[BungalowID]) -> list[Bungalow]:
+    """Return the bungalows with those IDs, ordered by number.
+
+    Unknown IDs are ignored.
+
+    The bungalows are loaded with a fixed number of queries, no matter
+    how many are requested.
+    """
+    bungalow_ids = set(bungalow_ids)
+    if not bungalow_ids:
+        return []
+
+    db_bungalows = db.session.scalars(
+        select(DbBungalow)
+        .filter(DbBungalow.id.in_(bungalow_ids))
+        .options(*_get_bungalow_conversion_load_options())
+        .order_by(DbBungalow.number)
+    ).all()
+
+    return [_db_entity_to_bungalow(db_bungalow) for db_bungalow in db_bungalows]
+
+
 def find_db_bungalow(bungalow_id: BungalowID) -> DbBungalow | None:
     """Return the bungalow with that ID, or `None` if not found."""
     return db.session.get(DbBungalow, bungalow_id)
@@ -157,62 +289,79 @@ def get_bungalows_for_party(party_id: PartyID) -> Sequence[DbBungalow]:
     ).all()
 
 
-def get_bungalows_extended_for_party(party_id: PartyID) -> Sequence[DbBungalow]:
-    """Return all bungalows for the party, ordered by number."""
-    return db.session.scalars(
-        select(DbBungalow)
-        .filter_by(party_id=party_id)
-        .options(db.joinedload(DbBungalow.occupancy))
-        .order_by(DbBungalow.number)
-    ).all()
-
-
-def get_available_bungalows_for_party(
-    party_id: PartyID,
-) -> list[Bungalow]:
-    """Return all available bungalows for the party, ordered by number."""
+def get_bungalows_extended_for_party(party_id: PartyID) -> list[Bungalow]:
+    """Return all bungalows for the party, ordered by number, including
+    their category and occupancy.
+    """
     db_bungalows = db.session.scalars(
         select(DbBungalow)
         .filter_by(party_id=party_id)
-        .filter_by(_occupation_state=BungalowOccupationState.available)
+        .options(*_get_bungalow_conversion_load_options())
         .order_by(DbBungalow.number)
     ).all()
 
     return [_db_entity_to_bungalow(db_bungalow) for db_bungalow in db_bungalows]
 
 
-# -------------------------------------------------------------------- #
-# ticket
-
+def _get_bungalow_conversion_load_options():
+    """Return options to eagerly load everything that is needed to
+    convert bungalow entities to `Bungalow` objects.
 
-def assign_first_ticket_to_main_occupant(occupancy: BungalowOccupancy) -> None:
-    """Assign the bundle's first ticket to the bungalow's main occupant.
+    These have to cover every relationship that `_db_entity_to_bungalow`
+    accesses, or converting will issue queries per bungalow.
 
-    If the user already uses another ticket, none of this bundle will be
-    assigned to them.
+    Loads the bungalows with their occupancy and its avatar in one
+    query, and their categories with product and ticket category in a
+    second one. Categories are shared by many bungalows, so they are not
+    joined to every bungalow row.
     """
-    db_ticket_bundle = ticket_bundle_service.get_bundle(
-        occupancy.ticket_bundle_id
+    return (
+        db.selectinload(DbBungalow.category).options(
+            db.joinedload(DbBungalowCategory.product),
+            db.joinedload(DbBungalowCategory.ticket_category),
+        ),
+        db.joinedload(DbBungalow.occupancy).joinedload(
+            DbBungalowOccupancy.avatar
+        ),
     )
-    if not db_ticket_bundle.tickets:
-        return
 
-    db_tickets = list(
-        sorted(db_ticket_bundle.tickets, key=lambda t: t.created_at)
+
+def get_candidate_bungalows(
+    party_id: PartyID,
+    ticket_category_id: TicketCategoryID,
+    capacity: int,
+    *,
+    excluded_bungalow_id: BungalowID | None = None,
+) -> list[BungalowCandidate]:
+    """Return the party's available bungalows that an occupancy with
+    tickets of that category and that number of slots can be put into,
+    ordered by number.
+    """
+    stmt = (
+        select(DbBungalow.id, DbBungalow.number, DbBungalowCategory.title)
+        .join(DbBungalow.category)
+        .filter(DbBungalow.party_id == party_id)
+        .filter(
+            DbBungalow._occupation_state == BungalowOccupationState.available
+        )
+        .filter(DbBungalowCategory.ticket_category_id == ticket_category_id)
+        .filter(DbBungalowCategory.capacity == capacity)
+        .order_by(DbBungalow.number)
     )
-    first_ticket = db_tickets[0]
 
-    main_occupant_id = occupancy.occupied_by_id
+    if excluded_bungalow_id is not None:
+        stmt = stmt.filter(DbBungalow.id != excluded_bungalow_id)
 
-    party_id = first_ticket.category.party_id
-    already_uses_ticket = ticket_service.uses_any_ticket_for_party(
-        main_occupant_id, party_id
-    )
-    if already_uses_ticket:
-        return
+    rows = db.session.execute(stmt).all()
 
-    first_ticket.used_by_id = main_occupant_id
-    db.session.commit()
+    return [
+        BungalowCandidate(id=bungalow_id, number=number, category_title=title)
+        for bungalow_id, number, title in rows
+    ]
+
+
+# -------------------------------------------------------------------- #
+# ticket
 
 
 def find_bungalow_inhabited_by_user(
@@ -246,31 +395,80 @@ def is_user_allowed_to_manage_any_occupant_slots(
     )
 
 
-def get_all_occupant_tickets_paginated(
+def get_occupant_tickets(
     party_id: PartyID,
-    page: int,
-    items_per_page: int,
+    limit: int,
     *,
+    after: OccupantTicketCursor | None = None,
     search_term: str | None = None,
-) -> Pagination:
-    """Return tickets for which a user has been assigned for all
-    bungalows of the party.
+) -> tuple[Sequence[DbTicket], OccupantTicketCursor | None]:
+    """Return up to `limit` tickets for which a user has been assigned,
+    for all bungalows of the party, ordered by the users' screen names.
+
+    Also return the cursor to pass as `after` to get the next page, or
+    `None` if this page is the last.
+
+    Ordering and searching are backed by indexes on the users' screen
+    names (see the `create_bungalow_occupant_search_indexes` command).
+    """
+    screen_name_lower = db.func.lower(DbUser.screen_name)
+
+    stmt = _select_occupant_tickets(party_id, search_term)
+
+    if after is not None:
+        stmt = stmt.filter(
+            tuple_(screen_name_lower, DbTicket.id)
+            > tuple_(db.func.lower(after.screen_name), after.ticket_id)
+        )
+
+    db_tickets = (
+        db.session.scalars(
+            stmt.options(
+                db.joinedload(DbTicket.used_by).joinedload(DbUser.avatar),
+            )
+            .order_by(screen_name_lower, DbTicket.id)
+            # Fetch one more to find out if there is a next page.
+            .limit(limit + 1)
+        )
+        .unique()
+        .all()
+    )
+
+    if len(db_tickets) <= limit:
+        return db_tickets, None
+
+    db_tickets = db_tickets[:limit]
+    last_ticket = db_tickets[-1]
+    next_cursor = OccupantTicketCursor(
+        screen_name=last_ticket.used_by.screen_name,
+        ticket_id=last_ticket.id,
+    )
+
+    return db_tickets, next_cursor
+
+
+def count_occupant_tickets(
+    party_id: PartyID, *, search_term: str | None = None, up_to: int
+) -> int:
+    """Return the number of tickets for which a user has been assigned,
+    for all bungalows of the party, but stop counting at `up_to`.
     """
+    stmt = _select_occupant_tickets(party_id, search_term).limit(up_to)
+
+    return db.session.scalar(
+        select(db.func.count()).select_from(stmt.subquery())
+    )
+
+
+def _select_occupant_tickets(party_id: PartyID, search_term: str | None):
     stmt = (
         select(DbTicket)
         .filter(DbTicket.party_id == party_id)
         .filter(DbTicket.revoked == False)  # noqa: E712
         .join(DbTicket.used_by)
-        .options(
-            db.joinedload(DbTicket.used_by).joinedload(DbUser.avatar),
-            db.joinedload(DbTicket.used_by).joinedload(
-                DbUser.orga_team_memberships
-            ),
-        )
-        .order_by(db.func.lower(DbUser.screen_name))
     )
 
     if search_term:
         stmt = stmt.filter(DbUser.screen_name.ilike(f'%{search_term}%'))
 
-    return paginate(stmt, page, items_per_page)
+    return stmt
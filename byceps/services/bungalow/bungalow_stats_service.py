@@ -12,16 +12,12 @@ from collections import defaultdict
 from collections.abc import Callable, Iterable, Iterator
 from operator import attrgetter
 
-from sqlalchemy import select
-
-from byceps.database import db
 from byceps.services.party.models import PartyID
 from byceps.services.ticketing import ticket_category_service
 from byceps.services.ticketing.dbmodels.category import DbTicketCategory
 from byceps.services.ticketing.models.ticket import TicketCategory
 
-from .dbmodels.bungalow import DbBungalow
-from .dbmodels.category import DbBungalowCategory
+from . import bungalow_occupation_counter_repository
 from .models.bungalow import BungalowOccupationState
 from .models.occupation import CategoryOccupationSummary, OccupationStateTotals
 
@@ -35,16 +31,7 @@ def get_occupation_state_totals_for_party(
     party_id: PartyID,
 ) -> OccupationStateTotals:
     """Return bungalow totals per occupation state for that party."""
-    rows = db.session.execute(
-        select(
-            DbBungalow._occupation_state,
-            db.func.count(DbBungalow._occupation_state),
-        )
-        .join(DbBungalowCategory)
-        .join(DbTicketCategory)
-        .filter(DbTicketCategory.party_id == party_id)
-        .group_by(DbBungalow._occupation_state)
-    ).all()
+    rows = bungalow_occupation_counter_repository.get_counts_by_state(party_id)
 
     state_names = {state.name for state in BungalowOccupationState}
     total_by_state = dict.fromkeys(state_names, 0)
@@ -55,6 +42,16 @@ def get_occupation_state_totals_for_party(
     return OccupationStateTotals(**total_by_state)
 
 
+def rebuild_occupation_counters(party_id: PartyID) -> None:
+    """Recount the party's bungalows per ticket category and occupation
+    state from scratch.
+
+    Use this to repair counters that have diverged from the bungalows'
+    actual occupation states.
+    """
+    bungalow_occupation_counter_repository.rebuild_counters(party_id)
+
+
 def get_statistics_by_category(
     party_id: PartyID,
     *,
@@ -89,20 +86,9 @@ def get_statistics_by_category(
 def _get_bungalow_counts_by_category_and_state(
     party_id: PartyID,
 ) -> BungalowCountByCategoryAndState:
-    rows = db.session.execute(
-        select(
-            DbTicketCategory,
-            DbBungalow._occupation_state,
-            db.func.count(DbBungalow._occupation_state),
-        )
-        .join(
-            DbBungalowCategory,
-            DbBungalowCategory.ticket_category_id == DbTicketCategory.id,
-        )
-        .join(DbBungalow)
-        .filter(DbTicketCategory.party_id == party_id)
-        .group_by(DbTicketCategory, DbBungalow._occupation_state)
-    ).all()
+    rows = bungalow_occupation_counter_repository.get_counts_by_ticket_category_and_state(
+        party_id
+    )
 
     return [
         (
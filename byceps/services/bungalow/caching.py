@@ -0,0 +1,147 @@
+"""
+byceps.services.bungalow.caching
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+In-process caching of data that is expensive to assemble
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable
+from datetime import timedelta
+from threading import Lock
+from time import monotonic
+from typing import Generic, TypeVar
+
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class ExpiringCache(Generic[K, V]):
+    """A thread-safe cache whose entries expire after a fixed time to
+    live unless they are evicted earlier.
+
+    Concurrent misses on the same key build the value only once; the
+    other threads wait for it.
+    """
+
+    def __init__(self, time_to_live: timedelta) -> None:
+        self._time_to_live_in_seconds = time_to_live.total_seconds()
+        self._lock = Lock()
+        self._entries: dict[K, tuple[float, V]] = {}
+        self._build_locks: dict[K, Lock] = {}
+        self._generation = 0
+
+    def find(self, key: K) -> V | None:
+        """Return the value for that key, or `None` if it is not cached
+        (anymore).
+        """
+        with self._lock:
+            return self._find(key)
+
+    def get_or_build(self, key: K, build: Callable[[], V]) -> V:
+        """Return the value for that key, building and caching it first
+        if necessary.
+        """
+        value = self.find(key)
+        if value is not None:
+            return value
+
+        with self._get_build_lock(key):
+            # Another thread might have built the value in the meantime.
+            with self._lock:
+                value = self._find(key)
+                generation = self._generation
+
+            if value is not None:
+                return value
+
+            value = build()
+
+            with self._lock:
+                # Do not cache a value that might have been built from
+                # data that was changed during the build.
+                if self._generation == generation:
+                    expires_at = monotonic() + self._time_to_live_in_seconds
+                    self._entries[key] = (expires_at, value)
+
+            return value
+
+    def get_many_or_build(
+        self, keys: Iterable[K], build: Callable[[set[K]], dict[K, V]]
+    ) -> dict[K, V]:
+        """Return the values for those keys, building and caching those
+        that are missing with a single call.
+
+        Unlike with `get_or_build`, concurrent misses are not combined.
+        """
+        keys = set(keys)
+
+        with self._lock:
+            values = {}
+            for key in keys:
+                value = self._find(key)
+                if value is not None:
+                    values[key] = value
+
+            generation = self._generation
+
+        missing_keys = keys - values.keys()
+        if not missing_keys:
+            return values
+
+        built_values = build(missing_keys)
+
+        with self._lock:
+            # Do not cache values that might have been built from data
+            # that was changed during the build.
+            if self._generation == generation:
+                expires_at = monotonic() + self._time_to_live_in_seconds
+                for key, value in built_values.items():
+                    self._entries[key] = (expires_at, value)
+
+        values.update(built_values)
+        return values
+
+    def get_items(self) -> list[tuple[K, V]]:
+        """Return all cached, non-expired keys and values."""
+        now = monotonic()
+
+        with self._lock:
+            return [
+                (key, value)
+                for key, (expires_at, value) in self._entries.items()
+                if now < expires_at
+            ]
+
+    def evict(self, key: K) -> None:
+        """Remove the value for that key."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def evict_all(self) -> None:
+        """Remove all values."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _find(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        return value
+
+    def _get_build_lock(self, key: K) -> Lock:
+        with self._lock:
+            return self._build_locks.setdefault(key, Lock())
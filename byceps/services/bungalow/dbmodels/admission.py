@@ -0,0 +1,42 @@
+"""
+byceps.services.bungalow.dbmodels.admission
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from byceps.database import db
+from byceps.services.party.models import PartyID
+from byceps.util.instances import ReprBuilder
+
+
+class DbBungalowAdmissionQueue(db.Model):
+    """The admission queue in front of a party's bungalow ordering flow.
+
+    Only the next free admission slot is stored. Issued tickets are kept
+    by their holders.
+    """
+
+    __tablename__ = 'bungalow_admission_queues'
+
+    party_id: Mapped[PartyID] = mapped_column(
+        db.UnicodeText, db.ForeignKey('parties.id'), primary_key=True
+    )
+    next_admission_at: Mapped[datetime]
+
+    def __init__(self, party_id: PartyID, next_admission_at: datetime) -> None:
+        self.party_id = party_id
+        self.next_admission_at = next_admission_at
+
+    def __repr__(self) -> str:
+        return (
+            ReprBuilder(self)
+            .add_with_lookup('party_id')
+            .add_with_lookup('next_admission_at')
+            .build()
+        )
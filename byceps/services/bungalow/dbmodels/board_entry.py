@@ -0,0 +1,83 @@
+"""
+byceps.services.bungalow.dbmodels.board_entry
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+if TYPE_CHECKING:
+    hybrid_property = property
+else:
+    from sqlalchemy.ext.hybrid import hybrid_property
+
+from byceps.database import db
+from byceps.services.bungalow.models.bungalow import (
+    BungalowID,
+    BungalowOccupationState,
+)
+from byceps.services.bungalow.models.category import BungalowCategoryID
+from byceps.services.bungalow.models.occupation import OccupancyID
+from byceps.services.party.models import PartyID
+from byceps.services.shop.order.models.number import OrderNumber
+from byceps.services.ticketing.models.ticket import TicketBundleID
+from byceps.services.user.models import UserID
+from byceps.util.instances import ReprBuilder
+
+
+class DbBungalowBoardEntry(db.Model):
+    """A bungalow as shown on the boards, with everything that is shown
+    about it gathered in a single row.
+
+    Maintained alongside the bungalows, their categories, occupancies,
+    and occupants so that the boards do not have to join all of them.
+    """
+
+    __tablename__ = 'bungalow_board_entries'
+    __table_args__ = (db.UniqueConstraint('party_id', 'number'),)
+
+    bungalow_id: Mapped[BungalowID] = mapped_column(
+        db.ForeignKey('bungalows.id', ondelete='CASCADE'), primary_key=True
+    )
+    party_id: Mapped[PartyID] = mapped_column(
+        db.UnicodeText, db.ForeignKey('parties.id')
+    )
+    number: Mapped[int] = mapped_column(db.SmallInteger)
+    _occupation_state: Mapped[str] = mapped_column(
+        'occupation_state', db.UnicodeText
+    )
+    distributes_network: Mapped[bool]
+    category_id: Mapped[BungalowCategoryID]
+    category_title: Mapped[str] = mapped_column(db.UnicodeText)
+    category_capacity: Mapped[int]
+    occupancy_id: Mapped[OccupancyID | None]
+    occupancy_title: Mapped[str | None] = mapped_column(db.UnicodeText)
+    avatar_url: Mapped[str | None] = mapped_column(db.UnicodeText)
+    occupier_id: Mapped[UserID | None]
+    occupier_screen_name: Mapped[str | None] = mapped_column(db.UnicodeText)
+    manager_id: Mapped[UserID | None]
+    order_number: Mapped[OrderNumber | None] = mapped_column(db.UnicodeText)
+    ticket_bundle_id: Mapped[TicketBundleID | None]
+    pinned: Mapped[bool]
+    internal_remark: Mapped[str | None] = mapped_column(db.UnicodeText)
+    occupied_slots: Mapped[int]
+    total_slots: Mapped[int]
+
+    @hybrid_property
+    def occupation_state(self) -> BungalowOccupationState:
+        return BungalowOccupationState[self._occupation_state]
+
+    def __repr__(self) -> str:
+        return (
+            ReprBuilder(self)
+            .add_with_lookup('party_id')
+            .add_with_lookup('number')
+            .add('occupation_state', self.occupation_state.name)
+            .build()
+        )
@@ -0,0 +1,69 @@
+"""
+byceps.services.bungalow.dbmodels.hold
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from byceps.database import db
+from byceps.services.bungalow.models.bungalow import BungalowID
+from byceps.services.party.models import PartyID
+from byceps.services.user.models import UserID
+from byceps.util.instances import ReprBuilder
+
+
+class DbBungalowHold(db.Model):
+    """A provisional hold on a bungalow while a user fills in the form
+    to order it.
+
+    A hold is in effect until it expires. Expired holds are not removed
+    but ignored, and replaced by the next hold on the bungalow.
+
+    The creation time limits how far the user can extend the hold.
+    """
+
+    __tablename__ = 'bungalow_holds'
+    __table_args__ = (
+        # Index to look up the holds of a party that are in effect.
+        db.Index(
+            'ix_bungalow_holds_party_id_expires_at', 'party_id', 'expires_at'
+        ),
+    )
+
+    bungalow_id: Mapped[BungalowID] = mapped_column(
+        db.ForeignKey('bungalows.id'), primary_key=True
+    )
+    party_id: Mapped[PartyID] = mapped_column(
+        db.UnicodeText, db.ForeignKey('parties.id')
+    )
+    user_id: Mapped[UserID] = mapped_column(db.ForeignKey('users.id'))
+    created_at: Mapped[datetime]
+    expires_at: Mapped[datetime]
+
+    def __init__(
+        self,
+        bungalow_id: BungalowID,
+        party_id: PartyID,
+        user_id: UserID,
+        created_at: datetime,
+        expires_at: datetime,
+    ) -> None:
+        self.bungalow_id = bungalow_id
+        self.party_id = party_id
+        self.user_id = user_id
+        self.created_at = created_at
+        self.expires_at = expires_at
+
+    def __repr__(self) -> str:
+        return (
+            ReprBuilder(self)
+            .add_with_lookup('bungalow_id')
+            .add_with_lookup('user_id')
+            .add_with_lookup('expires_at')
+            .build()
+        )
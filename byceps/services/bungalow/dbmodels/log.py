@@ -14,6 +14,7 @@ from sqlalchemy.orm import Mapped, mapped_column
 from byceps.database import db
 from byceps.services.bungalow.models.bungalow import BungalowID
 from byceps.services.bungalow.models.log import BungalowLogEntryData
+from byceps.services.party.models import PartyID
 from byceps.util.instances import ReprBuilder
 
 
@@ -21,12 +22,37 @@ class DbBungalowLogEntry(db.Model):
     """A log entry regarding a bungalow."""
 
     __tablename__ = 'bungalow_log_entries'
+    __table_args__ = (
+        # Indexes to page through entries by time of occurrence.
+        db.Index(
+            'ix_bungalow_log_entries_bungalow_id_occurred_at_id',
+            'bungalow_id',
+            'occurred_at',
+            'id',
+        ),
+        db.Index(
+            'ix_bungalow_log_entries_party_id_occurred_at_id',
+            'party_id',
+            'occurred_at',
+            'id',
+        ),
+        db.Index(
+            'ix_bungalow_log_entries_party_id_event_type_occurred_at_id',
+            'party_id',
+            'event_type',
+            'occurred_at',
+            'id',
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True)
     occurred_at: Mapped[datetime]
-    event_type: Mapped[str] = mapped_column(db.UnicodeText, index=True)
+    event_type: Mapped[str] = mapped_column(db.UnicodeText)
+    party_id: Mapped[PartyID] = mapped_column(
+        db.UnicodeText, db.ForeignKey('parties.id')
+    )
     bungalow_id: Mapped[BungalowID] = mapped_column(
-        db.ForeignKey('bungalows.id'), index=True
+        db.ForeignKey('bungalows.id')
     )
     data: Mapped[BungalowLogEntryData] = mapped_column(db.JSONB)
 
@@ -35,12 +61,14 @@ class DbBungalowLogEntry(db.Model):
         entry_id: UUID,
         occurred_at: datetime,
         event_type: str,
+        party_id: PartyID,
         bungalow_id: BungalowID,
         data: BungalowLogEntryData,
     ) -> None:
         self.id = entry_id
         self.occurred_at = occurred_at
         self.event_type = event_type
+        self.party_id = party_id
         self.bungalow_id = bungalow_id
         self.data = data
 
@@ -52,3 +80,12 @@ class DbBungalowLogEntry(db.Model):
             .add_with_lookup('data')
             .build()
         )
+
+
+db.Index(
+    'ix_bungalow_log_entries_party_id_initiator_id_occurred_at_id',
+    DbBungalowLogEntry.party_id,
+    DbBungalowLogEntry.data['initiator_id'].astext,
+    DbBungalowLogEntry.occurred_at,
+    DbBungalowLogEntry.id,
+)
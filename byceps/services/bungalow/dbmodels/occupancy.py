@@ -40,10 +40,19 @@ class DbBungalowReservation(db.Model):
     """A reservation for a bungalow."""
 
     __tablename__ = 'bungalow_reservations'
+    __table_args__ = (
+        # Deferrable so that reservations can trade bungalows within a
+        # transaction.
+        db.UniqueConstraint(
+            'bungalow_id',
+            name='bungalow_reservations_bungalow_id_key',
+            deferrable=True,
+        ),
+    )
 
     id: Mapped[ReservationID] = mapped_column(primary_key=True)
     bungalow_id: Mapped[BungalowID] = mapped_column(
-        db.ForeignKey('bungalows.id'), unique=True, index=True
+        db.ForeignKey('bungalows.id')
     )
     bungalow: Mapped[DbBungalow] = relationship(
         backref=db.backref('reservation', uselist=False)
@@ -75,10 +84,19 @@ class DbBungalowOccupancy(db.Model):
     """The occupancy of a bungalow."""
 
     __tablename__ = 'bungalow_occupancies'
+    __table_args__ = (
+        # Deferrable so that occupancies can trade bungalows within a
+        # transaction.
+        db.UniqueConstraint(
+            'bungalow_id',
+            name='bungalow_occupancies_bungalow_id_key',
+            deferrable=True,
+        ),
+    )
 
     id: Mapped[OccupancyID] = mapped_column(primary_key=True)
     bungalow_id: Mapped[BungalowID] = mapped_column(
-        db.ForeignKey('bungalows.id'), unique=True, index=True
+        db.ForeignKey('bungalows.id')
     )
     bungalow: Mapped[DbBungalow] = relationship(
         backref=db.backref('occupancy', uselist=False)
@@ -0,0 +1,76 @@
+"""
+byceps.services.bungalow.dbmodels.occupation_counter
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+if TYPE_CHECKING:
+    hybrid_property = property
+else:
+    from sqlalchemy.ext.hybrid import hybrid_property
+
+from byceps.database import db
+from byceps.services.bungalow.models.bungalow import BungalowOccupationState
+from byceps.services.party.models import PartyID
+from byceps.services.ticketing.models.ticket import TicketCategoryID
+from byceps.util.instances import ReprBuilder
+
+
+class DbBungalowOccupationCounter(db.Model):
+    """The number of a party's bungalows of a ticket category that are
+    in an occupation state.
+
+    Maintained alongside the bungalows' occupation states so that
+    statistics do not have to be aggregated over all bungalows.
+    """
+
+    __tablename__ = 'bungalow_occupation_counters'
+
+    party_id: Mapped[PartyID] = mapped_column(
+        db.UnicodeText, db.ForeignKey('parties.id'), primary_key=True
+    )
+    ticket_category_id: Mapped[TicketCategoryID] = mapped_column(
+        db.ForeignKey('ticket_categories.id'), primary_key=True
+    )
+    _state: Mapped[str] = mapped_column(
+        'state', db.UnicodeText, primary_key=True
+    )
+    count: Mapped[int]
+
+    def __init__(
+        self,
+        party_id: PartyID,
+        ticket_category_id: TicketCategoryID,
+        state: BungalowOccupationState,
+        count: int,
+    ) -> None:
+        self.party_id = party_id
+        self.ticket_category_id = ticket_category_id
+        self.state = state
+        self.count = count
+
+    @hybrid_property
+    def state(self) -> BungalowOccupationState:
+        return BungalowOccupationState[self._state]
+
+    @state.setter
+    def state(self, state: BungalowOccupationState) -> None:
+        self._state = state.name
+
+    def __repr__(self) -> str:
+        return (
+            ReprBuilder(self)
+            .add_with_lookup('party_id')
+            .add_with_lookup('ticket_category_id')
+            .add('state', self.state.name)
+            .add_with_lookup('count')
+            .build()
+        )
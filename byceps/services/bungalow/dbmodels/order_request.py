@@ -0,0 +1,59 @@
+"""
+byceps.services.bungalow.dbmodels.order_request
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from byceps.database import db
+from byceps.services.bungalow.models.occupation import (
+    OccupancyID,
+    ReservationID,
+)
+from byceps.services.shop.order.models.number import OrderNumber
+from byceps.services.shop.order.models.order import OrderID
+from byceps.services.user.models import UserID
+from byceps.util.instances import ReprBuilder
+
+
+class DbBungalowOrderRequest(db.Model):
+    """A request to reserve and order a bungalow, identified by the key
+    the order form has been rendered with.
+
+    The key is claimed before the request is processed. The reservation
+    is added in the same transaction that creates it, the order in the
+    same transaction that assigns it to the reservation.
+    """
+
+    __tablename__ = 'bungalow_order_requests'
+
+    key: Mapped[UUID] = mapped_column(primary_key=True)
+    created_at: Mapped[datetime]
+    user_id: Mapped[UserID] = mapped_column(db.ForeignKey('users.id'))
+    reservation_id: Mapped[ReservationID | None]
+    occupancy_id: Mapped[OccupancyID | None]
+    order_id: Mapped[OrderID | None]
+    order_number: Mapped[OrderNumber | None] = mapped_column(db.UnicodeText)
+    concluded_at: Mapped[datetime | None]
+
+    def __init__(
+        self, key: UUID, created_at: datetime, user_id: UserID
+    ) -> None:
+        self.key = key
+        self.created_at = created_at
+        self.user_id = user_id
+
+    def __repr__(self) -> str:
+        return (
+            ReprBuilder(self)
+            .add_with_lookup('key')
+            .add_with_lookup('user_id')
+            .add_with_lookup('order_number')
+            .build()
+        )
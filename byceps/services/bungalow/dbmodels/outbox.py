@@ -0,0 +1,62 @@
+"""
+byceps.services.bungalow.dbmodels.outbox
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from byceps.database import db
+from byceps.util.instances import ReprBuilder
+
+
+class DbBungalowOutboxEvent(db.Model):
+    """A bungalow event that is yet to be announced.
+
+    Events are written in the same transaction as the change they
+    describe and are removed once they have been delivered to all
+    webhooks.
+    """
+
+    __tablename__ = 'bungalow_outbox_events'
+
+    id: Mapped[UUID] = mapped_column(primary_key=True)
+    occurred_at: Mapped[datetime]
+    event_name: Mapped[str] = mapped_column(db.UnicodeText)
+    data: Mapped[dict[str, Any]] = mapped_column(db.JSONB)
+    announced_webhook_ids: Mapped[list[str]] = mapped_column(db.JSONB)
+    attempts: Mapped[int] = mapped_column(default=0)
+    # `None` once delivery has been given up on.
+    next_attempt_at: Mapped[datetime | None] = mapped_column(index=True)
+    last_error: Mapped[str | None] = mapped_column(db.UnicodeText)
+
+    def __init__(
+        self,
+        event_id: UUID,
+        occurred_at: datetime,
+        event_name: str,
+        data: dict[str, Any],
+        next_attempt_at: datetime,
+    ) -> None:
+        self.id = event_id
+        self.occurred_at = occurred_at
+        self.event_name = event_name
+        self.data = data
+        self.announced_webhook_ids = []
+        self.attempts = 0
+        self.next_attempt_at = next_attempt_at
+
+    def __repr__(self) -> str:
+        return (
+            ReprBuilder(self)
+            .add_custom(repr(self.event_name))
+            .add_with_lookup('occurred_at')
+            .add_with_lookup('attempts')
+            .build()
+        )
@@ -0,0 +1,42 @@
+"""
+byceps.services.bungalow.dbmodels.webhook_send_budget
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from byceps.database import db
+from byceps.util.instances import ReprBuilder
+
+
+class DbBungalowWebhookSendBudget(db.Model):
+    """How many announcements of bungalow events may be sent to a
+    webhook.
+
+    Only the point in time at which the budget will be fully used up is
+    stored (a "theoretical arrival time"), from which the remaining
+    budget follows.
+    """
+
+    __tablename__ = 'bungalow_webhook_send_budgets'
+
+    webhook_id: Mapped[UUID] = mapped_column(primary_key=True)
+    exhausted_until: Mapped[datetime]
+
+    def __init__(self, webhook_id: UUID, exhausted_until: datetime) -> None:
+        self.webhook_id = webhook_id
+        self.exhausted_until = exhausted_until
+
+    def __repr__(self) -> str:
+        return (
+            ReprBuilder(self)
+            .add_with_lookup('webhook_id')
+            .add_with_lookup('exhausted_until')
+            .build()
+        )
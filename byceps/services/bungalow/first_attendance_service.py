@@ -6,73 +6,85 @@ byceps.services.bungalow.first_attendance_service
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
-from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterator
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 
 from sqlalchemy import select
+from sqlalchemy.orm import aliased
 
 from byceps.database import db
-from byceps.services.brand.models import BrandID
-from byceps.services.bungalow import bungalow_service
-from byceps.services.party.models import Party, PartyID
-from byceps.services.ticketing import ticket_attendance_service
+from byceps.services.party.dbmodels import DbParty
+from byceps.services.party.models import Party
+from byceps.services.ticketing.dbmodels.archived_attendance import (
+    DbArchivedAttendance,
+)
 from byceps.services.ticketing.dbmodels.category import DbTicketCategory
 from byceps.services.ticketing.dbmodels.ticket import DbTicket
-from byceps.services.user import user_service
 from byceps.services.user.dbmodels import DbUser
-from byceps.services.user.models import User
 
-
-def get_first_time_attendees_by_bungalow(party: Party) -> dict[int, list[User]]:
-    """List users that attend the party series for the first time,
-    grouped by bungalow number.
-    """
-    first_time_attendees = _get_first_time_attendees(party)
-    return _group_attendees_by_bungalow_number(first_time_attendees, party.id)
+from .dbmodels.bungalow import DbBungalow
+from .dbmodels.occupancy import DbBungalowOccupancy
 
 
-def _get_first_time_attendees(party: Party) -> list[User]:
-    return [
-        attendee
-        for attendee in _get_party_attendees(party.id)
-        if not _has_attended_brand_parties(attendee, party.brand_id)
-    ]
+def get_first_time_attendees_by_bungalow(
+    party: Party,
+) -> Iterator[tuple[int, list[str | None]]]:
+    """Yield the screen names of users that attend the party series for
+    the first time, grouped by bungalow number.
 
-
-def _get_party_attendees(party_id: PartyID) -> list[User]:
-    rows = db.session.scalars(
-        select(DbUser)
-        .join(DbTicket, DbTicket.used_by_id == DbUser.id)
+    All attendees are determined with a single query whose rows are
+    fetched in batches as the groups are consumed.
+    """
+    rows = db.session.execute(
+        select(DbBungalow.number, DbUser.screen_name)
+        .select_from(DbTicket)
+        .join(DbUser, DbUser.id == DbTicket.used_by_id)
+        .join(
+            DbBungalowOccupancy,
+            DbBungalowOccupancy.ticket_bundle_id == DbTicket.bundle_id,
+        )
+        .join(DbBungalow, DbBungalow.id == DbBungalowOccupancy.bungalow_id)
+        .filter(DbTicket.party_id == party.id)
         .filter(DbTicket.revoked == False)  # noqa: E712
-        .join(DbTicketCategory)
-        .filter(DbTicketCategory.party_id == party_id)
-    ).all()
-
-    return [user_service._db_entity_to_user(row) for row in rows]
-
-
-def _has_attended_brand_parties(attendee: User, brand_id: BrandID) -> bool:
-    attended_parties = ticket_attendance_service.get_attended_parties(
-        attendee.id, limit_to_brand_id=brand_id
+        .filter(~_has_attended_other_brand_party_by_ticket(party))
+        .filter(~_has_attended_other_brand_party_by_archive(party))
+        .order_by(DbBungalow.number, DbUser.screen_name)
+        .execution_options(yield_per=500)
     )
-    return bool(attended_parties)
-
 
-def _group_attendees_by_bungalow_number(
-    attendees: Iterable[User], party_id: PartyID
-) -> dict[int, list[User]]:
-    def add_bungalow_number(attendee: User) -> tuple[User, int]:
-        bungalow = bungalow_service.find_bungalow_inhabited_by_user(
-            attendee.id, party_id
-        )
+    for bungalow_number, group_rows in groupby(rows, key=itemgetter(0)):
+        screen_names = [screen_name for _, screen_name in group_rows]
+        yield bungalow_number, screen_names
 
-        return attendee, bungalow.number
 
-    attendees_with_bungalow_numbers = map(add_bungalow_number, attendees)
+def _has_attended_other_brand_party_by_ticket(party: Party):
+    db_attended_ticket = aliased(DbTicket)
 
-    attendees_by_bungalow_number = defaultdict(list)
+    return (
+        select(db_attended_ticket.id)
+        .join(
+            DbTicketCategory,
+            DbTicketCategory.id == db_attended_ticket.category_id,
+        )
+        .join(DbParty, DbParty.id == DbTicketCategory.party_id)
+        .filter(db_attended_ticket.used_by_id == DbUser.id)
+        .filter(db_attended_ticket.revoked == False)  # noqa: E712
+        .filter(DbParty.brand_id == party.brand_id)
+        .filter(DbParty.id != party.id)
+        .filter(DbParty.ends_at < datetime.utcnow())
+        .filter(DbParty.canceled == False)  # noqa: E712
+        .exists()
+    )
 
-    for attendee, bungalow_number in attendees_with_bungalow_numbers:
-        attendees_by_bungalow_number[bungalow_number].append(attendee)
 
-    return attendees_by_bungalow_number
+def _has_attended_other_brand_party_by_archive(party: Party):
+    return (
+        select(DbArchivedAttendance.party_id)
+        .join(DbParty, DbParty.id == DbArchivedAttendance.party_id)
+        .filter(DbArchivedAttendance.user_id == DbUser.id)
+        .filter(DbParty.brand_id == party.brand_id)
+        .filter(DbParty.id != party.id)
+        .exists()
+    )
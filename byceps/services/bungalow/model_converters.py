@@ -17,6 +17,12 @@ from .models.occupation import BungalowOccupancy, BungalowReservation
 
 
 def _db_entity_to_bungalow(db_bungalow: DbBungalow) -> Bungalow:
+    """Convert a bungalow entity to a `Bungalow` object.
+
+    Accesses the bungalow's category (with its product and ticket
+    category) and its occupancy (with its avatar). Load those eagerly
+    when converting multiple bungalows.
+    """
     category = _db_entity_to_bungalow_category(db_bungalow.category)
 
     db_occupancy = db_bungalow.occupancy
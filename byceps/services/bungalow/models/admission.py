@@ -0,0 +1,44 @@
+"""
+byceps.services.bungalow.models.admission
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from math import ceil
+
+from byceps.services.party.models import PartyID
+
+
+@dataclass(frozen=True, kw_only=True)
+class AdmissionTicket:
+    """A ticket of the admission queue in front of the ordering flow.
+
+    The holder is admitted once `admissible_at` has been reached.
+    """
+
+    party_id: PartyID
+    admissible_at: datetime
+    admission_rate: float | None
+
+    def is_admitted(self, now: datetime) -> bool:
+        return now >= self.admissible_at
+
+    def get_seconds_to_wait(self, now: datetime) -> int:
+        """Return the estimated number of seconds until admission."""
+        return max(0, ceil((self.admissible_at - now).total_seconds()))
+
+    def get_position(self, now: datetime) -> int:
+        """Return the estimated number of users to be admitted before
+        the holder, including themselves.
+        """
+        if self.is_admitted(now) or self.admission_rate is None:
+            return 0
+
+        waiting_seconds = (self.admissible_at - now).total_seconds()
+        return max(1, ceil(waiting_seconds * self.admission_rate))
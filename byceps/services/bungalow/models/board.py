@@ -0,0 +1,65 @@
+"""
+byceps.services.bungalow.models.board
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from byceps.services.party.models import PartyID
+from byceps.services.shop.order.models.number import OrderNumber
+from byceps.services.ticketing.models.ticket import TicketBundleID
+from byceps.services.user.models import UserID
+
+from .bungalow import BungalowID, BungalowOccupationState
+from .category import BungalowCategoryID
+from .occupation import OccupancyID
+
+
+@dataclass(frozen=True, kw_only=True)
+class BungalowBoardEntry:
+    """A bungalow as shown on the boards."""
+
+    id: BungalowID
+    party_id: PartyID
+    number: int
+    occupation_state: BungalowOccupationState
+    distributes_network: bool
+    category_id: BungalowCategoryID
+    category_title: str
+    category_capacity: int
+    occupancy_id: OccupancyID | None
+    occupancy_title: str | None
+    avatar_url: str | None
+    occupier_id: UserID | None
+    occupier_screen_name: str | None
+    manager_id: UserID | None
+    order_number: OrderNumber | None
+    ticket_bundle_id: TicketBundleID | None
+    pinned: bool
+    internal_remark: str | None
+    occupied_slots: int
+    total_slots: int
+
+    @property
+    def available(self) -> bool:
+        return self.occupation_state == BungalowOccupationState.available
+
+    @property
+    def reserved(self) -> bool:
+        return self.occupation_state == BungalowOccupationState.reserved
+
+    @property
+    def occupied(self) -> bool:
+        return self.occupation_state == BungalowOccupationState.occupied
+
+    @property
+    def reserved_or_occupied(self) -> bool:
+        return self.occupation_state in {
+            BungalowOccupationState.reserved,
+            BungalowOccupationState.occupied,
+        }
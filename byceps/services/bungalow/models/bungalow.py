@@ -40,3 +40,12 @@ class Bungalow:
     reserved_or_occupied: bool
     occupancy: 'BungalowOccupancy' | None
     avatar_url: str | None
+
+
+@dataclass(frozen=True, kw_only=True)
+class BungalowCandidate:
+    """An available bungalow an occupancy can be put into."""
+
+    id: BungalowID
+    number: int
+    category_title: str
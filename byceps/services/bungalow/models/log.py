@@ -6,11 +6,15 @@ byceps.services.bungalow.models.log
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
+from __future__ import annotations
+
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 from uuid import UUID
 
+from byceps.services.party.models import PartyID
+
 from .bungalow import BungalowID
 
 
@@ -22,5 +26,36 @@ class BungalowLogEntry:
     id: UUID
     occurred_at: datetime
     event_type: str
+    party_id: PartyID
     bungalow_id: BungalowID
     data: BungalowLogEntryData
+
+
+@dataclass(frozen=True, kw_only=True)
+class BungalowLogEntryCursor:
+    """A position in a list of log entries ordered by time of occurrence
+    (and ID, to break ties).
+    """
+
+    occurred_at: datetime
+    entry_id: UUID
+
+    @classmethod
+    def for_entry(cls, entry: BungalowLogEntry) -> BungalowLogEntryCursor:
+        return cls(occurred_at=entry.occurred_at, entry_id=entry.id)
+
+    def serialize(self) -> str:
+        return f'{self.occurred_at.isoformat()}_{self.entry_id}'
+
+    @classmethod
+    def parse(cls, value: str) -> BungalowLogEntryCursor | None:
+        """Parse a serialized cursor, or return `None` if invalid."""
+        occurred_at_str, _, entry_id_str = value.partition('_')
+
+        try:
+            occurred_at = datetime.fromisoformat(occurred_at_str)
+            entry_id = UUID(entry_id_str)
+        except ValueError:
+            return None
+
+        return cls(occurred_at=occurred_at, entry_id=entry_id)
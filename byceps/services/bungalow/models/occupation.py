@@ -10,11 +10,13 @@ from __future__ import annotations
 
 from collections import Counter
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
 from typing import NewType
 from uuid import UUID
 
 from byceps.services.shop.order.models.number import OrderNumber
+from byceps.services.shop.order.models.order import OrderID
 from byceps.services.ticketing.models.ticket import TicketBundleID, TicketID
 from byceps.services.user.models import User, UserID
 
@@ -40,6 +42,39 @@ class BungalowReservation:
     internal_remark: str | None
 
 
+@dataclass(frozen=True, kw_only=True)
+class ExpiredReservation:
+    """A reservation whose order has been open for too long."""
+
+    reservation_id: ReservationID
+    bungalow_id: BungalowID
+    bungalow_number: int
+    order_id: OrderID
+    order_number: OrderNumber
+    order_created_at: datetime
+
+
+@dataclass(frozen=True, kw_only=True)
+class BungalowOrderRequest:
+    """A request to reserve and order a bungalow, identified by a key.
+
+    The reservation and the order are `None` as long as they have not
+    been made.
+    """
+
+    key: UUID
+    user_id: UserID
+    reservation_id: ReservationID | None
+    occupancy_id: OccupancyID | None
+    order_id: OrderID | None
+    order_number: OrderNumber | None
+    concluded_at: datetime | None
+
+    @property
+    def concluded(self) -> bool:
+        return (self.order_id is not None) or (self.concluded_at is not None)
+
+
 @dataclass(frozen=True, kw_only=True)
 class BungalowOccupancy:
     id: OccupancyID
@@ -62,6 +97,33 @@ class OccupantSlot:
     occupant: User | None
 
 
+@dataclass(frozen=True, kw_only=True)
+class OccupantTicketCursor:
+    """A position in a list of occupant tickets ordered by the
+    occupants' screen names, case-insensitively (and ticket ID, to break
+    ties).
+    """
+
+    screen_name: str
+    ticket_id: TicketID
+
+    def serialize(self) -> str:
+        return f'{self.ticket_id}_{self.screen_name}'
+
+    @classmethod
+    def parse(cls, value: str) -> OccupantTicketCursor | None:
+        """Parse a serialized cursor, or return `None` if invalid."""
+        # Screen names might contain underscores, but ticket IDs do not.
+        ticket_id_str, _, screen_name = value.partition('_')
+
+        try:
+            ticket_id = TicketID(UUID(ticket_id_str))
+        except ValueError:
+            return None
+
+        return cls(screen_name=screen_name, ticket_id=ticket_id)
+
+
 @dataclass(frozen=True, kw_only=True)
 class OccupationStateTotals:
     available: int
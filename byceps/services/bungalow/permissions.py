@@ -28,6 +28,14 @@ register_permissions(
 )
 
 
+register_permissions(
+    'bungalow_order',
+    [
+        ('cancel', lazy_gettext('Bungalow-Bestellungen stornieren')),
+    ],
+)
+
+
 register_permissions(
     'bungalow_offer',
     [
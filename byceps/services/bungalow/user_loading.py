@@ -0,0 +1,121 @@
+"""
+byceps.services.bungalow.user_loading
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Request-scoped, batching lookup of users
+
+Views announce the users they are going to need as they assemble their
+data, and the first actual lookup then fetches all of them with a single
+query. Users are kept for the rest of the request, so subsequent lookups
+of the same users do not hit the database again.
+
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Generic, Protocol, TypeVar
+
+from flask import g
+
+from byceps.services.user import user_service
+from byceps.services.user.models import User, UserForAdmin, UserID
+
+
+class _HasUserID(Protocol):
+    @property
+    def id(self) -> UserID: ...
+
+
+U = TypeVar('U', bound=_HasUserID)
+
+
+class UserLoader(Generic[U]):
+    """Collect user IDs, then look up the users in a single batch and
+    remember them.
+    """
+
+    def __init__(self, load: Callable[[set[UserID]], Iterable[U]]) -> None:
+        self._load = load
+        self._pending_ids: set[UserID] = set()
+        # Users that do not exist are remembered as `None`.
+        self._users_by_id: dict[UserID, U | None] = {}
+
+    def prime(self, user_ids: Iterable[UserID | None]) -> None:
+        """Announce that these users are going to be needed.
+
+        They are looked up along with the users requested next.
+        """
+        self._pending_ids.update(
+            user_id
+            for user_id in user_ids
+            if user_id is not None and user_id not in self._users_by_id
+        )
+
+    def find(self, user_id: UserID) -> U | None:
+        """Return the user, or `None` if not found."""
+        return self.get_many({user_id}).get(user_id)
+
+    def get(self, user_id: UserID) -> U:
+        """Return the user, or raise an exception if not found."""
+        user = self.find(user_id)
+
+        if user is None:
+            raise ValueError(f'Unknown user ID "{user_id}"')
+
+        return user
+
+    def get_many(self, user_ids: Iterable[UserID]) -> dict[UserID, U]:
+        """Return the users that exist, indexed by ID."""
+        user_ids = set(user_ids)
+
+        self.prime(user_ids)
+        self._load_pending()
+
+        return {
+            user_id: user
+            for user_id in user_ids
+            if (user := self._users_by_id.get(user_id)) is not None
+        }
+
+    def _load_pending(self) -> None:
+        if not self._pending_ids:
+            return
+
+        user_ids = self._pending_ids
+        self._pending_ids = set()
+
+        users = self._load(user_ids)
+
+        self._users_by_id.update(dict.fromkeys(user_ids))
+        self._users_by_id.update((user.id, user) for user in users)
+
+
+def get_user_loader() -> UserLoader[User]:
+    """Return the current request's loader for users with avatars."""
+    loader = g.get('bungalow_user_loader')
+
+    if loader is None:
+        loader = UserLoader(_get_users_with_avatars)
+        g.bungalow_user_loader = loader
+
+    return loader
+
+
+def get_admin_user_loader() -> UserLoader[UserForAdmin]:
+    """Return the current request's loader for users with the details
+    shown to admins.
+    """
+    loader = g.get('bungalow_admin_user_loader')
+
+    if loader is None:
+        loader = UserLoader(user_service.get_users_for_admin)
+        g.bungalow_admin_user_loader = loader
+
+    return loader
+
+
+def _get_users_with_avatars(user_ids: set[UserID]) -> set[User]:
+    return user_service.get_users(user_ids, include_avatars=True)
@@ -10,9 +10,9 @@ from uuid import UUID
 
 from byceps.services.bungalow import (
     bungalow_occupancy_service,
-    bungalow_service,
     signals as bungalow_signals,
 )
+from byceps.services.bungalow.events import BungalowOccupiedEvent
 from byceps.services.bungalow.models.occupation import (
     OccupancyID,
     ReservationID,
@@ -68,7 +68,11 @@ def on_payment(
     initiator: User,
     parameters: ActionParameters,
 ) -> Result[None, OrderActionFailedError]:
-    """Create ticket bundle and occupy reserved bungalow."""
+    """Create ticket bundle and occupy reserved bungalow.
+
+    The bungalow is occupied, and its first ticket assigned, in a single
+    transaction. Events are sent only once everything has been stored.
+    """
     product = product_service.get_product(line_item.product_id)
 
     ticket_category_id = TicketCategoryID(
@@ -79,10 +83,32 @@ def on_payment(
     ticket_category = ticket_category_service.get_category(ticket_category_id)
 
     ticket_bundle = _create_ticket_bundle(
-        order, line_item, ticket_category, ticket_quantity, initiator
+        order, ticket_category, ticket_quantity, initiator
     )
 
-    _occupy_bungalow(line_item, ticket_bundle)
+    occupation_result = _occupy_bungalow(line_item, ticket_bundle)
+
+    # Record both the ticket bundle and the consumed reservation with a
+    # single update. Keep the bundle even if the bungalow could not be
+    # occupied, so that it can be revoked on cancellation.
+    data = line_item.processing_result
+    data['ticket_bundle_id'] = str(ticket_bundle.id)
+    if occupation_result.is_ok():
+        del data['bungalow_reservation_id']
+    order_command_service.update_line_item_processing_result(line_item.id, data)
+
+    tickets_sold_event = order_event_service.create_tickets_sold_event(
+        order, initiator, ticket_category, order.placed_by, ticket_quantity
+    )
+    order_event_service.send_tickets_sold_event(tickets_sold_event)
+
+    match occupation_result:
+        case Ok(bungalow_occupied_event):
+            bungalow_signals.bungalow_occupied.send(
+                None, event=bungalow_occupied_event
+            )
+        case Err(e):
+            return Err(e)
 
     return Ok(None)
 
@@ -123,7 +149,6 @@ def on_cancellation_after_payment(
 
 def _create_ticket_bundle(
     order: PaidOrder,
-    line_item: LineItem,
     ticket_category: TicketCategory,
     ticket_quantity: int,
     initiator: User,
@@ -140,15 +165,6 @@ def _create_ticket_bundle(
     )
     _create_creation_order_log_entry(order.id, bundle)
 
-    data = line_item.processing_result
-    data['ticket_bundle_id'] = str(bundle.id)
-    order_command_service.update_line_item_processing_result(line_item.id, data)
-
-    tickets_sold_event = order_event_service.create_tickets_sold_event(
-        order, initiator, ticket_category, owner, ticket_quantity
-    )
-    order_event_service.send_tickets_sold_event(tickets_sold_event)
-
     if not ticket_service.uses_any_ticket_for_party(
         owner.id, ticket_category.party_id
     ):
@@ -175,7 +191,7 @@ def _create_creation_order_log_entry(
 
 def _occupy_bungalow(
     line_item: LineItem, ticket_bundle: TicketBundle
-) -> Result[None, OrderActionFailedError]:
+) -> Result[BungalowOccupiedEvent, OrderActionFailedError]:
     """Occupy reserved bungalow."""
     reservation_id_str = line_item.processing_result['bungalow_reservation_id']
     reservation_id = ReservationID(UUID(reservation_id_str))
@@ -189,13 +205,14 @@ def _occupy_bungalow(
             occupancy_id,
             ticket_bundle,
             ticket_bundle.owned_by,
+            assign_first_ticket_to_main_occupant=True,
         )
         if occupation_result.is_err():
             return Err(
                 OrderActionFailedError('Bungalow konnte nicht belegt werden.')
             )
 
-        occupancy, bungalow_occupied_event = occupation_result.unwrap()
+        _, bungalow_occupied_event = occupation_result.unwrap()
     except ValueError as e:
         return Err(
             OrderActionFailedError(
@@ -203,15 +220,7 @@ def _occupy_bungalow(
             )
         )
 
-    data = line_item.processing_result
-    del data['bungalow_reservation_id']
-    order_command_service.update_line_item_processing_result(line_item.id, data)
-
-    bungalow_signals.bungalow_occupied.send(None, event=bungalow_occupied_event)
-
-    bungalow_service.assign_first_ticket_to_main_occupant(occupancy)
-
-    return Ok(None)
+    return Ok(bungalow_occupied_event)
 
 
 def _revoke_ticket_bundle(
@@ -246,6 +255,11 @@ def _release_bungalow(
     occupancy_id_str = line_item.processing_result['bungalow_occupancy_id']
     occupancy_id = OccupancyID(UUID(occupancy_id_str))
 
+    if bungalow_occupancy_service.find_occupancy(occupancy_id) is None:
+        # The bungalow has already been released, e.g. along with those
+        # of other orders canceled in bulk.
+        return Ok(None)
+
     match bungalow_occupancy_service.release_bungalow(occupancy_id, initiator):
         case Ok(bungalow_released_event):
             bungalow_signals.bungalow_released.send(
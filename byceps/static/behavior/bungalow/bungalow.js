@@ -22,3 +22,102 @@ onDomReady(() => {
     });
   });
 });
+
+
+// Keep in sync with the colors in `site/bungalow/_map.html`.
+const BUNGALOW_STATE_COLORS = {
+  'available': '#11aa22',
+  'occupied': '#ee3322',
+  'reserved': '#eecc00',
+};
+
+function applyBungalowBoardChange(change) {
+  document.querySelectorAll('.map .bungalow-' + change.number).forEach(function(elem) {
+    elem.style.color = BUNGALOW_STATE_COLORS[change.state];
+  });
+
+  const rowElem = document.getElementById('bungalow-' + change.number);
+  if (rowElem === null) {
+    return;
+  }
+
+  const stateCellElem = rowElem.querySelector('.bungalow-state-column');
+  const stateTagTemplateElem = document.getElementById('bungalow-state-tag-' + change.state);
+  if ((stateCellElem !== null) && (stateTagTemplateElem !== null)) {
+    stateCellElem.replaceChildren(stateTagTemplateElem.content.cloneNode(true));
+  }
+
+  if (change.state === 'available') {
+    restoreBungalowOffer(rowElem);
+  } else {
+    rowElem.querySelectorAll('.bungalow-order-button').forEach(function(buttonElem) {
+      buttonElem.replaceWith(createNotOrderableNotice());
+    });
+  }
+
+  const titleElem = rowElem.querySelector('.bungalow-title');
+  if (titleElem !== null) {
+    // Keep in sync with the fallback in `site/bungalow/_list.html`.
+    titleElem.textContent = change.title || 'namenlos';
+  }
+
+  const avatarElem = rowElem.querySelector('.avatar img');
+  if ((avatarElem !== null) && change.avatar_url) {
+    avatarElem.src = change.avatar_url;
+  }
+}
+
+// Show the price and, if the bungalow can be ordered, the order button
+// again in place of the occupation details.
+function restoreBungalowOffer(rowElem) {
+  if (rowElem.querySelector('.bungalow-order-button') !== null) {
+    return;
+  }
+
+  const priceCellElem = document.createElement('td');
+  priceCellElem.classList.add('bungalow-detail', 'nowrap', 'number');
+  priceCellElem.textContent = rowElem.dataset.price;
+
+  const orderCellElem = document.createElement('td');
+  orderCellElem.classList.add('bungalow-detail', 'nowrap', 'number');
+
+  const buttonTemplateElem = document.getElementById('bungalow-order-button');
+  if (rowElem.dataset.orderUrl && (buttonTemplateElem !== null)) {
+    const buttonFragment = buttonTemplateElem.content.cloneNode(true);
+    buttonFragment.querySelector('a').href = rowElem.dataset.orderUrl;
+    orderCellElem.appendChild(buttonFragment);
+  } else if (rowElem.dataset.preselection !== undefined) {
+    orderCellElem.appendChild(createNotOrderableNotice());
+  }
+
+  rowElem.querySelectorAll('.bungalow-detail').forEach(function(cellElem) {
+    cellElem.remove();
+  });
+  rowElem.append(priceCellElem, orderCellElem);
+}
+
+function createNotOrderableNotice() {
+  const noticeElem = document.createElement('span');
+  noticeElem.classList.add('dimmed');
+  noticeElem.textContent = 'derzeit nicht buchbar';
+  return noticeElem;
+}
+
+onDomReady(() => {
+  const boardElem = document.querySelector('[data-board-changes-url]');
+  if ((boardElem === null) || !window.EventSource) {
+    return;
+  }
+
+  const source = new EventSource(boardElem.dataset.boardChangesUrl);
+
+  source.addEventListener('message', function(event) {
+    applyBungalowBoardChange(JSON.parse(event.data));
+  });
+
+  // Changes might have been missed, so the board has to be reloaded.
+  source.addEventListener('reload', function() {
+    source.close();
+    window.location.reload();
+  });
+});
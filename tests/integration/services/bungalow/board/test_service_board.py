@@ -0,0 +1,68 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import pytest
+
+from byceps.services.bungalow import (
+    bungalow_board_service,
+    bungalow_occupancy_service,
+)
+from byceps.services.bungalow.models.board import BungalowBoardEntry
+from byceps.services.bungalow.models.bungalow import BungalowOccupationState
+from byceps.services.party.models import Party
+from byceps.services.user.models import User
+
+from tests.integration.services.bungalow.helpers import (
+    occupy_reserved_bungalow,
+    reserve_bungalow,
+)
+
+
+@pytest.fixture(scope='module')
+def occupier(admin_app, make_user) -> User:
+    return make_user()
+
+
+def test_entry_follows_occupation(
+    site_app, party: Party, make_bungalow, occupier: User, make_ticket_bundle
+):
+    bungalow = make_bungalow()
+    ticket_bundle = make_ticket_bundle(ticket_quantity=4)
+
+    bungalow_board_service.rebuild_entries(party.id)
+
+    entry = _get_entry(party, bungalow.number)
+    assert entry.occupation_state == BungalowOccupationState.available
+    assert entry.occupier_id is None
+
+    reservation_id, occupancy_id = reserve_bungalow(bungalow.id, occupier)
+
+    entry = _get_entry(party, bungalow.number)
+    assert entry.occupation_state == BungalowOccupationState.reserved
+    assert entry.occupancy_id == occupancy_id
+    assert entry.occupier_id == occupier.id
+    assert entry.occupier_screen_name == occupier.screen_name
+
+    occupy_reserved_bungalow(
+        reservation_id, occupancy_id, ticket_bundle, occupier
+    )
+
+    entry = _get_entry(party, bungalow.number)
+    assert entry.occupation_state == BungalowOccupationState.occupied
+    assert entry.ticket_bundle_id == ticket_bundle.id
+    assert entry.total_slots == 4
+
+    bungalow_occupancy_service.release_bungalow(occupancy_id, occupier).unwrap()
+
+    entry = _get_entry(party, bungalow.number)
+    assert entry.occupation_state == BungalowOccupationState.available
+    assert entry.occupancy_id is None
+    assert entry.occupier_id is None
+    assert entry.total_slots == 0
+
+
+def _get_entry(party: Party, number: int) -> BungalowBoardEntry:
+    entries = bungalow_board_service.get_entries_for_party(party.id)
+    return next(entry for entry in entries if entry.number == number)
@@ -3,13 +3,26 @@
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
-from byceps.services.bungalow import bungalow_occupancy_service
+from collections.abc import Iterator
+from contextlib import contextmanager
+from uuid import UUID
+
+import psycopg
+from sqlalchemy import event
+
+from byceps.database import db
+from byceps.services.bungalow import (
+    bungalow_invalidation_service,
+    bungalow_occupancy_service,
+)
 from byceps.services.bungalow.models.bungalow import BungalowID
 from byceps.services.bungalow.models.occupation import (
     BungalowOccupancy,
     OccupancyID,
     ReservationID,
 )
+from byceps.services.shop.order.models.order import Order, Orderer
+from byceps.services.shop.storefront.models import Storefront
 from byceps.services.ticketing.models.ticket import TicketBundle
 from byceps.services.user.models import User
 
@@ -24,6 +37,37 @@ def reserve_bungalow(
     return reservation.id, occupancy.id
 
 
+def place_bungalow_order(
+    storefront: Storefront,
+    reservation_id: ReservationID,
+    occupancy_id: OccupancyID,
+    orderer: Orderer,
+    *,
+    request_key: UUID | None = None,
+) -> Order:
+    order, _ = (
+        bungalow_occupancy_service.place_bungalow_with_preselection_order(
+            storefront,
+            reservation_id,
+            occupancy_id,
+            orderer,
+            request_key=request_key,
+        ).unwrap()
+    )
+
+    return order
+
+
+def reserve_and_order_bungalow(
+    storefront: Storefront, bungalow_id: BungalowID, orderer: Orderer
+) -> Order:
+    reservation_id, occupancy_id = reserve_bungalow(bungalow_id, orderer.user)
+
+    return place_bungalow_order(
+        storefront, reservation_id, occupancy_id, orderer
+    )
+
+
 def occupy_reserved_bungalow(
     reservation_id: ReservationID,
     occupancy_id: OccupancyID,
@@ -35,3 +79,31 @@ def occupy_reserved_bungalow(
     ).unwrap()
 
     return occupancy
+
+
+@contextmanager
+def count_queries() -> Iterator[list[str]]:
+    """Collect the SQL statements executed within the block."""
+    statements: list[str] = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', collect)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', collect)
+
+
+def listen_for_bungalow_changes() -> psycopg.Connection:
+    """Open a separate connection that listens for notifications about
+    changed bungalows.
+    """
+    url = db.engine.url.set(drivername='postgresql')
+    conninfo = url.render_as_string(hide_password=False)
+
+    connection = psycopg.connect(conninfo, autocommit=True)
+    connection.execute(f'LISTEN {bungalow_invalidation_service.CHANNEL}')
+
+    return connection
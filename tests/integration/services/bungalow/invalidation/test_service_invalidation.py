@@ -0,0 +1,63 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import json
+
+from byceps.database import db
+from byceps.services.bungalow import (
+    bungalow_invalidation_service,
+    bungalow_offer_service,
+)
+
+from tests.integration.services.bungalow.helpers import (
+    listen_for_bungalow_changes,
+)
+
+
+def test_committed_change_is_announced(site_app, make_bungalow):
+    bungalow = make_bungalow()
+
+    with listen_for_bungalow_changes() as connection:
+        bungalow_offer_service.set_distributes_network_flag(bungalow.id)
+
+        notifications = list(connection.notifies(timeout=5, stop_after=1))
+
+    assert len(notifications) == 1
+    assert json.loads(notifications[0].payload) == {
+        'party_id': bungalow.party_id,
+        'bungalow_ids': [str(bungalow.id)],
+    }
+
+
+def test_rolled_back_change_is_not_announced(site_app, make_bungalow):
+    bungalow = make_bungalow()
+
+    with listen_for_bungalow_changes() as connection:
+        bungalow_invalidation_service.notify_bungalows_changed(
+            bungalow.party_id, [bungalow.id]
+        )
+        db.session.rollback()
+
+        notifications = list(connection.notifies(timeout=1, stop_after=1))
+
+    assert notifications == []
+
+
+def test_deferred_notifications_are_combined(site_app, make_bungalow):
+    bungalow1 = make_bungalow()
+    bungalow2 = make_bungalow()
+
+    with listen_for_bungalow_changes() as connection:
+        with bungalow_invalidation_service.deferred_notifications():
+            bungalow_offer_service.set_distributes_network_flag(bungalow1.id)
+            bungalow_offer_service.set_distributes_network_flag(bungalow2.id)
+
+        notifications = list(connection.notifies(timeout=2, stop_after=2))
+
+    assert len(notifications) == 1
+    assert json.loads(notifications[0].payload) == {
+        'party_id': bungalow1.party_id,
+        'bungalow_ids': sorted([str(bungalow1.id), str(bungalow2.id)]),
+    }
@@ -0,0 +1,138 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from byceps.services.brand.models import Brand
+from byceps.services.bungalow import bungalow_log_service
+from byceps.services.bungalow.models.log import BungalowLogEntryCursor
+from byceps.services.party.models import Party
+from byceps.services.user.models import User
+
+
+BASE_TIME = datetime(2026, 5, 1, 18, 0, 0)
+
+
+@pytest.fixture(scope='module')
+def log_party(bungalows_brand: Brand, make_party) -> Party:
+    return make_party(bungalows_brand)
+
+
+@pytest.fixture(scope='module')
+def user1(make_user) -> User:
+    return make_user()
+
+
+@pytest.fixture(scope='module')
+def user2(make_user) -> User:
+    return make_user()
+
+
+@pytest.fixture(scope='module')
+def bungalow(
+    log_party: Party, bungalow_category, make_bungalow, user1, user2
+):
+    bungalow = make_bungalow(
+        party_id=log_party.id, bungalow_category_id=bungalow_category.id
+    )
+
+    for minutes, event_type, initiator in [
+        (0, 'bungalow-reserved', user1),
+        (1, 'bungalow-released', user2),
+        (2, 'bungalow-reserved', user2),
+        (3, 'bungalow-occupied', user1),
+        (4, 'manager-appointed', user1),
+    ]:
+        bungalow_log_service.create_entry(
+            event_type,
+            log_party.id,
+            bungalow.id,
+            {'initiator_id': str(initiator.id)},
+            occurred_at=BASE_TIME + timedelta(minutes=minutes),
+        )
+
+    return bungalow
+
+
+def test_get_latest_entries_for_bungalow(site_app, bungalow):
+    entries = bungalow_log_service.get_entries_for_bungalow(
+        bungalow.id, limit=2
+    )
+    assert get_minutes(entries) == [3, 4]
+
+    before = BungalowLogEntryCursor.for_entry(entries[0])
+    entries = bungalow_log_service.get_entries_for_bungalow(
+        bungalow.id, limit=2, before=before
+    )
+    assert get_minutes(entries) == [1, 2]
+
+
+def test_get_entries_for_party_paginated(
+    site_app, log_party: Party, bungalow
+):
+    page1 = bungalow_log_service.get_entries_for_party(log_party.id, 3)
+    assert get_minutes(page1) == [4, 3, 2]
+
+    before = BungalowLogEntryCursor.for_entry(page1[-1])
+    page2 = bungalow_log_service.get_entries_for_party(
+        log_party.id, 3, before=before
+    )
+    assert get_minutes(page2) == [1, 0]
+
+
+def test_get_entries_for_party_by_event_type(
+    site_app, log_party: Party, bungalow
+):
+    entries = bungalow_log_service.get_entries_for_party(
+        log_party.id, 10, event_type='bungalow-reserved'
+    )
+    assert get_minutes(entries) == [2, 0]
+
+
+def test_get_entries_for_party_by_initiator(
+    site_app, log_party: Party, bungalow, user2: User
+):
+    entries = bungalow_log_service.get_entries_for_party(
+        log_party.id, 10, initiator_id=user2.id
+    )
+    assert get_minutes(entries) == [2, 1]
+
+
+def test_get_entries_for_party_excludes_other_parties(
+    site_app,
+    bungalows_brand: Brand,
+    make_party,
+    bungalow_category,
+    make_bungalow,
+    log_party: Party,
+    bungalow,
+    user1: User,
+):
+    other_party = make_party(bungalows_brand)
+    other_bungalow = make_bungalow(
+        party_id=other_party.id, bungalow_category_id=bungalow_category.id
+    )
+    bungalow_log_service.create_entry(
+        'bungalow-reserved',
+        other_party.id,
+        other_bungalow.id,
+        {'initiator_id': str(user1.id)},
+        occurred_at=BASE_TIME + timedelta(minutes=5),
+    )
+
+    entries = bungalow_log_service.get_entries_for_party(log_party.id, 10)
+    assert get_minutes(entries) == [4, 3, 2, 1, 0]
+
+    entries = bungalow_log_service.get_entries_for_party(other_party.id, 10)
+    assert get_minutes(entries) == [5]
+
+
+# helpers
+
+
+def get_minutes(entries) -> list[int]:
+    return [entry.occurred_at.minute for entry in entries]
@@ -0,0 +1,258 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from byceps.database import db
+from byceps.services.bungalow import (
+    bungalow_category_service,
+    bungalow_occupancy_service,
+    bungalow_service,
+)
+from byceps.services.bungalow.dbmodels.occupancy import DbBungalowOccupancy
+from byceps.services.bungalow.models.bungalow import BungalowOccupationState
+from byceps.services.bungalow.models.category import BungalowCategory
+from byceps.services.bungalow.models.occupation import OccupancyID
+from byceps.services.party.models import Party
+from byceps.services.shop.shop.models import Shop
+from byceps.services.user.models import User
+
+from tests.helpers import generate_token
+from tests.integration.services.bungalow.helpers import reserve_bungalow
+
+
+def test_swap_occupancies(site_app, make_bungalow, make_user, admin_user):
+    occupier1: User = make_user()
+    occupier2: User = make_user()
+
+    db_bungalow1 = make_bungalow()
+    db_bungalow2 = make_bungalow()
+    reservation_id1, occupancy_id1 = reserve_bungalow(
+        db_bungalow1.id, occupier1
+    )
+    reservation_id2, occupancy_id2 = reserve_bungalow(
+        db_bungalow2.id, occupier2
+    )
+
+    events = bungalow_occupancy_service.move_occupancies(
+        {occupancy_id1: db_bungalow2.id, occupancy_id2: db_bungalow1.id},
+        admin_user,
+    ).unwrap()
+
+    assert {
+        (event.source_bungalow_id, event.target_bungalow_id)
+        for event in events
+    } == {
+        (db_bungalow1.id, db_bungalow2.id),
+        (db_bungalow2.id, db_bungalow1.id),
+    }
+
+    occupancy1 = bungalow_occupancy_service.get_occupancy(
+        occupancy_id1
+    ).unwrap()
+    occupancy2 = bungalow_occupancy_service.get_occupancy(
+        occupancy_id2
+    ).unwrap()
+    assert occupancy1.bungalow_id == db_bungalow2.id
+    assert occupancy2.bungalow_id == db_bungalow1.id
+
+    reservation1 = bungalow_occupancy_service.get_reservation(
+        reservation_id1
+    ).unwrap()
+    reservation2 = bungalow_occupancy_service.get_reservation(
+        reservation_id2
+    ).unwrap()
+    assert reservation1.bungalow_id == db_bungalow2.id
+    assert reservation2.bungalow_id == db_bungalow1.id
+
+
+def test_move_occupancies_in_cycle(
+    site_app, make_bungalow, make_user, admin_user
+):
+    occupier1: User = make_user()
+    occupier2: User = make_user()
+    occupier3: User = make_user()
+
+    db_bungalow1 = make_bungalow()
+    db_bungalow2 = make_bungalow()
+    db_bungalow3 = make_bungalow()
+    _, occupancy_id1 = reserve_bungalow(db_bungalow1.id, occupier1)
+    _, occupancy_id2 = reserve_bungalow(db_bungalow2.id, occupier2)
+    _, occupancy_id3 = reserve_bungalow(db_bungalow3.id, occupier3)
+
+    # 1 -> 2, 2 -> 3, 3 -> 1; every target is vacated within the plan.
+    bungalow_occupancy_service.move_occupancies(
+        {
+            occupancy_id1: db_bungalow2.id,
+            occupancy_id2: db_bungalow3.id,
+            occupancy_id3: db_bungalow1.id,
+        },
+        admin_user,
+    ).unwrap()
+
+    bungalow1, bungalow2, bungalow3 = bungalow_service.get_bungalows(
+        [db_bungalow1.id, db_bungalow2.id, db_bungalow3.id]
+    )
+    assert bungalow1.occupation_state == BungalowOccupationState.reserved
+    assert bungalow1.occupancy.id == occupancy_id3
+    assert bungalow2.occupation_state == BungalowOccupationState.reserved
+    assert bungalow2.occupancy.id == occupancy_id1
+    assert bungalow3.occupation_state == BungalowOccupationState.reserved
+    assert bungalow3.occupancy.id == occupancy_id2
+
+
+def test_move_occupancies_in_chain_into_available_bungalow(
+    site_app, make_bungalow, make_user, admin_user
+):
+    occupier1: User = make_user()
+    occupier2: User = make_user()
+
+    db_bungalow1 = make_bungalow()
+    db_bungalow2 = make_bungalow()
+    db_bungalow3 = make_bungalow()
+    _, occupancy_id1 = reserve_bungalow(db_bungalow1.id, occupier1)
+    _, occupancy_id2 = reserve_bungalow(db_bungalow2.id, occupier2)
+
+    # 1 -> 2, 2 -> 3; bungalow 1 is vacated.
+    bungalow_occupancy_service.move_occupancies(
+        {occupancy_id1: db_bungalow2.id, occupancy_id2: db_bungalow3.id},
+        admin_user,
+    ).unwrap()
+
+    bungalow1, bungalow2, bungalow3 = bungalow_service.get_bungalows(
+        [db_bungalow1.id, db_bungalow2.id, db_bungalow3.id]
+    )
+    assert bungalow1.occupation_state == BungalowOccupationState.available
+    assert bungalow1.occupancy is None
+    assert bungalow2.occupation_state == BungalowOccupationState.reserved
+    assert bungalow2.occupancy.id == occupancy_id1
+    assert bungalow3.occupation_state == BungalowOccupationState.reserved
+    assert bungalow3.occupancy.id == occupancy_id2
+
+
+def test_move_occupancies_moves_none_if_a_target_is_occupied(
+    site_app, make_bungalow, make_user, admin_user
+):
+    occupier1: User = make_user()
+    occupier2: User = make_user()
+    occupier3: User = make_user()
+
+    db_bungalow1 = make_bungalow()
+    db_bungalow2 = make_bungalow()
+    db_bungalow3 = make_bungalow()
+    db_bungalow4 = make_bungalow()
+    _, occupancy_id1 = reserve_bungalow(db_bungalow1.id, occupier1)
+    _, occupancy_id2 = reserve_bungalow(db_bungalow2.id, occupier2)
+    reserve_bungalow(db_bungalow3.id, occupier3)
+
+    # Bungalow 3 stays occupied as its occupancy is not part of the plan.
+    result = bungalow_occupancy_service.move_occupancies(
+        {occupancy_id1: db_bungalow4.id, occupancy_id2: db_bungalow3.id},
+        admin_user,
+    )
+
+    assert result.is_err()
+
+    occupancy1 = bungalow_occupancy_service.get_occupancy(
+        occupancy_id1
+    ).unwrap()
+    assert occupancy1.bungalow_id == db_bungalow1.id
+
+
+def test_move_occupancies_rejects_shared_target(
+    site_app, make_bungalow, make_user, admin_user
+):
+    occupier1: User = make_user()
+    occupier2: User = make_user()
+
+    db_bungalow1 = make_bungalow()
+    db_bungalow2 = make_bungalow()
+    db_bungalow3 = make_bungalow()
+    _, occupancy_id1 = reserve_bungalow(db_bungalow1.id, occupier1)
+    _, occupancy_id2 = reserve_bungalow(db_bungalow2.id, occupier2)
+
+    result = bungalow_occupancy_service.move_occupancies(
+        {occupancy_id1: db_bungalow3.id, occupancy_id2: db_bungalow3.id},
+        admin_user,
+    )
+
+    assert result.is_err()
+
+
+def test_move_occupancies_rejects_pinned_occupancy(
+    site_app, make_bungalow, make_user, admin_user
+):
+    occupier1: User = make_user()
+    occupier2: User = make_user()
+
+    db_bungalow1 = make_bungalow()
+    db_bungalow2 = make_bungalow()
+    _, occupancy_id1 = reserve_bungalow(db_bungalow1.id, occupier1)
+    _, occupancy_id2 = reserve_bungalow(db_bungalow2.id, occupier2)
+    _pin_occupancy(occupancy_id2)
+
+    result = bungalow_occupancy_service.move_occupancies(
+        {occupancy_id1: db_bungalow2.id, occupancy_id2: db_bungalow1.id},
+        admin_user,
+    )
+
+    assert result.is_err()
+    _assert_occupancy_in_bungalow(occupancy_id1, db_bungalow1.id)
+    _assert_occupancy_in_bungalow(occupancy_id2, db_bungalow2.id)
+
+
+def test_move_occupancies_rejects_ticket_category_mismatch(
+    site_app,
+    party: Party,
+    shop: Shop,
+    bungalow_category: BungalowCategory,
+    make_bungalow,
+    make_ticket_category,
+    make_product,
+    make_user,
+    admin_user,
+):
+    other_ticket_category = make_ticket_category(
+        party.id, f'VIP {generate_token()}'
+    )
+    other_category = bungalow_category_service.create_category(
+        party.id,
+        f'VIP {generate_token()}',
+        bungalow_category.capacity,
+        other_ticket_category.id,
+        make_product(shop.id).id,
+    )
+
+    occupier1: User = make_user()
+    occupier2: User = make_user()
+
+    db_bungalow1 = make_bungalow()
+    db_bungalow2 = make_bungalow()
+    db_bungalow3 = make_bungalow()
+    db_other_bungalow = make_bungalow(bungalow_category_id=other_category.id)
+    _, occupancy_id1 = reserve_bungalow(db_bungalow1.id, occupier1)
+    _, occupancy_id2 = reserve_bungalow(db_bungalow2.id, occupier2)
+
+    # The first move is valid on its own, but the second is not.
+    result = bungalow_occupancy_service.move_occupancies(
+        {occupancy_id1: db_bungalow3.id, occupancy_id2: db_other_bungalow.id},
+        admin_user,
+    )
+
+    assert result.is_err()
+    _assert_occupancy_in_bungalow(occupancy_id1, db_bungalow1.id)
+    _assert_occupancy_in_bungalow(occupancy_id2, db_bungalow2.id)
+
+
+# helpers
+
+
+def _pin_occupancy(occupancy_id: OccupancyID) -> None:
+    db_occupancy = db.session.get(DbBungalowOccupancy, occupancy_id)
+    db_occupancy.pinned = True
+    db.session.commit()
+
+
+def _assert_occupancy_in_bungalow(occupancy_id, bungalow_id) -> None:
+    occupancy = bungalow_occupancy_service.get_occupancy(occupancy_id).unwrap()
+    assert occupancy.bungalow_id == bungalow_id
@@ -0,0 +1,173 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from byceps.services.bungalow import (
+    bungalow_occupancy_repository,
+    bungalow_occupancy_service,
+    bungalow_order_cancellation_service,
+    bungalow_service,
+)
+from byceps.services.bungalow.models.bungalow import BungalowOccupationState
+from byceps.services.party.models import Party
+from byceps.services.shop.order.models.number import OrderNumber
+from byceps.services.shop.order.models.order import Orderer
+from byceps.services.shop.storefront.models import Storefront
+from byceps.services.user.models import User
+
+from tests.integration.services.bungalow.helpers import (
+    reserve_and_order_bungalow,
+    reserve_bungalow,
+)
+
+
+def test_release_bungalows(site_app, make_bungalow, make_user, admin_user):
+    occupier1: User = make_user()
+    occupier2: User = make_user()
+
+    db_bungalow1 = make_bungalow()
+    db_bungalow2 = make_bungalow()
+    reservation_id1, occupancy_id1 = reserve_bungalow(
+        db_bungalow1.id, occupier1
+    )
+    reservation_id2, occupancy_id2 = reserve_bungalow(
+        db_bungalow2.id, occupier2
+    )
+
+    events = bungalow_occupancy_service.release_bungalows(
+        {db_bungalow1.id, db_bungalow2.id}, admin_user
+    ).unwrap()
+
+    assert {event.bungalow_id for event in events} == {
+        db_bungalow1.id,
+        db_bungalow2.id,
+    }
+
+    for bungalow in bungalow_service.get_bungalows(
+        [db_bungalow1.id, db_bungalow2.id]
+    ):
+        assert bungalow.occupation_state == BungalowOccupationState.available
+        assert bungalow.occupancy is None
+
+    for reservation_id in reservation_id1, reservation_id2:
+        reservation = bungalow_occupancy_service.find_reservation(
+            reservation_id
+        )
+        assert reservation is None
+
+    for occupancy_id in occupancy_id1, occupancy_id2:
+        assert bungalow_occupancy_service.find_occupancy(occupancy_id) is None
+
+
+def test_release_bungalows_releases_none_if_any_is_available(
+    site_app, make_bungalow, make_user, admin_user
+):
+    occupier: User = make_user()
+
+    db_reserved_bungalow = make_bungalow()
+    db_available_bungalow = make_bungalow()
+    _, occupancy_id = reserve_bungalow(db_reserved_bungalow.id, occupier)
+
+    result = bungalow_occupancy_service.release_bungalows(
+        {db_reserved_bungalow.id, db_available_bungalow.id}, admin_user
+    )
+
+    assert result.is_err()
+    assert bungalow_occupancy_service.find_occupancy(occupancy_id) is not None
+
+
+def test_cancel_orders_rejects_unknown_order_numbers(
+    site_app, party: Party, admin_user
+):
+    result = bungalow_order_cancellation_service.cancel_orders(
+        party.id,
+        {OrderNumber('DOES-NOT-EXIST-00001')},
+        admin_user,
+        'Zahlungsfrist verstrichen',
+    )
+
+    assert result.is_err()
+
+
+def test_cancel_orders_releases_bungalows_of_canceled_orders(
+    party: Party,
+    storefront: Storefront,
+    make_bungalow,
+    orderer: Orderer,
+    admin_user,
+):
+    db_bungalow1 = make_bungalow()
+    db_bungalow2 = make_bungalow()
+    order_number1 = reserve_and_order_bungalow(
+        storefront, db_bungalow1.id, orderer
+    ).order_number
+    order_number2 = reserve_and_order_bungalow(
+        storefront, db_bungalow2.id, orderer
+    ).order_number
+
+    result = bungalow_order_cancellation_service.cancel_orders(
+        party.id,
+        {order_number1, order_number2},
+        admin_user,
+        'Zahlungsfrist verstrichen',
+    ).unwrap()
+
+    assert result.canceled_order_numbers == sorted(
+        [order_number1, order_number2]
+    )
+    assert result.failed_order_numbers == []
+    assert result.released_bungalow_numbers == sorted(
+        [db_bungalow1.number, db_bungalow2.number]
+    )
+
+    for bungalow in bungalow_service.get_bungalows(
+        [db_bungalow1.id, db_bungalow2.id]
+    ):
+        assert bungalow.occupation_state == BungalowOccupationState.available
+
+
+def test_cancel_orders_releases_bungalows_in_single_transaction(
+    monkeypatch,
+    party: Party,
+    storefront: Storefront,
+    make_bungalow,
+    orderer: Orderer,
+    admin_user,
+):
+    db_bungalows = [make_bungalow() for _ in range(3)]
+    order_numbers = {
+        reserve_and_order_bungalow(
+            storefront, db_bungalow.id, orderer
+        ).order_number
+        for db_bungalow in db_bungalows
+    }
+
+    released_bungalow_id_sets = []
+    release_bungalows = bungalow_occupancy_repository.release_bungalows
+
+    def record_release_bungalows(bungalow_ids, db_log_entries, events):
+        released_bungalow_id_sets.append(set(bungalow_ids))
+        release_bungalows(bungalow_ids, db_log_entries, events)
+
+    def fail_release_bungalow(occupancy_id, initiator):
+        raise AssertionError('Bungalow released on its own')
+
+    monkeypatch.setattr(
+        bungalow_occupancy_repository,
+        'release_bungalows',
+        record_release_bungalows,
+    )
+    monkeypatch.setattr(
+        bungalow_occupancy_service, 'release_bungalow', fail_release_bungalow
+    )
+
+    result = bungalow_order_cancellation_service.cancel_orders(
+        party.id, order_numbers, admin_user, 'Zahlungsfrist verstrichen'
+    ).unwrap()
+
+    assert released_bungalow_id_sets == [
+        {db_bungalow.id for db_bungalow in db_bungalows}
+    ]
+    assert result.canceled_order_numbers == sorted(order_numbers)
+
@@ -7,6 +7,7 @@ from byceps.services.bungalow import bungalow_occupancy_service
 from byceps.services.bungalow.models.bungalow import BungalowOccupationState
 from byceps.services.bungalow.models.occupation import OccupancyState
 from byceps.services.shop.order.models.order import Orderer
+from byceps.services.ticketing import ticket_bundle_service
 
 from tests.integration.services.bungalow.helpers import (
     occupy_reserved_bungalow,
@@ -53,3 +54,30 @@ def test_occupy_reserved_bungalow(
     assert occupancy.state == OccupancyState.occupied
     assert occupancy.ticket_bundle_id is not None
     assert occupancy.manager_id == occupier.id
+
+
+def test_occupy_reserved_bungalow_and_assign_first_ticket(
+    site_app, make_bungalow, make_user, make_ticket_bundle
+):
+    occupier = make_user()
+    ticket_bundle = make_ticket_bundle()
+
+    bungalow = make_bungalow()
+
+    reservation_id, occupancy_id = reserve_bungalow(bungalow.id, occupier)
+
+    bungalow_occupancy_service.occupy_reserved_bungalow(
+        reservation_id,
+        occupancy_id,
+        ticket_bundle,
+        occupier,
+        assign_first_ticket_to_main_occupant=True,
+    ).unwrap()
+
+    db_tickets = sorted(
+        ticket_bundle_service.get_bundle(ticket_bundle.id).tickets,
+        key=lambda ticket: ticket.created_at,
+    )
+
+    assert db_tickets[0].used_by_id == occupier.id
+    assert all(ticket.used_by_id is None for ticket in db_tickets[1:])
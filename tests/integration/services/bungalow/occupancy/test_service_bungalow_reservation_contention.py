@@ -0,0 +1,51 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from byceps.services.bungalow import (
+    bungalow_occupancy_service,
+    bungalow_service,
+)
+from byceps.services.shop.order.models.order import Orderer
+
+
+CONTENDER_COUNT = 200
+
+
+def test_reserve_bungalow_with_contention(
+    site_app, make_bungalow, orderer: Orderer
+):
+    bungalow_id = make_bungalow().id
+    occupier = orderer.user
+
+    barrier = Barrier(CONTENDER_COUNT)
+
+    def reserve() -> bool:
+        with site_app.app_context():
+            barrier.wait()
+
+            result = bungalow_occupancy_service.reserve_bungalow(
+                bungalow_id, occupier
+            )
+
+            return result.is_ok()
+
+    with ThreadPoolExecutor(max_workers=CONTENDER_COUNT) as executor:
+        futures = [executor.submit(reserve) for _ in range(CONTENDER_COUNT)]
+        outcomes = [future.result() for future in futures]
+
+    assert outcomes.count(True) == 1
+    assert outcomes.count(False) == CONTENDER_COUNT - 1
+
+    bungalow = bungalow_service.get_bungalow(bungalow_id)
+    assert bungalow.reserved
+
+    occupancy = bungalow_occupancy_service.find_occupancy_for_bungalow(
+        bungalow_id
+    )
+    assert occupancy is not None
+    assert occupancy.occupied_by_id == occupier.id
@@ -0,0 +1,125 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime, timedelta
+
+from byceps.services.bungalow import bungalow_hold_service
+from byceps.services.bungalow.bungalow_hold_service import (
+    HOLD_MAX_AGE,
+    HOLD_TIME_TO_LIVE,
+)
+from byceps.services.user.models import User
+
+from tests.integration.services.bungalow.helpers import reserve_bungalow
+
+
+NOW = datetime(2026, 8, 14, 18, 0, 0)
+
+
+def test_hold_keeps_other_users_out_until_it_expires(
+    site_app, make_bungalow, make_user
+):
+    user1: User = make_user()
+    user2: User = make_user()
+    bungalow = make_bungalow()
+
+    held_until = bungalow_hold_service.hold_bungalow(
+        bungalow.id, bungalow.party_id, user1.id, NOW
+    ).unwrap()
+    assert held_until == NOW + HOLD_TIME_TO_LIVE
+
+    later = NOW + timedelta(minutes=1)
+
+    result = bungalow_hold_service.hold_bungalow(
+        bungalow.id, bungalow.party_id, user2.id, later
+    )
+    assert result.is_err()
+    assert bungalow_hold_service.is_bungalow_held_by_another_user(
+        bungalow.id, user2.id, later
+    )
+    assert not bungalow_hold_service.is_bungalow_held_by_another_user(
+        bungalow.id, user1.id, later
+    )
+    assert bungalow_hold_service.get_holders_by_bungalow_id(
+        bungalow.party_id, later
+    ) == {bungalow.id: user1.id}
+
+    expired = held_until + timedelta(seconds=1)
+
+    assert (
+        bungalow_hold_service.get_holders_by_bungalow_id(
+            bungalow.party_id, expired
+        )
+        == {}
+    )
+    assert bungalow_hold_service.hold_bungalow(
+        bungalow.id, bungalow.party_id, user2.id, expired
+    ).is_ok()
+
+
+def test_hold_is_not_extended_beyond_its_maximum_age(
+    site_app, make_bungalow, make_user
+):
+    user: User = make_user()
+    bungalow = make_bungalow()
+
+    bungalow_hold_service.hold_bungalow(
+        bungalow.id, bungalow.party_id, user.id, NOW
+    ).unwrap()
+
+    # Showing the form again extends the hold, but not past its
+    # maximum age.
+    for minutes in 4, 8, 12:
+        later = NOW + timedelta(minutes=minutes)
+        held_until = bungalow_hold_service.hold_bungalow(
+            bungalow.id, bungalow.party_id, user.id, later
+        ).unwrap()
+        assert held_until == min(later + HOLD_TIME_TO_LIVE, NOW + HOLD_MAX_AGE)
+
+    assert held_until == NOW + HOLD_MAX_AGE
+
+    # Once expired, the bungalow can be held anew.
+    expired = NOW + HOLD_MAX_AGE
+    held_until = bungalow_hold_service.hold_bungalow(
+        bungalow.id, bungalow.party_id, user.id, expired
+    ).unwrap()
+    assert held_until == expired + HOLD_TIME_TO_LIVE
+
+
+def test_user_holds_at_most_one_bungalow(site_app, make_bungalow, make_user):
+    user: User = make_user()
+    bungalow1 = make_bungalow()
+    bungalow2 = make_bungalow()
+
+    bungalow_hold_service.hold_bungalow(
+        bungalow1.id, bungalow1.party_id, user.id, NOW
+    ).unwrap()
+    bungalow_hold_service.hold_bungalow(
+        bungalow2.id, bungalow2.party_id, user.id, NOW
+    ).unwrap()
+
+    assert bungalow_hold_service.get_holders_by_bungalow_id(
+        bungalow1.party_id, NOW
+    ) == {bungalow2.id: user.id}
+
+
+def test_reservation_releases_hold(site_app, make_bungalow, make_user):
+    user: User = make_user()
+    bungalow = make_bungalow()
+
+    now = datetime.utcnow()
+
+    bungalow_hold_service.hold_bungalow(
+        bungalow.id, bungalow.party_id, user.id, now
+    ).unwrap()
+
+    reserve_bungalow(bungalow.id, user)
+
+    assert (
+        bungalow_hold_service.get_holders_by_bungalow_id(
+            bungalow.party_id, now
+        )
+        == {}
+    )
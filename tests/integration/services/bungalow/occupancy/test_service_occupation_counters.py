@@ -0,0 +1,133 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from byceps.services.bungalow import (
+    bungalow_category_service,
+    bungalow_occupancy_service,
+    bungalow_occupation_counter_repository,
+    bungalow_stats_service,
+)
+from byceps.services.party.models import Party
+from byceps.services.shop.order.models.order import Orderer
+from byceps.services.shop.product.models import Product
+from byceps.services.user.models import User
+
+from tests.helpers import generate_token
+from tests.integration.services.bungalow.helpers import (
+    occupy_reserved_bungalow,
+    reserve_bungalow,
+)
+
+
+def test_occupation_counters_follow_state_changes(
+    party: Party,
+    make_bungalow,
+    admin_user: User,
+    orderer: Orderer,
+    make_ticket_bundle,
+):
+    ticket_bundle = make_ticket_bundle()
+
+    bungalow = make_bungalow()
+
+    # The bungalow has been created without updating the counters.
+    bungalow_stats_service.rebuild_occupation_counters(party.id)
+
+    totals_before = get_totals(party)
+
+    reservation_id, occupancy_id = reserve_bungalow(bungalow.id, orderer.user)
+
+    assert_totals_changed(totals_before, get_totals(party), -1, 1, 0)
+
+    occupy_reserved_bungalow(
+        reservation_id, occupancy_id, ticket_bundle, admin_user
+    )
+
+    assert_totals_changed(totals_before, get_totals(party), -1, 0, 1)
+
+    bungalow_occupancy_service.release_bungalow(
+        occupancy_id, admin_user
+    ).unwrap()
+
+    assert get_totals(party) == totals_before
+
+    bungalow_stats_service.rebuild_occupation_counters(party.id)
+
+    assert get_totals(party) == totals_before
+
+
+def test_occupation_counters_follow_ticket_category_change(
+    party: Party,
+    make_ticket_category,
+    bungalow_product: Product,
+    make_bungalow,
+    orderer: Orderer,
+):
+    ticket_category1 = make_ticket_category(
+        party.id, f'Standard {generate_token()}'
+    )
+    ticket_category2 = make_ticket_category(
+        party.id, f'Komfort {generate_token()}'
+    )
+    category = bungalow_category_service.create_category(
+        party.id,
+        f'Komfort {generate_token()}',
+        4,
+        ticket_category1.id,
+        bungalow_product.id,
+    )
+
+    reserved_bungalow = make_bungalow(bungalow_category_id=category.id)
+    make_bungalow(bungalow_category_id=category.id)
+    reserve_bungalow(reserved_bungalow.id, orderer.user)
+
+    bungalow_stats_service.rebuild_occupation_counters(party.id)
+
+    bungalow_category_service.update_category(
+        category.id,
+        category.title,
+        category.capacity,
+        ticket_category2.id,
+        category.product.id,
+        category.image_filename,
+        category.image_width,
+        category.image_height,
+    )
+
+    counts = get_counts_by_ticket_category_and_state(party)
+    assert counts.get((ticket_category1.id, 'available'), 0) == 0
+    assert counts.get((ticket_category1.id, 'reserved'), 0) == 0
+    assert counts[ticket_category2.id, 'available'] == 1
+    assert counts[ticket_category2.id, 'reserved'] == 1
+
+    bungalow_stats_service.rebuild_occupation_counters(party.id)
+
+    assert get_counts_by_ticket_category_and_state(party) == counts
+
+
+# helpers
+
+
+def get_totals(party: Party):
+    return bungalow_stats_service.get_occupation_state_totals_for_party(
+        party.id
+    )
+
+
+def assert_totals_changed(before, after, available, reserved, occupied):
+    assert after.available == before.available + available
+    assert after.reserved == before.reserved + reserved
+    assert after.occupied == before.occupied + occupied
+
+
+def get_counts_by_ticket_category_and_state(party: Party):
+    repository = bungalow_occupation_counter_repository
+    rows = repository.get_counts_by_ticket_category_and_state(party.id)
+
+    return {
+        (ticket_category.id, state_name): count
+        for ticket_category, state_name, count in rows
+        if count != 0
+    }
@@ -0,0 +1,161 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from byceps.services.bungalow import (
+    bungalow_occupancy_service,
+    bungalow_order_service,
+)
+from byceps.services.shop.order.models.order import Orderer
+from byceps.services.shop.storefront.models import Storefront
+from byceps.util.uuid import generate_uuid7
+
+from tests.integration.services.bungalow.helpers import place_bungalow_order
+
+
+def test_order_request_is_recorded_with_reservation_and_order(
+    storefront: Storefront, make_bungalow, orderer: Orderer
+):
+    request_key = generate_uuid7()
+    bungalow = make_bungalow()
+
+    assert bungalow_order_service.find_order_request(request_key) is None
+
+    assert _claim(request_key, orderer.user.id) is None
+
+    reservation, occupancy, _ = bungalow_occupancy_service.reserve_bungalow(
+        bungalow.id, orderer.user, request_key=request_key
+    ).unwrap()
+
+    order_request = bungalow_order_service.find_order_request(request_key)
+    assert order_request is not None
+    assert order_request.user_id == orderer.user.id
+    assert order_request.reservation_id == reservation.id
+    assert order_request.occupancy_id == occupancy.id
+    assert order_request.order_id is None
+    assert order_request.order_number is None
+    assert not order_request.concluded
+
+    order = place_bungalow_order(
+        storefront,
+        reservation.id,
+        occupancy.id,
+        orderer,
+        request_key=request_key,
+    )
+    bungalow_order_service.conclude_order_request(request_key)
+
+    order_request = bungalow_order_service.find_order_request(request_key)
+    assert order_request.order_id == order.id
+    assert order_request.order_number == order.order_number
+    assert order_request.concluded
+
+
+def test_key_of_request_concluded_without_reservation_can_be_reclaimed(
+    site_app, orderer: Orderer
+):
+    request_key = generate_uuid7()
+    user_id = orderer.user.id
+
+    assert _claim(request_key, user_id) is None
+    bungalow_order_service.conclude_order_request(request_key)
+
+    assert bungalow_order_service.find_order_request(request_key) is None
+    assert _claim(request_key, user_id) is None
+
+
+def test_repeated_submission_is_answered_while_original_is_processed(
+    site_app, orderer: Orderer
+):
+    request_key = generate_uuid7()
+    user_id = orderer.user.id
+
+    assert _claim(request_key, user_id) is None
+
+    order_request = _claim(request_key, user_id)
+    assert order_request is not None
+    assert not order_request.concluded
+
+    bungalow_order_service.conclude_order_request(request_key)
+
+
+def test_concurrent_submissions_of_same_key_order_once(
+    site_app, storefront: Storefront, make_bungalow, orderer: Orderer
+):
+    request_key = generate_uuid7()
+    bungalow_id = make_bungalow().id
+
+    barrier = Barrier(2)
+
+    def submit():
+        with site_app.app_context():
+            barrier.wait()
+
+            order_request = bungalow_order_service.claim_order_request(
+                request_key, orderer.user.id
+            )
+            if order_request is not None:
+                # Answered from the original request, which might not
+                # have placed its order yet.
+                return order_request.order_id
+
+            try:
+                reservation, occupancy, _ = (
+                    bungalow_occupancy_service.reserve_bungalow(
+                        bungalow_id, orderer.user, request_key=request_key
+                    ).unwrap()
+                )
+
+                order = place_bungalow_order(
+                    storefront,
+                    reservation.id,
+                    occupancy.id,
+                    orderer,
+                    request_key=request_key,
+                )
+
+                return order.id
+            finally:
+                bungalow_order_service.conclude_order_request(request_key)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(submit) for _ in range(2)]
+        order_ids = [future.result() for future in futures]
+
+    placed_order_ids = [
+        order_id for order_id in order_ids if order_id is not None
+    ]
+    assert len(placed_order_ids) >= 1
+    assert len(set(placed_order_ids)) == 1
+
+
+def test_failed_reservation_records_no_reservation_for_request(
+    site_app, make_bungalow, orderer: Orderer, make_user
+):
+    request_key = generate_uuid7()
+    bungalow = make_bungalow()
+
+    bungalow_occupancy_service.reserve_bungalow(
+        bungalow.id, make_user()
+    ).unwrap()
+
+    bungalow_order_service.claim_order_request(request_key, orderer.user.id)
+
+    result = bungalow_occupancy_service.reserve_bungalow(
+        bungalow.id, orderer.user, request_key=request_key
+    )
+    assert result.is_err()
+
+    order_request = bungalow_order_service.find_order_request(request_key)
+    assert order_request.reservation_id is None
+
+
+# helpers
+
+
+def _claim(request_key, user_id):
+    return bungalow_order_service.claim_order_request(request_key, user_id)
@@ -0,0 +1,163 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime, timedelta
+import json
+
+from byceps.services.bungalow import (
+    bungalow_reservation_expiry_service,
+    bungalow_service,
+    bungalow_stats_service,
+)
+from byceps.services.bungalow.models.bungalow import BungalowOccupationState
+from byceps.services.party.models import Party
+from byceps.services.shop.order import order_command_service
+from byceps.services.shop.order.models.order import Orderer
+from byceps.services.shop.storefront.models import Storefront
+from byceps.services.user.models import User
+from byceps.util.result import Err
+
+from tests.integration.services.bungalow.helpers import (
+    listen_for_bungalow_changes,
+    place_bungalow_order,
+    reserve_and_order_bungalow,
+    reserve_bungalow,
+)
+
+
+TTL = timedelta(hours=48)
+
+
+def test_get_expired_reservations(
+    party: Party, storefront: Storefront, make_bungalow, orderer: Orderer
+):
+    ordered_bungalow = make_bungalow()
+    reservation_id, occupancy_id = reserve_bungalow(
+        ordered_bungalow.id, orderer.user
+    )
+    order = place_bungalow_order(
+        storefront, reservation_id, occupancy_id, orderer
+    )
+
+    # A reservation without an order is not tied to a sale.
+    unordered_bungalow = make_bungalow()
+    reserve_bungalow(unordered_bungalow.id, orderer.user)
+
+    now = datetime.utcnow()
+
+    assert reservation_id not in _get_expired_reservation_ids(party, now)
+
+    later = order.created_at + TTL + timedelta(minutes=1)
+    expired_reservations = (
+        bungalow_reservation_expiry_service.get_expired_reservations(
+            party.id, TTL, later
+        )
+    )
+    expired_reservation = next(
+        er for er in expired_reservations if er.reservation_id == reservation_id
+    )
+
+    assert expired_reservation.bungalow_id == ordered_bungalow.id
+    assert expired_reservation.bungalow_number == ordered_bungalow.number
+    assert expired_reservation.order_id == order.id
+    assert expired_reservation.order_number == order.order_number
+
+    assert unordered_bungalow.id not in {
+        er.bungalow_id for er in expired_reservations
+    }
+
+
+def test_cancel_expired_reservations(
+    monkeypatch,
+    party: Party,
+    storefront: Storefront,
+    make_bungalow,
+    orderer: Orderer,
+    admin_user: User,
+):
+    bungalow1 = make_bungalow()
+    bungalow2 = make_bungalow()
+    failing_bungalow = make_bungalow()
+    order1 = reserve_and_order_bungalow(storefront, bungalow1.id, orderer)
+    order2 = reserve_and_order_bungalow(storefront, bungalow2.id, orderer)
+    failing_order = reserve_and_order_bungalow(
+        storefront, failing_bungalow.id, orderer
+    )
+
+    cancel_order = order_command_service.cancel_order
+
+    def cancel_order_unless_failing(order_id, initiator, reason):
+        if order_id == failing_order.id:
+            return Err('Storno fehlgeschlagen')
+        return cancel_order(order_id, initiator, reason)
+
+    monkeypatch.setattr(
+        order_command_service, 'cancel_order', cancel_order_unless_failing
+    )
+
+    bungalow_stats_service.rebuild_occupation_counters(party.id)
+    totals_before = _get_totals(party)
+
+    later = failing_order.created_at + TTL + timedelta(minutes=1)
+
+    with listen_for_bungalow_changes() as connection:
+        result = (
+            bungalow_reservation_expiry_service.cancel_expired_reservations(
+                party.id, TTL, later, admin_user, batch_size=100
+            )
+        )
+
+        notifications = list(connection.notifies(timeout=2, stop_after=2))
+
+    canceled_order_ids = {er.order_id for er in result.canceled}
+    assert {order1.id, order2.id} <= canceled_order_ids
+    assert [er.order_id for er in result.failed] == [failing_order.id]
+    assert result.skipped == []
+
+    for bungalow in bungalow_service.get_bungalows(
+        [bungalow1.id, bungalow2.id]
+    ):
+        assert bungalow.occupation_state == BungalowOccupationState.available
+
+    failing_bungalow = bungalow_service.get_bungalow(failing_bungalow.id)
+    assert failing_bungalow.occupation_state == BungalowOccupationState.reserved
+
+    # One combined notification for the whole batch
+    assert len(notifications) == 1
+    payload = json.loads(notifications[0].payload)
+    changed_bungalow_ids = set(payload['bungalow_ids'])
+    assert {str(bungalow1.id), str(bungalow2.id)} <= changed_bungalow_ids
+    assert str(failing_bungalow.id) not in changed_bungalow_ids
+
+    totals_after = _get_totals(party)
+    assert totals_after.available == totals_before.available + len(
+        result.canceled
+    )
+    assert totals_after.reserved == totals_before.reserved - len(
+        result.canceled
+    )
+
+    bungalow_stats_service.rebuild_occupation_counters(party.id)
+    assert _get_totals(party) == totals_after
+
+
+# helpers
+
+
+def _get_totals(party: Party):
+    return bungalow_stats_service.get_occupation_state_totals_for_party(
+        party.id
+    )
+
+
+def _get_expired_reservation_ids(party: Party, now: datetime) -> set:
+    return {
+        expired_reservation.reservation_id
+        for expired_reservation in (
+            bungalow_reservation_expiry_service.get_expired_reservations(
+                party.id, TTL, now
+            )
+        )
+    }
@@ -0,0 +1,64 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from byceps.database import db
+from byceps.services.bungalow import bungalow_service
+from byceps.services.bungalow.models.bungalow import BungalowID
+
+from tests.integration.services.bungalow.helpers import (
+    count_queries,
+    reserve_bungalow,
+)
+
+
+def test_get_bungalows_issues_fixed_number_of_queries(
+    site_app, make_bungalow, make_user
+):
+    occupier = make_user()
+
+    db_bungalows = [make_bungalow() for _ in range(6)]
+    bungalow_ids = [db_bungalow.id for db_bungalow in db_bungalows]
+
+    # Give some of the bungalows an occupancy, too.
+    for bungalow_id in bungalow_ids[:3]:
+        reserve_bungalow(bungalow_id, occupier)
+
+    query_count_for_one = _count_queries_for_get_bungalows(bungalow_ids[:1])
+    query_count_for_all = _count_queries_for_get_bungalows(bungalow_ids)
+
+    assert query_count_for_one == 2
+    assert query_count_for_all == query_count_for_one
+
+
+def test_get_bungalows_converts_everything(site_app, make_bungalow, make_user):
+    occupier = make_user()
+
+    db_bungalow = make_bungalow()
+    reserve_bungalow(db_bungalow.id, occupier)
+
+    db.session.expunge_all()
+
+    with count_queries() as statements:
+        bungalows = bungalow_service.get_bungalows([db_bungalow.id])
+
+        bungalow = bungalows[0]
+        assert bungalow.category.product.id is not None
+        assert bungalow.category.ticket_category_title is not None
+        assert bungalow.occupancy is not None
+        assert bungalow.occupancy.occupied_by_id == occupier.id
+
+    assert len(statements) == 2
+
+
+def _count_queries_for_get_bungalows(bungalow_ids: list[BungalowID]) -> int:
+    # Start with an empty session so nothing is served from it.
+    db.session.expunge_all()
+
+    with count_queries() as statements:
+        bungalows = bungalow_service.get_bungalows(bungalow_ids)
+
+    assert len(bungalows) == len(bungalow_ids)
+
+    return len(statements)
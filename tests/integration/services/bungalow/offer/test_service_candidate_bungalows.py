@@ -0,0 +1,65 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from byceps.services.bungalow import (
+    bungalow_category_service,
+    bungalow_service,
+)
+from byceps.services.bungalow.models.category import BungalowCategory
+from byceps.services.party.models import Party
+from byceps.services.shop.shop.models import Shop
+from byceps.services.ticketing.models.ticket import TicketCategory
+from byceps.services.user.models import User
+
+from tests.helpers import generate_token
+from tests.integration.services.bungalow.helpers import reserve_bungalow
+
+
+def test_get_candidate_bungalows(
+    site_app,
+    party: Party,
+    shop: Shop,
+    ticket_category: TicketCategory,
+    bungalow_category: BungalowCategory,
+    make_bungalow,
+    make_product,
+    make_user,
+):
+    smaller_category = bungalow_category_service.create_category(
+        party.id,
+        f'Standard {generate_token()}',
+        bungalow_category.capacity - 2,
+        ticket_category.id,
+        make_product(shop.id).id,
+    )
+
+    candidate1 = make_bungalow()
+    candidate2 = make_bungalow()
+    excluded = make_bungalow()
+    reserved = make_bungalow()
+    too_small = make_bungalow(bungalow_category_id=smaller_category.id)
+
+    occupier: User = make_user()
+    reserve_bungalow(reserved.id, occupier)
+
+    candidates = bungalow_service.get_candidate_bungalows(
+        party.id,
+        ticket_category.id,
+        bungalow_category.capacity,
+        excluded_bungalow_id=excluded.id,
+    )
+
+    candidate_ids = {candidate.id for candidate in candidates}
+    assert {candidate1.id, candidate2.id} <= candidate_ids
+    assert excluded.id not in candidate_ids
+    assert reserved.id not in candidate_ids
+    assert too_small.id not in candidate_ids
+
+    numbers = [candidate.number for candidate in candidates]
+    assert numbers == sorted(numbers)
+
+    candidate = next(c for c in candidates if c.id == candidate1.id)
+    assert candidate.number == candidate1.number
+    assert candidate.category_title == bungalow_category.title
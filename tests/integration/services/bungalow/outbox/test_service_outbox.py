@@ -0,0 +1,107 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+
+from sqlalchemy import select
+
+from byceps.database import db
+from byceps.services.bungalow import bungalow_outbox_service
+from byceps.services.bungalow.dbmodels.outbox import DbBungalowOutboxEvent
+from byceps.services.bungalow.dbmodels.webhook_send_budget import (
+    DbBungalowWebhookSendBudget,
+)
+from byceps.services.bungalow.models.bungalow import BungalowID
+from byceps.services.shop.order.models.order import Orderer
+from byceps.util.uuid import generate_uuid7
+
+from tests.integration.services.bungalow.helpers import reserve_bungalow
+
+
+def test_reservation_stages_event(site_app, make_bungalow, orderer: Orderer):
+    bungalow = make_bungalow()
+    occupier = orderer.user
+
+    assert _find_outbox_events(bungalow.id) == []
+
+    reserve_bungalow(bungalow.id, occupier)
+
+    db_events = _find_outbox_events(bungalow.id)
+    assert len(db_events) == 1
+
+    db_event = db_events[0]
+    assert db_event.event_name == 'bungalow-reserved'
+    assert db_event.data == {
+        'initiator': str(occupier.id),
+        'bungalow_id': str(bungalow.id),
+        'bungalow_number': bungalow.number,
+        'occupier': str(occupier.id),
+    }
+    assert db_event.announced_webhook_ids == []
+    assert db_event.attempts == 0
+    assert db_event.next_attempt_at == (
+        db_event.occurred_at + bungalow_outbox_service.COALESCING_WINDOW
+    )
+
+
+def test_deliver_events_removes_delivered_events(
+    site_app, make_bungalow, orderer: Orderer
+):
+    bungalow = make_bungalow()
+
+    reserve_bungalow(bungalow.id, orderer.user)
+
+    assert len(_find_outbox_events(bungalow.id)) == 1
+
+    # Not due before the coalescing window has passed.
+    now = datetime.utcnow()
+    while bungalow_outbox_service.deliver_events(now, 10) > 0:
+        pass
+
+    assert len(_find_outbox_events(bungalow.id)) == 1
+
+    # No webhooks are configured, so there is nothing that could fail.
+    now += bungalow_outbox_service.COALESCING_WINDOW
+    while bungalow_outbox_service.deliver_events(now, 10) > 0:
+        pass
+
+    assert _find_outbox_events(bungalow.id) == []
+
+
+def test_claimed_send_slot_does_not_keep_budget_locked(site_app):
+    webhook_id = generate_uuid7()
+    now = datetime.utcnow()
+
+    # Like a worker, claim the slot while the batch's transaction is
+    # still open.
+    db.session.execute(select(1))
+    result = bungalow_outbox_service._claim_send_slot(webhook_id, now)
+    assert result.is_ok()
+
+    # Another worker can lock the budget right away.
+    with db.engine.connect() as connection:
+        exhausted_until = connection.scalar(
+            select(DbBungalowWebhookSendBudget.exhausted_until)
+            .filter_by(webhook_id=webhook_id)
+            .with_for_update(nowait=True)
+        )
+
+    send_interval = bungalow_outbox_service.WEBHOOK_SEND_INTERVAL
+    assert exhausted_until == now + send_interval
+
+    db.session.rollback()
+
+
+def _find_outbox_events(
+    bungalow_id: BungalowID,
+) -> list[DbBungalowOutboxEvent]:
+    return list(
+        db.session.scalars(
+            select(DbBungalowOutboxEvent).filter(
+                DbBungalowOutboxEvent.data['bungalow_id'].astext
+                == str(bungalow_id)
+            )
+        ).all()
+    )
@@ -0,0 +1,60 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from byceps.database import db
+from byceps.services.brand import brand_setting_service
+from byceps.services.brand.models import Brand
+from byceps.services.bungalow import bungalow_service
+from byceps.services.party import party_setting_service
+from byceps.services.party.models import Party
+
+
+def test_uses_bungalow_preselection_is_cached_until_invalidated(
+    site_app, bungalows_brand: Brand, make_party
+):
+    party = make_party(bungalows_brand)
+    name = bungalow_service.USES_BUNGALOW_PRESELECTION_SETTING_NAME
+
+    assert not bungalow_service.does_party_use_bungalow_preselection(party.id)
+
+    # Without invalidation, the cached setting is used until it expires.
+    party_setting_service.create_setting(party.id, name, 'true')
+    assert not bungalow_service.does_party_use_bungalow_preselection(party.id)
+
+    _invalidate_party_settings(party)
+    assert bungalow_service.does_party_use_bungalow_preselection(party.id)
+    assert bungalow_service.get_party_ids_using_bungalow_preselection(
+        {party.id}
+    ) == {party.id}
+
+    party_setting_service.remove_setting(party.id, name)
+    _invalidate_party_settings(party)
+    assert not bungalow_service.does_party_use_bungalow_preselection(party.id)
+
+
+def test_has_bungalows_is_cached_until_invalidated(site_app, make_brand):
+    brand = make_brand()
+    name = bungalow_service.HAS_BUNGALOWS_SETTING_NAME
+
+    assert not bungalow_service.has_brand_bungalows(brand.id)
+
+    # Without invalidation, the cached setting is used until it expires.
+    brand_setting_service.create_setting(brand.id, name, 'true')
+    assert not bungalow_service.has_brand_bungalows(brand.id)
+
+    bungalow_service.invalidate_brand_settings(brand.id)
+    assert bungalow_service.has_brand_bungalows(brand.id)
+    assert bungalow_service.get_brand_ids_with_bungalows({brand.id}) == {
+        brand.id
+    }
+
+    brand_setting_service.remove_setting(brand.id, name)
+    bungalow_service.invalidate_brand_settings(brand.id)
+    assert not bungalow_service.has_brand_bungalows(brand.id)
+
+
+def _invalidate_party_settings(party: Party) -> None:
+    bungalow_service.invalidate_party_settings(party.id)
+    db.session.commit()
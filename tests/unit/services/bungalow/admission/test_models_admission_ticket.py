@@ -0,0 +1,63 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+
+import pytest
+
+from byceps.services.bungalow.models.admission import AdmissionTicket
+from byceps.services.party.models import PartyID
+
+
+ADMISSIBLE_AT = datetime(2026, 3, 14, 18, 0, 0)
+
+
+@pytest.mark.parametrize(
+    ('now', 'expected'),
+    [
+        (datetime(2026, 3, 14, 17, 59, 59), False),
+        (datetime(2026, 3, 14, 18, 0, 0), True),
+        (datetime(2026, 3, 14, 18, 0, 1), True),
+    ],
+)
+def test_is_admitted(now: datetime, expected: bool):
+    ticket = build_ticket(admission_rate=2.0)
+
+    assert ticket.is_admitted(now) == expected
+
+
+@pytest.mark.parametrize(
+    ('now', 'expected_seconds_to_wait', 'expected_position'),
+    [
+        (datetime(2026, 3, 14, 17, 59, 30), 30, 60),
+        (datetime(2026, 3, 14, 17, 59, 59, 750000), 1, 1),
+        (datetime(2026, 3, 14, 18, 0, 0), 0, 0),
+        (datetime(2026, 3, 14, 18, 0, 5), 0, 0),
+    ],
+)
+def test_waiting_estimates(
+    now: datetime, expected_seconds_to_wait: int, expected_position: int
+):
+    ticket = build_ticket(admission_rate=2.0)
+
+    assert ticket.get_seconds_to_wait(now) == expected_seconds_to_wait
+    assert ticket.get_position(now) == expected_position
+
+
+def test_position_without_admission_rate():
+    ticket = build_ticket(admission_rate=None)
+
+    assert ticket.get_position(datetime(2026, 3, 14, 17, 59, 30)) == 0
+
+
+# helpers
+
+
+def build_ticket(admission_rate: float | None) -> AdmissionTicket:
+    return AdmissionTicket(
+        party_id=PartyID('lanresort-2026'),
+        admissible_at=ADMISSIBLE_AT,
+        admission_rate=admission_rate,
+    )
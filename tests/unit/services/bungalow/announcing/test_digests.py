@@ -0,0 +1,97 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+
+from byceps.services.bungalow import announcing
+from byceps.services.bungalow.events import (
+    BungalowOccupancyDescriptionUpdatedEvent,
+    BungalowOccupancyMovedEvent,
+    BungalowReleasedEvent,
+)
+from byceps.services.bungalow.models.bungalow import BungalowID
+
+from tests.helpers import generate_uuid
+
+
+NOW = datetime(2026, 5, 1, 12, 0, 0)
+
+
+def test_announce_bungalows_released():
+    events = [
+        _build_released_event(31),
+        _build_released_event(12),
+        _build_released_event(14),
+    ]
+
+    actual = announcing.announce_bungalows_released(
+        'bungalow-released', events, None
+    )
+
+    assert actual is not None
+    assert actual.text == 'Bungalows 12, 14, 31 wurden wieder freigegeben.'
+
+
+def test_announce_bungalow_descriptions_updated_for_single_bungalow():
+    events = [
+        _build_description_updated_event(23),
+        _build_description_updated_event(23),
+    ]
+
+    actual = announcing.announce_bungalow_descriptions_updated(
+        'bungalow-description-updated', events, None
+    )
+
+    assert actual is not None
+    assert actual.text == 'Das Grußwort für Bungalow 23 wurde aktualisiert.'
+
+
+def test_announce_bungalow_occupancies_moved():
+    events = [
+        _build_occupancy_moved_event(3, 7),
+        _build_occupancy_moved_event(5, 9),
+    ]
+
+    actual = announcing.announce_bungalow_occupancies_moved(
+        'occupancy-moved', events, None
+    )
+
+    assert actual is not None
+    assert actual.text == (
+        'Belegungen haben den Bungalow gewechselt: 3 → 7, 5 → 9'
+    )
+
+
+def _build_released_event(bungalow_number: int) -> BungalowReleasedEvent:
+    return BungalowReleasedEvent(
+        occurred_at=NOW,
+        initiator=None,
+        bungalow_id=BungalowID(generate_uuid()),
+        bungalow_number=bungalow_number,
+    )
+
+
+def _build_description_updated_event(
+    bungalow_number: int,
+) -> BungalowOccupancyDescriptionUpdatedEvent:
+    return BungalowOccupancyDescriptionUpdatedEvent(
+        occurred_at=NOW,
+        initiator=None,
+        bungalow_id=BungalowID(generate_uuid()),
+        bungalow_number=bungalow_number,
+    )
+
+
+def _build_occupancy_moved_event(
+    source_bungalow_number: int, target_bungalow_number: int
+) -> BungalowOccupancyMovedEvent:
+    return BungalowOccupancyMovedEvent(
+        occurred_at=NOW,
+        initiator=None,
+        source_bungalow_id=BungalowID(generate_uuid()),
+        source_bungalow_number=source_bungalow_number,
+        target_bungalow_id=BungalowID(generate_uuid()),
+        target_bungalow_number=target_bungalow_number,
+    )
@@ -0,0 +1,125 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime, timedelta
+from threading import Thread
+from types import SimpleNamespace
+
+from byceps.services.bungalow.blueprints.site.board_feed import BoardFeed
+from byceps.services.bungalow.models.bungalow import BungalowOccupationState
+
+
+def test_wait_for_changes_after_returns_published_changes():
+    started_at = datetime.utcnow()
+    feed = BoardFeed(10, started_at)
+
+    feed.publish([_build_bungalow(12, BungalowOccupationState.reserved)])
+
+    changes = feed.wait_for_changes_after(started_at, 0)
+
+    assert changes is not None
+    assert [change.bungalow_number for change in changes] == [12]
+    assert changes[0].occupation_state == BungalowOccupationState.reserved
+
+    # Nothing new after the last change.
+    assert feed.wait_for_changes_after(changes[-1].changed_at, 0) == []
+
+
+def test_wait_for_changes_after_wakes_up_on_publish():
+    started_at = datetime.utcnow()
+    feed = BoardFeed(10, started_at)
+
+    received = []
+
+    def wait() -> None:
+        received.extend(feed.wait_for_changes_after(started_at, 5))
+
+    waiter = Thread(target=wait)
+    waiter.start()
+
+    feed.publish([_build_bungalow(14, BungalowOccupationState.occupied)])
+
+    waiter.join(timeout=5)
+
+    assert [change.bungalow_number for change in received] == [14]
+
+
+def test_changes_have_unique_points_in_time():
+    started_at = datetime.utcnow()
+    feed = BoardFeed(10, started_at)
+
+    feed.publish(
+        [
+            _build_bungalow(number, BungalowOccupationState.reserved)
+            for number in range(5)
+        ]
+    )
+
+    changes = feed.wait_for_changes_after(started_at, 0) or []
+    changed_ats = [change.changed_at for change in changes]
+
+    assert len(set(changed_ats)) == 5
+
+
+def test_wait_for_changes_after_discarded_changes_returns_none():
+    started_at = datetime.utcnow()
+    feed = BoardFeed(2, started_at)
+
+    for number in range(3):
+        bungalow = _build_bungalow(number, BungalowOccupationState.reserved)
+        feed.publish([bungalow])
+
+    assert feed.wait_for_changes_after(started_at, 0) is None
+
+
+def test_wait_for_changes_before_start_returns_none():
+    started_at = datetime.utcnow()
+    feed = BoardFeed(10, started_at)
+
+    position = started_at - timedelta(seconds=1)
+
+    assert feed.wait_for_changes_after(position, 0) is None
+
+
+def test_wait_for_changes_after_reload_returns_none():
+    started_at = datetime.utcnow()
+    feed = BoardFeed(10, started_at)
+
+    feed.publish([_build_bungalow(12, BungalowOccupationState.reserved)])
+    changes = feed.wait_for_changes_after(started_at, 0) or []
+
+    feed.publish_reload()
+
+    assert feed.wait_for_changes_after(changes[-1].changed_at, 0) is None
+
+
+def test_wait_for_changes_after_wakes_up_on_reload():
+    started_at = datetime.utcnow()
+    feed = BoardFeed(10, started_at)
+
+    received = []
+
+    def wait() -> None:
+        received.append(feed.wait_for_changes_after(started_at, 5))
+
+    waiter = Thread(target=wait)
+    waiter.start()
+
+    feed.publish_reload()
+
+    waiter.join(timeout=5)
+
+    assert received == [None]
+
+
+def _build_bungalow(
+    number: int, occupation_state: BungalowOccupationState
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        number=number,
+        occupation_state=occupation_state,
+        occupancy=None,
+        avatar_url=None,
+    )
@@ -0,0 +1,83 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import timedelta
+
+from byceps.services.bungalow.caching import ExpiringCache
+
+
+def test_get_or_build_builds_only_once():
+    cache = ExpiringCache(timedelta(minutes=1))
+    build_calls = []
+
+    def build():
+        build_calls.append(1)
+        return 'value'
+
+    assert cache.get_or_build('key', build) == 'value'
+    assert cache.get_or_build('key', build) == 'value'
+    assert len(build_calls) == 1
+
+
+def test_evict():
+    cache = ExpiringCache(timedelta(minutes=1))
+    cache.get_or_build('key1', lambda: 'value1')
+    cache.get_or_build('key2', lambda: 'value2')
+
+    cache.evict('key1')
+
+    assert cache.find('key1') is None
+    assert cache.find('key2') == 'value2'
+
+
+def test_evict_all():
+    cache = ExpiringCache(timedelta(minutes=1))
+    cache.get_or_build('key1', lambda: 'value1')
+    cache.get_or_build('key2', lambda: 'value2')
+
+    cache.evict_all()
+
+    assert cache.get_items() == []
+
+
+def test_expired_values_are_rebuilt():
+    cache = ExpiringCache(timedelta(0))
+
+    cache.get_or_build('key', lambda: 'old value')
+
+    assert cache.find('key') is None
+    assert cache.get_or_build('key', lambda: 'new value') == 'new value'
+
+
+def test_value_is_not_cached_if_evicted_during_build():
+    cache = ExpiringCache(timedelta(minutes=1))
+
+    def build():
+        cache.evict('key')
+        return 'possibly stale value'
+
+    assert cache.get_or_build('key', build) == 'possibly stale value'
+    assert cache.find('key') is None
+
+
+def test_get_many_or_build_builds_only_missing_values():
+    cache = ExpiringCache(timedelta(minutes=1))
+    cache.get_or_build('key1', lambda: 'value1')
+    build_calls = []
+
+    def build(keys):
+        build_calls.append(keys)
+        return {key: key.replace('key', 'value') for key in keys}
+
+    assert cache.get_many_or_build({'key1', 'key2', 'key3'}, build) == {
+        'key1': 'value1',
+        'key2': 'value2',
+        'key3': 'value3',
+    }
+    assert cache.get_many_or_build({'key2', 'key3'}, build) == {
+        'key2': 'value2',
+        'key3': 'value3',
+    }
+    assert build_calls == [{'key2', 'key3'}]
@@ -0,0 +1,34 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+
+from byceps.services.bungalow.models.log import BungalowLogEntryCursor
+
+
+def test_serialize_and_parse():
+    cursor = BungalowLogEntryCursor(
+        occurred_at=datetime(2026, 5, 1, 18, 0, 0, 123456),
+        entry_id=UUID('01890000-0000-7000-8000-000000000000'),
+    )
+
+    assert BungalowLogEntryCursor.parse(cursor.serialize()) == cursor
+
+
+@pytest.mark.parametrize(
+    'value',
+    [
+        '',
+        'nonsense',
+        '2026-05-01T18:00:00',
+        '2026-05-01T18:00:00_nonsense',
+        'nonsense_01890000-0000-7000-8000-000000000000',
+    ],
+)
+def test_parse_invalid_value(value: str):
+    assert BungalowLogEntryCursor.parse(value) is None
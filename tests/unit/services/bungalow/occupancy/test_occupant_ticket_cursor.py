@@ -0,0 +1,40 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from uuid import UUID
+
+import pytest
+
+from byceps.services.bungalow.models.occupation import OccupantTicketCursor
+from byceps.services.ticketing.models.ticket import TicketID
+
+
+TICKET_ID = TicketID(UUID('5f1e2d3c-4b5a-4968-8776-a5b4c3d2e1f0'))
+
+
+@pytest.mark.parametrize(
+    'screen_name',
+    [
+        'Heinzelmann',
+        'under_score',
+        '_leading_and_trailing_',
+    ],
+)
+def test_serialized_cursor_is_parsed_back(screen_name: str):
+    cursor = OccupantTicketCursor(screen_name=screen_name, ticket_id=TICKET_ID)
+
+    assert OccupantTicketCursor.parse(cursor.serialize()) == cursor
+
+
+@pytest.mark.parametrize(
+    'value',
+    [
+        '',
+        'Heinzelmann',
+        'not-a-uuid_Heinzelmann',
+    ],
+)
+def test_invalid_cursor_is_rejected(value: str):
+    assert OccupantTicketCursor.parse(value) is None
@@ -0,0 +1,72 @@
+"""
+:Copyright: 2014-2026 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from types import SimpleNamespace
+from uuid import UUID
+
+import pytest
+
+from byceps.services.bungalow.user_loading import UserLoader
+from byceps.services.user.models import UserID
+
+
+USER_ID_1 = UserID(UUID('4e8b4b3c-5a21-4d0f-9b67-3f1a8e0d2c11'))
+USER_ID_2 = UserID(UUID('9d2f6a17-0c4e-4b8a-a3d5-6e7f8091b222'))
+USER_ID_3 = UserID(UUID('1b3c5d7e-9f01-4a23-b456-789abcdef333'))
+UNKNOWN_USER_ID = UserID(UUID('00000000-0000-4000-8000-000000000000'))
+
+
+def test_primed_users_are_loaded_in_one_batch():
+    loader, load_calls = _create_loader()
+
+    loader.prime([USER_ID_1, USER_ID_2, None])
+
+    assert loader.get(USER_ID_3).id == USER_ID_3
+    assert load_calls == [{USER_ID_1, USER_ID_2, USER_ID_3}]
+
+
+def test_loaded_users_are_remembered():
+    loader, load_calls = _create_loader()
+
+    users_by_id = loader.get_many({USER_ID_1, USER_ID_2})
+    assert users_by_id.keys() == {USER_ID_1, USER_ID_2}
+
+    loader.prime([USER_ID_1])
+    assert loader.get(USER_ID_2).id == USER_ID_2
+    assert loader.get_many({USER_ID_1, USER_ID_3}).keys() == {
+        USER_ID_1,
+        USER_ID_3,
+    }
+
+    assert load_calls == [{USER_ID_1, USER_ID_2}, {USER_ID_3}]
+
+
+def test_unknown_users_are_remembered():
+    loader, load_calls = _create_loader()
+
+    assert loader.find(UNKNOWN_USER_ID) is None
+    assert loader.get_many({UNKNOWN_USER_ID}) == {}
+
+    with pytest.raises(ValueError):
+        loader.get(UNKNOWN_USER_ID)
+
+    assert load_calls == [{UNKNOWN_USER_ID}]
+
+
+# helpers
+
+
+def _create_loader():
+    load_calls = []
+
+    def load(user_ids):
+        load_calls.append(set(user_ids))
+        return [
+            SimpleNamespace(id=user_id)
+            for user_id in user_ids
+            if user_id != UNKNOWN_USER_ID
+        ]
+
+    return UserLoader(load), load_calls